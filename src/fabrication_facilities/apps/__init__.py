@@ -1,25 +1,68 @@
+"""
+Search apps of the fabrication facilities.
+
+The entry points are created on first access from the apps serialized in
+`apps.json` by `app_builder`, so starting NOMAD does not rebuild and validate
+them from their modules.
+"""
+
+import functools
+
 from nomad.config.models.plugins import AppEntryPoint
+from nomad.config.models.ui import App
+from pydantic import TypeAdapter
+
+from fabrication_facilities.apps.directories import APPS_FILE
+
+ENTRY_POINTS = {
+    'equipment_app_entry_point': (
+        'equipment',
+        'Fabrication_equipment_search',
+        'New app for equipment of fabrication facilities.',
+    ),
+    'process_app_entry_point': (
+        'process',
+        'Fabrication_process_search',
+        'New app for equipment of fabrication facilities.',
+    ),
+    'step_app_entry_point': (
+        'step',
+        'Fabrication_process_search',
+        'New app for equipment of fabrication facilities.',
+    ),
+}
+"""The app key, name and description of each entry point."""
+
+
+@functools.cache
+def load_apps():
+    """
+    Load the apps stored in `apps.json`, or build them from their modules if it
+    has not been generated yet.
+
+    Returns:
+        dict[str, App]: The apps by their `app_builder.APP_MODULES` key.
+    """
+    try:
+        with open(APPS_FILE, encoding='utf-8') as file:
+            return TypeAdapter(dict[str, App]).validate_json(file.read())
+    except FileNotFoundError:
+        from fabrication_facilities.apps.app_builder import build_apps
+
+        return build_apps()
+
+
+@functools.cache
+def _entry_point(name):
+    key, entry_point_name, description = ENTRY_POINTS[name]
+    return AppEntryPoint(
+        name=entry_point_name, description=description, app=load_apps()[key]
+    )
+
 
-from fabrication_facilities.apps.equipmentapp import equipmentapp
-from fabrication_facilities.apps.processapp import processapp
-from fabrication_facilities.apps.stepapp import stepapp
-
-equipment_app_entry_point = AppEntryPoint(
-    name='Fabrication_equipment_search',
-    description='New app for equipment of fabrication facilities.',
-    app=equipmentapp,
-)
-
-process_app_entry_point = AppEntryPoint(
-    name='Fabrication_process_search',
-    description='New app for equipment of fabrication facilities.',
-    app=processapp,
-)
-
-step_app_entry_point = AppEntryPoint(
-    name='Fabrication_process_search',
-    description='New app for equipment of fabrication facilities.',
-    app=stepapp,
-)
-
-app_entry_point = step_app_entry_point
+def __getattr__(name):
+    if name == 'app_entry_point':
+        name = 'step_app_entry_point'
+    if name in ENTRY_POINTS:
+        return _entry_point(name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,59 @@
+"""
+Serialize the validated apps for a fast start of NOMAD.
+
+The apps are defined in `equipmentapp`, `processapp` and `stepapp`, but building
+them validates the whole tree of pydantic models, and the step app first needs
+the menus of every step. The entry points in `fabrication_facilities.apps` load
+`apps.json` instead, with a single validation of the stored JSON. Rebuild it,
+together with `menus.json`, after changing the apps or the step classes with
+
+    python -m fabrication_facilities.apps.app_builder
+"""
+
+import importlib
+import json
+
+from fabrication_facilities.apps import menu_generator
+from fabrication_facilities.apps.directories import APPS_FILE
+
+APP_MODULES = {
+    'equipment': 'fabrication_facilities.apps.equipmentapp',
+    'process': 'fabrication_facilities.apps.processapp',
+    'step': 'fabrication_facilities.apps.stepapp',
+}
+"""The module defining each app, by the key of the app in `apps.json`."""
+
+
+def build_apps():
+    """
+    Build the apps from the modules that define them.
+
+    Returns:
+        dict[str, App]: The apps by their `APP_MODULES` key.
+    """
+    return {
+        key: getattr(importlib.import_module(module), f'{key}app')
+        for key, module in APP_MODULES.items()
+    }
+
+
+def dump_apps(apps):
+    return json.dumps(
+        {
+            key: app.model_dump(mode='json', exclude_unset=True, warnings=False)
+            for key, app in apps.items()
+        },
+        indent=1,
+    )
+
+
+def main():
+    # the step app is built from the menus, so they are regenerated first
+    menu_generator.main()
+    with open(APPS_FILE, 'w', encoding='utf-8') as file:
+        file.write(dump_apps(build_apps()))
+        file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
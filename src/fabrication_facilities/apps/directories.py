@@ -1,3 +1,5 @@
+import os
+
 obm = 'fabrication_utilities.ObservationMeasurements'
 sm = 'StartingMaterial'
 
@@ -27,3 +29,9 @@ dir_path = {
     'dir23': f'fabrication_facilities.schema_packages.{obm}',
     'dir24': f'fabrication_facilities.schema_packages.fabrication_utilities.{sm}',
 }
+
+MENUS_FILE = os.path.join(os.path.dirname(__file__), 'menus.json')
+"""The step menus generated by `menu_generator` from the classes in `dir_path`."""
+
+APPS_FILE = os.path.join(os.path.dirname(__file__), 'apps.json')
+"""The validated apps serialized by `app_builder`."""
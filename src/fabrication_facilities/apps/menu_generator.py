@@ -0,0 +1,209 @@
+"""
+Generate the step-app menus from the step classes.
+
+The items of each menu follow the ELN order of the section: text, enumerated and
+boolean quantities become terms, numbers become histograms in the unit shown by
+the ELN, and elemental compositions become periodic tables. Repeating subsections
+such as the fluximeters and the instruments contribute their quantities too.
+
+Building the menus requires importing every schema package, so the result is
+stored in `menus.json` and `menu_steps` only deserializes it. Regenerate it after
+changing the step classes with
+
+    python -m fabrication_facilities.apps.menu_generator
+"""
+
+import importlib
+import json
+import warnings
+
+from nomad.config.models.ui import (
+    Axis,
+    Menu,
+    MenuItemHistogram,
+    MenuItemPeriodicTable,
+    MenuItemTerms,
+)
+from nomad.datamodel.metainfo.basesections import ElementalComposition
+from nomad.metainfo.data_type import Enum, Number, m_bool, m_str
+
+from fabrication_facilities.apps.directories import MENUS_FILE, dir_path
+
+MENU_TITLES = {
+    'dir1': 'ICP-CVD',
+    'dir2': 'Spin Coating',
+    'dir3': 'E-Beam Lithography',
+    'dir4': 'Focused I-Beam Lithography',
+    'dir5': 'DRIE',
+    'dir6': 'Wet cleaning',
+    'dir7': 'Resist development',
+    'dir8': 'Bonding',
+    'dir9': 'Annealing',
+    'dir10': 'LTO Densification',
+    'dir11': 'Thermal Oxidation',
+    'dir12': 'Dicing',
+    'dir13': 'Doping',
+    'dir14': 'Labeling & Cleaning',
+    'dir15': 'SOD',
+    'dir16': 'Track',
+    'dir17': 'Electron Gun',
+    'dir18': 'Sputtering',
+    'dir19': 'SOG',
+    'dir20': 'RIE',
+    'dir21': 'Wet Etching',
+    'dir22': 'Stripping',
+    'dir23': 'Observation Measurements',
+    'dir24': 'Starting Material',
+}
+
+# Bookkeeping fields of every step that are not useful as search filters, and the
+# raw formulas, which are searched through their Hill notation instead. The name
+# is kept for subsections, where it identifies the gas or the instrument.
+EXCLUDED = {
+    'job_number',
+    'name',
+    'operator',
+    'room',
+    'step_type',
+    'affiliation',
+    'chemical_formula',
+    'gas_formula',
+    'composition_fingerprints',
+    'lab_id',
+    'datetime',
+    'comment',
+}
+
+# ELN components of quantities that cannot be aggregated.
+UNSEARCHABLE_COMPONENTS = {
+    'RichTextEditQuantity',
+    'FileEditQuantity',
+    'ReferenceEditQuantity',
+    'DateTimeEditQuantity',
+}
+
+
+def _eln_option(definition, option):
+    """
+    Read an option of the ELN annotation of a definition, including the deprecated
+    ones that the schema still uses.
+    """
+    eln = definition.m_get_annotations('eln')
+    if eln is None:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return getattr(eln, option, None)
+
+
+def _title(name):
+    name = name.removesuffix('_hill')
+    title = name.replace('_', ' ')
+    return title[:1].upper() + title[1:]
+
+
+def _ordered(section, definitions):
+    properties = _eln_option(section, 'properties')
+    order = properties.order if properties else None
+    order = [name for name in order or () if name in definitions]
+    return order + [name for name in definitions if name not in order]
+
+
+def _quantity_item(quantity, path, schema):
+    if quantity.shape or _eln_option(quantity, 'component') in UNSEARCHABLE_COMPONENTS:
+        return None
+    title = _title(_eln_option(quantity, 'label') or quantity.name)
+    if quantity.name.endswith('_hill'):
+        title = f'{title} (Hill notation)'
+    search_quantity = f'{path}#{schema}'
+    if isinstance(quantity.type, (m_str, m_bool, Enum)):
+        return MenuItemTerms(title=title, type='terms', search_quantity=search_quantity)
+    if not isinstance(quantity.type, Number):
+        return None
+    unit = _eln_option(quantity, 'defaultDisplayUnit')
+    if unit is None and quantity.unit is not None:
+        unit = f'{quantity.unit:C}'.replace('**', '^')
+    return MenuItemHistogram(
+        title=title,
+        type='histogram',
+        n_bins=10,
+        x=Axis(search_quantity=search_quantity, title=title.lower(), unit=unit),
+    )
+
+
+def _section_items(section, path, schema, prefix=''):
+    hidden = set(_eln_option(section, 'hide') or ())
+    items = []
+    for name in _ordered(section, section.all_quantities):
+        if name in hidden or (name in EXCLUDED and (not prefix or name != 'name')):
+            continue
+        item = _quantity_item(section.all_quantities[name], f'{path}.{name}', schema)
+        if item is not None:
+            if prefix:
+                item.title = f'{prefix} {item.title[:1].lower()}{item.title[1:]}'
+            items.append(item)
+    for name, sub_section in section.all_sub_sections.items():
+        if name in hidden:
+            continue
+        sub_section_def = sub_section.sub_section.m_resolved()
+        if issubclass(sub_section_def.section_cls, ElementalComposition):
+            title = 'Elements'
+            if name != 'elemental_composition':
+                title = f'Elements of the {name.removesuffix("_elemental_composition")}'
+                title = title.replace('_', ' ')
+            if prefix:
+                title = f'{prefix} {title[:1].lower()}{title[1:]}'
+            items.append(
+                MenuItemPeriodicTable(
+                    title=title,
+                    type='periodic_table',
+                    search_quantity=f'{path}.{name}.element#{schema}',
+                )
+            )
+        elif not prefix:
+            items.extend(
+                _section_items(sub_section_def, f'{path}.{name}', schema, _title(name))
+            )
+    return items
+
+
+def step_class(qualified_name):
+    module, name = qualified_name.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+def generate_menus():
+    """
+    Build the menu of every step in `directories.dir_path`.
+
+    Returns:
+        dict[str, Menu]: The menus by their `dir_path` key.
+    """
+    return {
+        key: Menu(
+            title=MENU_TITLES.get(key, key),
+            size='xl',
+            items=_section_items(step_class(schema).m_def, 'data', schema),
+        )
+        for key, schema in dir_path.items()
+    }
+
+
+def dump_menus(menus):
+    return json.dumps(
+        {
+            key: menu.model_dump(mode='json', exclude_unset=True)
+            for key, menu in menus.items()
+        },
+        indent=1,
+    )
+
+
+def main():
+    with open(MENUS_FILE, 'w', encoding='utf-8') as file:
+        file.write(dump_menus(generate_menus()))
+        file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ from nomad.config.models.ui import (
     Column,
     Menu,
     MenuItemCustomQuantities,
+    MenuItemPeriodicTable,
     SearchQuantities,
 )
 
@@ -38,6 +39,7 @@ schemas = [f'*#{path_value}' for path_value in dir_path.values()]
 fps = 'FabricationProcessStep'
 dir0 = f'fabrication_facilities.schema_packages.fabrication_utilities.{fps}'
 schemas.append(f'*#{dir0}')
+schemas.append('results.material.elements')
 
 stepapp = App(
     label='Fabrication steps',
@@ -67,6 +69,16 @@ stepapp = App(
     filters_locked={'section_defs.definition_qualified_name': dir0},
     menu=Menu(
         items=[
+            Menu(
+                title='Elements',
+                items=[
+                    MenuItemPeriodicTable(
+                        title='Elements of all the step materials and gases',
+                        type='periodic_table',
+                        search_quantity='results.material.elements',
+                    ),
+                ],
+            ),
             Menu(
                 title='Add steps',
                 indentation=0,
@@ -1,17 +1,16 @@
 from nomad.config.models.plugins import NormalizerEntryPoint
-from pydantic import Field
 
 
-class NewNormalizerEntryPoint(NormalizerEntryPoint):
-    parameter: int = Field(0, description='Custom configuration parameter')
-
+class MaterialElementsNormalizerEntryPoint(NormalizerEntryPoint):
     def load(self):
-        from fabrication_facilities.normalizers.normalizer import NewNormalizer
+        from fabrication_facilities.normalizers.normalizer import (
+            MaterialElementsNormalizer,
+        )
 
-        return NewNormalizer(**self.dict())
+        return MaterialElementsNormalizer(**self.dict())
 
 
-normalizer_entry_point = NewNormalizerEntryPoint(
-    name='NewNormalizer',
-    description='New normalizer entry point configuration.',
+normalizer_entry_point = MaterialElementsNormalizerEntryPoint(
+    name='MaterialElementsNormalizer',
+    description='Collects the elements of the fabrication steps into the results.',
 )
@@ -10,17 +10,51 @@ if TYPE_CHECKING:
         BoundLogger,
     )
 
-from nomad.config import config
+from nomad.datamodel.metainfo.basesections import ElementalComposition
+from nomad.datamodel.results import Material, Results
 from nomad.normalizing import Normalizer
 
-configuration = config.get_plugin_entry_point(
-    'fabrication_facilities.normalizers:normalizer_entry_point'
-)
+from fabrication_facilities.schema_packages.periodic_table import atomic_numbers
+
+
+def collect_elements(section):
+    """
+    Gather the elements of every `ElementalComposition` under a section, such as
+    the `*_elemental_composition` of the steps and of their fluximeters.
+
+    Returns:
+        set[str]: The valid element symbols found.
+    """
+    return {
+        content.element
+        for content in section.m_all_contents()
+        if isinstance(content, ElementalComposition)
+        and content.element in atomic_numbers
+    }
+
+
+class MaterialElementsNormalizer(Normalizer):
+    """
+    Fill `results.material.elements` of the fabrication entries with the elements
+    of all their elemental compositions, so that the generic search can filter
+    them by element. It runs after the sections are normalized, so it also sees
+    the compositions that their normalizers derived from the formulas.
+    """
 
+    domain = None
 
-class NewNormalizer(Normalizer):
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        logger.info('NewNormalizer.normalize', parameter=configuration.parameter)
-        if archive.results and archive.results.material:
-            archive.results.material.elements = ['C', 'O']
+        if archive.data is None or not type(archive.data).__module__.startswith(
+            'fabrication_facilities.'
+        ):
+            return
+        elements = collect_elements(archive.data)
+        if not elements:
+            return
+        if not archive.results:
+            archive.results = Results()
+        if not archive.results.material:
+            archive.results.material = Material()
+        elements.update(archive.results.material.elements or ())
+        archive.results.material.elements = sorted(elements, key=atomic_numbers.get)
@@ -19,9 +19,11 @@ from nomad.metainfo import (
 from fabrication_facilities.schema_packages.fabrication_utilities import (
     FabricationProcessStep,
 )
+from fabrication_facilities.schema_packages.profiling import profiled
 from fabrication_facilities.schema_packages.utils import (
+    CompositionNormalizer,
     Massflow_controller,
-    parse_chemical_formula,
+    normalize_gas_mixture,
 )
 
 if TYPE_CHECKING:
@@ -157,30 +159,35 @@ class ICP_CVD(Chemical, FabricationProcessStep, ArchiveSection):
         section_def=Massflow_controller,
         repeats=True,
     )
+    total_gas_flow = Quantity(
+        type=np.float64,
+        description='Total flow of the gases fed by the fluximeters',
+        unit='centimeter^3/minute',
+    )
+    gas_mixture_elemental_composition = SubSection(
+        section_def=ElementalComposition, repeats=True
+    )
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
 
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
+
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+        normalize_gas_mixture(self, logger)
 
 
 class Spin_Coating(Chemical, FabricationProcessStep, ArchiveSection):
@@ -396,7 +403,21 @@ class Spin_Coating(Chemical, FabricationProcessStep, ArchiveSection):
     resist_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    resist_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the resist derived from its formula',
+        unit='g/mol',
+    )
+
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'resist_elemental_composition'),
+    )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
         if self.exposure_required:
@@ -409,24 +430,6 @@ class Spin_Coating(Chemical, FabricationProcessStep, ArchiveSection):
                 },
                 unit='minute',
             )
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.resist_elemental_composition = elementality
 
 
 class Bonding(FabricationProcessStep, ArchiveSection):
@@ -727,27 +730,19 @@ class Sputtering(Chemical, FabricationProcessStep, ArchiveSection):
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
 
 
 class SOG(Chemical, FabricationProcessStep, ArchiveSection):
@@ -833,27 +828,19 @@ class SOG(Chemical, FabricationProcessStep, ArchiveSection):
     substrate_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    substrate_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the substrate derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.substrate_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'substrate_elemental_composition'),
+    )
 
 
 m_package.__init_metainfo__()
@@ -0,0 +1,39 @@
+"""
+Processed archive files, as downloaded from NOMAD, shared by the indexes that
+are built from a directory of archives.
+"""
+
+import json
+import os
+
+import yaml
+
+ARCHIVE_SUFFIXES = ('.archive.json', '.archive.yaml', '.archive.yml')
+
+
+def read_archive(path):
+    """
+    Read a processed archive file as a dictionary.
+    """
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.json'):
+            return json.load(file)
+        return yaml.safe_load(file)
+
+
+def archive_files(directory):
+    """
+    Find the archive files under a directory.
+
+    Returns:
+        dict[str, tuple[int, int]]: The modification time in nanoseconds and the
+        size of each file, by absolute path.
+    """
+    found = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(ARCHIVE_SUFFIXES):
+                path = os.path.abspath(os.path.join(root, name))
+                stat = os.stat(path)
+                found[path] = (stat.st_mtime_ns, stat.st_size)
+    return found
@@ -0,0 +1,226 @@
+"""
+Reservations of bookable equipment.
+
+A `BookingCalendar` holds the accepted reservations of one equipment. Accepted
+reservations never overlap, so sorted by their start they are also sorted by
+their end, and both the reservations that conflict with a period and the place
+of a new reservation are found by binary search. The calendar is locked while
+a reservation is checked and inserted, so concurrent requests for the same
+period cannot both be accepted.
+
+The reservations are stored in the `bookings` of the `Equipment` entry, see
+`Equipment.booking_calendar` and `Equipment.save_bookings`. A booking written
+without an id gets one derived from its dates and who booked it, see
+`booking_id`, so it keeps its id when the entry is processed again.
+"""
+
+import bisect
+import hashlib
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+
+class Reservation(NamedTuple):
+    """
+    A period during which an equipment is booked, with UTC dates.
+    """
+
+    start: datetime
+    end: datetime
+    id: str
+    booked_by: str = None
+
+
+class BookingConflictError(ValueError):
+    """
+    Raised when a reservation overlaps accepted ones.
+    """
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(
+            'The period conflicts with the reservations '
+            + ', '.join(reservation.id for reservation in conflicts)
+        )
+
+
+def utc(value):
+    """
+    Return a date as an aware UTC datetime.
+
+    Args:
+        value (datetime | str): The date, naive dates being taken as UTC, or an
+        ISO 8601 string.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def booking_id(start=None, end=None, booked_by=None, taken=()):
+    """
+    Return the id of a booking stored without one, derived from its dates and
+    who booked it.
+
+    Args:
+        start (datetime | str): The start of the booking, or None.
+        end (datetime | str): The end of the booking, or None.
+        booked_by (str): Who booked the equipment.
+        taken (Container[str]): The ids already used, to which a numbered
+        suffix is added.
+    """
+    fields = [utc(date).isoformat() if date else '' for date in (start, end)]
+    fields.append(booked_by or '')
+    digest = hashlib.blake2b('|'.join(fields).encode(), digest_size=8).hexdigest()
+    candidate, number = digest, 1
+    while candidate in taken:
+        number += 1
+        candidate = f'{digest}-{number}'
+    return candidate
+
+
+class BookingCalendar:
+    """
+    The non-overlapping reservations of an equipment, sorted by their start.
+    """
+
+    def __init__(self, reservations=()):
+        """
+        Args:
+            reservations (Iterable[Reservation]): The accepted reservations.
+
+        Raises:
+            BookingConflictError: If the reservations overlap.
+        """
+        self._starts = []
+        self._ends = []
+        self._reservations = []
+        self._by_id = {}
+        self._lock = threading.RLock()
+        for reservation in reservations:
+            self.book(
+                reservation.start,
+                reservation.end,
+                booked_by=reservation.booked_by,
+                booking_id=reservation.id,
+            )
+
+    def __len__(self):
+        return len(self._reservations)
+
+    def __iter__(self):
+        return iter(list(self._reservations))
+
+    def __contains__(self, booking_id):
+        return booking_id in self._by_id
+
+    def _span(self, start, end):
+        # the reservations ending after `start` up to those starting before `end`
+        first = bisect.bisect_right(self._ends, start)
+        last = bisect.bisect_left(self._starts, end, lo=first)
+        return first, last
+
+    def conflicts(self, start, end):
+        """
+        Return the reservations that overlap the period from `start` to `end`.
+        """
+        start, end = utc(start), utc(end)
+        with self._lock:
+            first, last = self._span(start, end)
+            return self._reservations[first:last]
+
+    def book(self, start, end, booked_by=None, booking_id=None):
+        """
+        Reserve the period from `start` to `end`.
+
+        Args:
+            start (datetime | str): The start of the period.
+            end (datetime | str): The end of the period, after its start.
+            booked_by (str): Who booked the equipment.
+            booking_id (str): The id of the reservation, generated if None.
+
+        Returns:
+            Reservation: The accepted reservation.
+
+        Raises:
+            BookingConflictError: If the period overlaps accepted reservations.
+            ValueError: If the period is empty or the id is already used.
+        """
+        start, end = utc(start), utc(end)
+        if end <= start:
+            raise ValueError('The end of a reservation must follow its start.')
+        reservation = Reservation(
+            start=start,
+            end=end,
+            id=booking_id or uuid.uuid4().hex,
+            booked_by=booked_by,
+        )
+        with self._lock:
+            if reservation.id in self._by_id:
+                raise ValueError(f'The reservation {reservation.id} already exists.')
+            first, last = self._span(start, end)
+            if first < last:
+                raise BookingConflictError(self._reservations[first:last])
+            self._starts.insert(first, start)
+            self._ends.insert(first, end)
+            self._reservations.insert(first, reservation)
+            self._by_id[reservation.id] = reservation
+        return reservation
+
+    def cancel(self, booking_id):
+        """
+        Remove a reservation.
+
+        Returns:
+            Reservation: The cancelled reservation.
+
+        Raises:
+            KeyError: If there is no reservation with that id.
+        """
+        with self._lock:
+            reservation = self._by_id.pop(booking_id)
+            index = bisect.bisect_left(self._starts, reservation.start)
+            del self._starts[index]
+            del self._ends[index]
+            del self._reservations[index]
+        return reservation
+
+    def next_free_slot(self, duration, after, before=None):
+        """
+        Find the earliest period of `duration` that starts at or after `after`
+        and overlaps no reservation.
+
+        The first reservation that may follow `after` is found by binary search,
+        and the reservations after it are then walked until a gap is long
+        enough, or until `before`. The search therefore takes O(log n + k),
+        where k counts the reservations separated by gaps shorter than
+        `duration`, which can be all of them on a fully booked calendar without
+        `before`.
+
+        Args:
+            duration (timedelta): The length of the period.
+            after (datetime | str): The earliest start.
+            before (datetime | str): The latest end, or None for no limit.
+
+        Returns:
+            datetime: The start of the period, or None if it does not fit before
+            `before`.
+        """
+        candidate = utc(after)
+        before = None if before is None else utc(before)
+        with self._lock:
+            index = bisect.bisect_right(self._ends, candidate)
+            while index < len(self._starts):
+                if self._starts[index] >= candidate + duration:
+                    break
+                candidate = max(candidate, self._ends[index])
+                if before is not None and candidate + duration > before:
+                    return None
+                index += 1
+        if before is not None and candidate + duration > before:
+            return None
+        return candidate
@@ -0,0 +1,324 @@
+"""
+Check the parameters of a fabrication step against the capabilities of the
+equipment it references.
+
+The capabilities of an `Equipment` are `EquipmentParameterData` with a free-text
+name and unit. A capability applies to the step quantity with the same name
+written in snake case, or to the quantities listed for it in
+`CAPABILITY_QUANTITIES`. The ranges of an equipment are compiled once per set of
+capabilities, and all the parameters of a step are then compared with them in
+SI base units by a single vectorized comparison.
+
+The bounds of a capability without a unit are in the unit of the step quantity
+they are compared with. The `equipment_index`, which compares them with any
+step, takes the unit that the quantity has in every step, see
+`step_quantity_units`.
+"""
+
+import functools
+import importlib
+import re
+from typing import (
+    TYPE_CHECKING,
+    NamedTuple,
+)
+
+import numpy as np
+from nomad.metainfo import MetainfoReferenceError
+from nomad.units import ureg
+
+if TYPE_CHECKING:
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+CAPABILITY_QUANTITIES = {
+    'pressure': ('chamber_pressure',),
+    'temperature': ('chuck_temperature',),
+    'rf_power': ('power',),
+    'spin_speed': ('spin_frequency',),
+    'spinner_speed': ('spin_frequency',),
+    'gas_flow': ('total_gas_flow',),
+}
+"""The step quantities checked by capabilities whose name differs from them."""
+
+UNIT_ALIASES = {
+    'sccm': 'centimeter**3/minute',
+    'mTorr': 'millitorr',
+}
+"""Units written in the capabilities that the unit registry does not know."""
+
+CAPABILITY_CACHE_SIZE = 256
+
+STEP_MODULES = (
+    'fabrication_facilities.schema_packages.add',
+    'fabrication_facilities.schema_packages.remove',
+    'fabrication_facilities.schema_packages.transform',
+)
+"""The modules that define the fabrication steps."""
+
+
+class ParameterViolation(NamedTuple):
+    """
+    A step parameter outside of the range of a capability, in the units of the
+    step quantity and of the capability respectively.
+    """
+
+    quantity: str
+    value: float
+    quantity_unit: str
+    capability: str
+    value_min: float
+    value_max: float
+    capability_unit: str
+
+
+class CompiledCapabilities(NamedTuple):
+    """
+    The ranges of the capabilities of an equipment, indexed by the quantities
+    they apply to.
+    """
+
+    index: dict
+    names: tuple
+    units: tuple
+    value_min: np.ndarray
+    value_max: np.ndarray
+
+
+def capability_key(name):
+    """
+    Return the snake case form of a capability name, e.g. 'chamber_pressure' for
+    'Chamber pressure'.
+    """
+    return re.sub(r'[\s\-]+', '_', name.strip()).lower()
+
+
+@functools.lru_cache(maxsize=CAPABILITY_CACHE_SIZE)
+def base_conversion(unit):
+    """
+    Return the scale, offset and dimensionality that convert a value in `unit` to
+    SI base units as `value * scale + offset`, or None if the unit is unknown.
+    """
+    try:
+        zero = ureg.Quantity(0.0, UNIT_ALIASES.get(unit, unit)).to_base_units()
+        one = ureg.Quantity(1.0, UNIT_ALIASES.get(unit, unit)).to_base_units()
+    except Exception:
+        return None
+    return one.magnitude - zero.magnitude, zero.magnitude, str(one.dimensionality)
+
+
+def capability_conversion(unit, quantity_unit):
+    """
+    Return the scale, offset and dimensionality that convert the bounds of a
+    capability to SI base units, or None if its unit is unknown. The bounds of
+    a capability without a unit are in `quantity_unit`, the unit of the step
+    quantity they are compared with, which may be None if it is not known.
+    """
+    unit = unit or quantity_unit
+    if not unit:
+        return None
+    return base_conversion(unit)
+
+
+@functools.lru_cache(maxsize=CAPABILITY_CACHE_SIZE)
+def compile_capabilities(capabilities):
+    """
+    Build the range arrays of a set of capabilities.
+
+    Args:
+        capabilities (tuple[tuple]): The name, unit, minimum and maximum of each
+        capability, as returned by `capability_rows`.
+
+    Returns:
+        CompiledCapabilities: The ranges, with NaN for the missing bounds.
+    """
+    index = {}
+    for position, (name, *_) in enumerate(capabilities):
+        key = capability_key(name)
+        for quantity in (key, *CAPABILITY_QUANTITIES.get(key, ())):
+            index.setdefault(quantity, position)
+    bounds = np.array(
+        [(value_min, value_max) for _, _, value_min, value_max in capabilities],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    return CompiledCapabilities(
+        index=index,
+        names=tuple(name for name, *_ in capabilities),
+        units=tuple(unit for _, unit, *_ in capabilities),
+        value_min=bounds[:, 0],
+        value_max=bounds[:, 1],
+    )
+
+
+def capability_rows(equipment):
+    """
+    Return the named capabilities of an equipment as hashable rows.
+    """
+    return tuple(
+        (
+            capability.name,
+            capability.unit or None,
+            np.nan if capability.value_min is None else capability.value_min,
+            np.nan if capability.value_max is None else capability.value_max,
+        )
+        for capability in getattr(equipment, 'capabilities', None) or ()
+        if capability.name
+    )
+
+
+@functools.lru_cache(maxsize=CAPABILITY_CACHE_SIZE)
+def unit_quantities(section_def):
+    """
+    Return the units of the scalar quantities with a unit of a section definition.
+    """
+    return {
+        name: quantity.unit
+        for name, quantity in section_def.all_quantities.items()
+        if quantity.unit is not None and not quantity.shape
+    }
+
+
+@functools.cache
+def step_quantity_units():
+    """
+    Return the units of the scalar quantities of the fabrication steps, by name,
+    for the quantities that have the same unit in every step.
+    """
+    from fabrication_facilities.schema_packages.fabrication_utilities import (
+        FabricationProcessStep,
+    )
+
+    for module in STEP_MODULES:
+        importlib.import_module(module)
+    units = {}
+    pending = [FabricationProcessStep]
+    while pending:
+        step_class = pending.pop()
+        pending.extend(step_class.__subclasses__())
+        for name, unit in unit_quantities(step_class.m_def).items():
+            units.setdefault(name, set()).add(str(unit))
+    return {name: unit for name, (unit, *others) in units.items() if not others}
+
+
+def step_parameters(step, names):
+    """
+    Return the set scalar quantities with a unit among `names` of a step.
+
+    Returns:
+        list[tuple[str, float, Unit]]: The name, magnitude and unit of each.
+    """
+    units = unit_quantities(step.m_def)
+    parameters = []
+    for name in names:
+        unit = units.get(name)
+        if unit is None:
+            continue
+        value = getattr(step, name)
+        if value is not None:
+            parameters.append((name, float(value.m_as(unit)), unit))
+    return parameters
+
+
+def check_step_parameters(step, equipment, logger: 'BoundLogger' = None):
+    """
+    Compare the parameters of a step with the capabilities of an equipment.
+
+    Args:
+        step (FabricationProcessStep): The step with the parameters.
+        equipment (Equipment): The equipment with the capabilities.
+        logger (BoundLogger): A structlog logger to warn about capabilities with
+        units that are unknown or incompatible with their quantity.
+
+    Returns:
+        list[ParameterViolation]: The parameters outside of their range.
+    """
+    rows = capability_rows(equipment)
+    if not rows:
+        return []
+    compiled = compile_capabilities(rows)
+    matched = []
+    for name, value, unit in step_parameters(step, compiled.index):
+        position = compiled.index.get(name)
+        if position is None:
+            continue
+        quantity_conversion = base_conversion(unit)
+        capability_unit = compiled.units[position]
+        bounds_conversion = capability_conversion(capability_unit, unit)
+        if (
+            quantity_conversion is None
+            or bounds_conversion is None
+            or bounds_conversion[2] != quantity_conversion[2]
+        ):
+            if logger is not None:
+                logger.warning(
+                    'Capability unit is not compatible with the step quantity.',
+                    capability=compiled.names[position],
+                    capability_unit=capability_unit,
+                    quantity=name,
+                    quantity_unit=str(unit),
+                )
+            continue
+        matched.append(
+            (name, value, unit, position, quantity_conversion, bounds_conversion)
+        )
+    if not matched:
+        return []
+    positions = np.array([item[3] for item in matched])
+    values = np.array([item[1] for item in matched])
+    scale, offset = np.array([item[4][:2] for item in matched]).T
+    capability_scale, capability_offset = np.array([item[5][:2] for item in matched]).T
+    values = values * scale + offset
+    value_min = compiled.value_min[positions] * capability_scale + capability_offset
+    value_max = compiled.value_max[positions] * capability_scale + capability_offset
+    # NaN bounds compare as False, so a missing bound is never violated
+    outside = (values < value_min) | (values > value_max)
+    return [
+        ParameterViolation(
+            quantity=name,
+            value=value,
+            quantity_unit=str(unit),
+            capability=compiled.names[position],
+            value_min=float(compiled.value_min[position]),
+            value_max=float(compiled.value_max[position]),
+            capability_unit=compiled.units[position] or str(unit),
+        )
+        for (name, value, unit, position, *_), violated in zip(matched, outside)
+        if violated
+    ]
+
+
+def referenced_equipment(step):
+    """
+    Return the sections referenced in the `instruments` of a step that have
+    capabilities, skipping the references that cannot be resolved.
+    """
+    equipment = []
+    for instrument in getattr(step, 'instruments', None) or ():
+        try:
+            section = instrument.section
+            if section is not None and getattr(section, 'capabilities', None):
+                equipment.append(section)
+        except MetainfoReferenceError:
+            continue
+    return equipment
+
+
+def validate_step_parameters(step, logger: 'BoundLogger') -> list:
+    """
+    Warn about the parameters of a step that are outside of the capabilities of
+    any equipment it references.
+
+    Returns:
+        list[ParameterViolation]: The violations found for all the equipment.
+    """
+    violations = []
+    for equipment in referenced_equipment(step):
+        for violation in check_step_parameters(step, equipment, logger):
+            logger.warning(
+                'Step parameter outside of the capabilities of the equipment.',
+                equipment=equipment.name,
+                **violation._asdict(),
+            )
+            violations.append(violation)
+    return violations
@@ -0,0 +1,418 @@
+"""
+Index of the equipment by the ranges of their capabilities and their techniques,
+to find the equipment that can run a recipe.
+
+For every parameter the index keeps the ranges of all the equipment in SI base
+units, in arrays sorted by their lower bound. Finding the equipment whose range
+contains a value is then a binary search followed by a vectorized comparison of
+the upper bounds of the candidates, and a query with several parameters
+intersects the results. Updating an equipment only marks the parameters it
+touches, whose arrays are rebuilt on the next query.
+
+The index also maps every technique sub-category, by id and by name, to the
+equipment that implement it, with their location and bookability, so planners
+do not need a search query to list them.
+
+The equipment normalized in this process are added to `equipment_index`. As
+normalizing does not see the entries that are deleted, nor the equipment
+normalized by other workers, an index is also built from a directory of
+processed archives with `EquipmentIndex.update_from_archives`. Updating it
+again only reads the archives that were added or modified since the last
+update and removes the equipment whose archives were removed, or that are no
+longer equipment.
+"""
+
+import os
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+import structlog
+import yaml
+from nomad.metainfo import MetainfoReferenceError
+
+from fabrication_facilities.schema_packages.archive_files import (
+    archive_files,
+    read_archive,
+)
+from fabrication_facilities.schema_packages.capabilities import (
+    CAPABILITY_QUANTITIES,
+    base_conversion,
+    capability_conversion,
+    capability_key,
+    capability_rows,
+    step_parameters,
+    step_quantity_units,
+)
+
+EQUIPMENT_DEF = 'fabrication_facilities.schema_packages.fabrication_utilities.Equipment'
+
+logger = structlog.get_logger(__name__)
+
+
+class EquipmentSummary(NamedTuple):
+    """
+    What planners need to know about an equipment that implements a technique.
+    """
+
+    key: str
+    name: str
+    institution: str
+    affiliation: str
+    is_bookable: bool
+
+
+class EquipmentRecord(NamedTuple):
+    """
+    The ranges in SI base units, the technique labels and sub-categories and the
+    summary of an equipment.
+    """
+
+    ranges: dict
+    techniques: frozenset
+    sub_categories: frozenset
+    summary: EquipmentSummary
+
+
+class ParameterRanges(NamedTuple):
+    """
+    The ranges of one parameter, sorted by their lower bound.
+    """
+
+    lows: np.ndarray
+    highs: np.ndarray
+    keys: np.ndarray
+
+
+def technique_labels(equipment):
+    """
+    Return the lower case main and sub-categories of the techniques of an
+    equipment.
+    """
+    labels = set()
+    for technique in getattr(equipment, 'equipmentTechniques', None) or ():
+        for label in (technique.techniqueMainCategory, technique.techniqueSubCategory):
+            if label:
+                labels.add(label.strip().lower())
+    return frozenset(labels)
+
+
+def sub_category_keys(equipment):
+    """
+    Return the lower case names and the taxonomy ids of the technique
+    sub-categories of an equipment.
+    """
+    keys = set()
+    for technique in getattr(equipment, 'equipmentTechniques', None) or ():
+        if technique.techniqueSubCategory:
+            keys.add(technique.techniqueSubCategory.strip().lower())
+        # the reference is resolved when its quantities are read
+        try:
+            reference = technique.referencingcategorization
+            if reference is None:
+                continue
+            reference_keys = (reference.id, (reference.name or '').strip().lower())
+        except MetainfoReferenceError:
+            continue
+        keys.update(key for key in reference_keys if key)
+    return frozenset(keys)
+
+
+def equipment_record(equipment, key=None):
+    """
+    Build the record of an equipment. Capabilities with an unknown unit are left
+    out, and missing bounds are open. The bounds of a capability without a unit
+    are in the unit of each step quantity it applies to, as in
+    `capability_conversion`; if that unit differs between the steps, or the
+    capability applies to no step quantity, it is left out with a warning.
+
+    Returns:
+        EquipmentRecord: The ranges by parameter, the technique labels and
+        sub-categories and the summary stored under `key`.
+    """
+    ranges = {}
+    quantity_units = step_quantity_units()
+    for name, unit, value_min, value_max in capability_rows(equipment):
+        capability = capability_key(name)
+        indexed = False
+        for parameter in (capability, *CAPABILITY_QUANTITIES.get(capability, ())):
+            conversion = capability_conversion(unit, quantity_units.get(parameter))
+            if conversion is None:
+                continue
+            scale, offset, _ = conversion
+            low = -np.inf if np.isnan(value_min) else value_min * scale + offset
+            high = np.inf if np.isnan(value_max) else value_max * scale + offset
+            ranges.setdefault(parameter, (low, high))
+            indexed = True
+        if not indexed and not unit:
+            logger.warning(
+                'The unit of a capability without a unit is not known, it is not '
+                'indexed.',
+                equipment=equipment.name,
+                capability=name,
+            )
+    return EquipmentRecord(
+        ranges=ranges,
+        techniques=technique_labels(equipment),
+        sub_categories=sub_category_keys(equipment),
+        summary=EquipmentSummary(
+            key=key,
+            name=equipment.name,
+            institution=equipment.institution,
+            affiliation=equipment.affiliation,
+            is_bookable=bool(equipment.is_bookable),
+        ),
+    )
+
+
+def read_archive_equipment(path):
+    """
+    Read the equipment stored in a processed archive.
+
+    Returns:
+        tuple[str, Equipment]: The entry id, or the path if the archive has none,
+        and the equipment, or None if the data of the archive is not an
+        equipment.
+    """
+    from fabrication_facilities.schema_packages.fabrication_utilities import (
+        Equipment,
+    )
+
+    archive = read_archive(path) or {}
+    data = archive.get('data')
+    if not isinstance(data, dict) or data.get('m_def') != EQUIPMENT_DEF:
+        return None
+    metadata = archive.get('metadata') or {}
+    return metadata.get('entry_id') or path, Equipment.m_from_dict(data)
+
+
+def base_value(value):
+    """
+    Return a query value in SI base units. It may be a pint quantity, a `(value,
+    unit)` pair or a number that is already in SI base units.
+    """
+    if hasattr(value, 'to_base_units'):
+        return float(value.to_base_units().magnitude)
+    if isinstance(value, tuple):
+        magnitude, unit = value
+        conversion = base_conversion(unit)
+        if conversion is None:
+            raise ValueError(f'Unknown unit {unit!r}.')
+        return magnitude * conversion[0] + conversion[1]
+    return float(value)
+
+
+class EquipmentIndex:
+    """
+    Find the equipment whose capabilities contain a set of parameter values and
+    that implement a set of techniques.
+
+    The equipment are identified by a key chosen by the caller, usually their
+    entry id.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.by_technique = defaultdict(set)
+        self.by_parameter = defaultdict(set)
+        self.by_sub_category = defaultdict(set)
+        self._arrays = {}
+        self._dirty = set()
+        # the archive files indexed by `update_from_archives`, with their
+        # modification time, size and the key of their equipment
+        self._files = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, key):
+        return key in self.records
+
+    def update(self, key, equipment):
+        """
+        Add an equipment, or replace the one stored under the same key.
+        """
+        self._put(key, equipment_record(equipment, key))
+
+    def _put(self, key, record):
+        self.remove(key)
+        self.records[key] = record
+        for label in record.techniques:
+            self.by_technique[label].add(key)
+        for sub_category in record.sub_categories:
+            self.by_sub_category[sub_category].add(key)
+        for parameter in record.ranges:
+            self.by_parameter[parameter].add(key)
+        self._dirty.update(record.ranges)
+
+    def update_from_archives(self, directory):
+        """
+        Index the equipment of the archives found under `directory` that changed
+        since the last update and remove the equipment of the ones that no
+        longer exist. Archives that cannot be read are logged and keep the
+        equipment they had, if any, and are read again on the next update.
+
+        Returns:
+            tuple[int, int]: The number of equipment (re)indexed and removed.
+        """
+        found = archive_files(directory)
+        prefix = os.path.join(os.path.abspath(directory), '')
+        removed = [
+            path
+            for path in self._files
+            if path.startswith(prefix) and path not in found
+        ]
+        changed = [
+            path
+            for path, state in found.items()
+            if self._files.get(path, (None, None))[:2] != state
+        ]
+
+        # the records are built before the index is changed, so that an archive
+        # that cannot be read leaves its equipment as they were
+        records = {}
+        for path in changed:
+            try:
+                item = read_archive_equipment(path)
+                if item is not None:
+                    key, section = item
+                    item = key, equipment_record(section, key)
+                records[path] = item
+            except (
+                OSError,
+                ValueError,
+                AttributeError,
+                TypeError,
+                KeyError,
+                MetainfoReferenceError,
+                yaml.YAMLError,
+            ) as e:
+                logger.warning(
+                    'Could not read an archive, its equipment is not indexed.',
+                    path=path,
+                    error=f'{type(e).__name__}: {e}',
+                )
+
+        forgotten = set()
+        for path in removed + list(records):
+            *_, key = self._files.pop(path, (None, None, None))
+            if key in self.records:
+                self.remove(key)
+                forgotten.add(key)
+        indexed = set()
+        for path, item in records.items():
+            key = None
+            if item is not None:
+                key, record = item
+                self._put(key, record)
+                indexed.add(key)
+            self._files[path] = (*found[path], key)
+        return len(indexed), len(forgotten - indexed)
+
+    def remove(self, key):
+        record = self.records.pop(key, None)
+        if record is None:
+            return
+        for label in record.techniques:
+            self.by_technique[label].discard(key)
+        for sub_category in record.sub_categories:
+            self.by_sub_category[sub_category].discard(key)
+        for parameter in record.ranges:
+            self.by_parameter[parameter].discard(key)
+        self._dirty.update(record.ranges)
+
+    def equipment_for(self, sub_category, bookable=None):
+        """
+        List the equipment that implement a technique sub-category.
+
+        Args:
+            sub_category (TechniqueSubCategory | str): The sub-category, as a
+            section of the taxonomy, a taxonomy id or a name.
+            bookable (bool): Only list the equipment that are bookable, or that
+            are not, if not None.
+
+        Returns:
+            list[EquipmentSummary]: The equipment, sorted by name.
+        """
+        if isinstance(sub_category, str):
+            keys = self.by_sub_category.get(sub_category, set()) | (
+                self.by_sub_category.get(sub_category.strip().lower(), set())
+            )
+        else:
+            keys = self.by_sub_category.get(sub_category.id, set()) | (
+                self.by_sub_category.get(
+                    (sub_category.name or '').strip().lower(), set()
+                )
+            )
+        summaries = [self.records[key].summary for key in keys]
+        if bookable is not None:
+            summaries = [item for item in summaries if item.is_bookable == bookable]
+        return sorted(summaries, key=lambda item: (item.name or '', item.key))
+
+    def parameters(self):
+        """
+        Return the parameters that at least one equipment has a range for.
+        """
+        return {parameter for parameter, keys in self.by_parameter.items() if keys}
+
+    def _ranges(self, parameter):
+        if parameter in self._dirty or parameter not in self._arrays:
+            self._dirty.discard(parameter)
+            keys = sorted(self.by_parameter.get(parameter, ()))
+            bounds = np.array(
+                [self.records[key].ranges[parameter] for key in keys], dtype=np.float64
+            ).reshape(-1, 2)
+            order = np.argsort(bounds[:, 0], kind='stable')
+            self._arrays[parameter] = ParameterRanges(
+                lows=bounds[order, 0],
+                highs=bounds[order, 1],
+                keys=np.array(keys, dtype=object)[order],
+            )
+        return self._arrays[parameter]
+
+    def containing(self, parameter, value):
+        """
+        Return the keys of the equipment whose range of `parameter` contains
+        `value`, given as in `base_value`.
+        """
+        ranges = self._ranges(capability_key(parameter))
+        value = base_value(value)
+        end = np.searchsorted(ranges.lows, value, side='right')
+        return set(ranges.keys[:end][ranges.highs[:end] >= value])
+
+    def find(self, parameters=None, techniques=()):
+        """
+        Find the equipment that can run a recipe.
+
+        Args:
+            parameters (dict): The values of the recipe by parameter name, given
+            as in `base_value`.
+            techniques (Iterable[str]): Technique main or sub-categories that the
+            equipment must all implement.
+
+        Returns:
+            list: The sorted keys of the matching equipment.
+        """
+        matches = set(self.records)
+        for label in techniques:
+            matches &= self.by_technique.get(label.strip().lower(), set())
+        for parameter, value in (parameters or {}).items():
+            if not matches:
+                break
+            matches &= self.containing(parameter, value)
+        return sorted(matches)
+
+    def find_for_step(self, step, techniques=()):
+        """
+        Find the equipment whose capabilities contain the parameters of a step
+        that any equipment has a range for.
+        """
+        parameters = {
+            name: (value, unit)
+            for name, value, unit in step_parameters(step, self.parameters())
+        }
+        return self.find(parameters, techniques)
+
+
+equipment_index = EquipmentIndex()
+"""The equipment normalized in this process, by entry id or name."""
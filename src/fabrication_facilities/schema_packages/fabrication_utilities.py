@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from datetime import datetime
 from typing import (
     TYPE_CHECKING,
 )
@@ -34,14 +35,37 @@ from nomad.datamodel.metainfo.workflow import Link
 from nomad.metainfo import (
     Datetime,
     MEnum,
+    MetainfoReferenceError,
     Package,
     Quantity,
     Section,
     SubSection,
 )
 
+from fabrication_facilities.schema_packages.booking import (
+    BookingCalendar,
+    BookingConflictError,
+    Reservation,
+    booking_id,
+)
+from fabrication_facilities.schema_packages.capabilities import validate_step_parameters
+from fabrication_facilities.schema_packages.equipment_index import equipment_index
 from fabrication_facilities.schema_packages.Items import Item, ItemPropertyDefinition
-from fabrication_facilities.schema_packages.utils import parse_chemical_formula
+from fabrication_facilities.schema_packages.logbook import offload_logbook
+from fabrication_facilities.schema_packages.profiling import profiled
+from fabrication_facilities.schema_packages.references import (
+    invalidate_references,
+    resolve_references,
+)
+from fabrication_facilities.schema_packages.taxonomy import (
+    invalidate_taxonomy,
+    sub_category_entry,
+)
+from fabrication_facilities.schema_packages.utilization import equipment_utilization
+from fabrication_facilities.schema_packages.utils import (
+    CompositionNormalizer,
+    normalize_compositions,
+)
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -75,6 +99,7 @@ class TechniqueSubCategory(ArchiveSection):
         a_eln={'component': 'RichTextEditQuantity'},
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `techniqueSubCategory` class.
@@ -112,6 +137,7 @@ class TechniqueMainCategory(ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `techniqueMainCategory` class.
@@ -149,6 +175,7 @@ class TechniqueGeneralCategory(ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `finaltechnique` class.
@@ -182,6 +209,7 @@ class TechniqueCategories(EntryData, ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `TechniqueCategories` class.
@@ -192,6 +220,8 @@ class TechniqueCategories(EntryData, ArchiveSection):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        invalidate_taxonomy(self)
+        invalidate_references(archive)
 
 
 class EquipmentTechnique(ArchiveSection):
@@ -255,6 +285,7 @@ class EquipmentTechnique(ArchiveSection):
         a_eln={'component': 'ReferenceEditQuantity'},
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `EquipmentTechnique` class.
@@ -265,6 +296,33 @@ class EquipmentTechnique(ArchiveSection):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        if self.referencingcategorization is None:
+            return
+        try:
+            entry = sub_category_entry(self.referencingcategorization)
+        except MetainfoReferenceError:
+            logger.warning('Could not resolve the referenced technique category.')
+            return
+        if entry is None:
+            return
+        if not self.techniqueSubCategory:
+            self.techniqueSubCategory = entry.sub
+        main = (entry.main or '').strip().lower()
+        if not main:
+            return
+        if self.techniqueMainCategory is None:
+            try:
+                self.techniqueMainCategory = main
+            except ValueError:
+                logger.warning(
+                    'The main category of the taxonomy is not a techniqueMainCategory.',
+                    main_category=entry.main,
+                )
+        elif self.techniqueMainCategory != main:
+            logger.warning(
+                'The techniqueMainCategory differs from the referenced taxonomy.',
+                main_category=entry.main,
+            )
 
 
 class ItemPermittedPropertyDefinition(ItemPropertyDefinition, ArchiveSection):
@@ -297,6 +355,7 @@ class ItemPermittedPropertyDefinition(ItemPropertyDefinition, ArchiveSection):
         a_eln={'component': 'NumberEditQuantity'},
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `ItemPermittedPropertyDefinition` class.
@@ -342,6 +401,7 @@ class EquipmentHasPermittedItemPropertyData(ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `EquipmentHasPermittedItemPropertyData` class.
@@ -375,6 +435,7 @@ class EquipmentParameterData(ItemPermittedPropertyDefinition, ArchiveSection):
         }
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `EquipmentParameterData` class.
@@ -425,6 +486,7 @@ class ListofProductType(EntryData, ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `FabricationProcessProductType` class.
@@ -514,10 +576,20 @@ class FabricationProcessStepBase(ProcessStep, EntryData, ArchiveSection):
         type=str,
         a_eln={'component': 'RichTextEditQuantity'},
     )
+    composition_fingerprints = Quantity(
+        type=str,
+        shape=['*'],
+        description='Fingerprints of the formulas the elemental compositions were '
+        'derived from',
+    )
+
+    composition_normalizers = ()
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
-        The normalizer for the `FabricationProcessStep` class.
+        The normalizer for the `FabricationProcessStep` class. Fills the elemental
+        compositions declared in `composition_normalizers` by the step classes.
 
         Args:
             archive (EntryArchive): The archive containing the section that is being
@@ -525,6 +597,9 @@ class FabricationProcessStepBase(ProcessStep, EntryData, ArchiveSection):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        invalidate_references(archive)
+        resolve_references(self, archive, logger)
+        normalize_compositions(self, logger)
 
 
 class Jobdone(ArchiveSection):
@@ -578,6 +653,7 @@ class Jobdone(ArchiveSection):
         a_eln={'component': 'ReferenceEditQuantity'},
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `Jobdone` class.
@@ -590,6 +666,95 @@ class Jobdone(ArchiveSection):
         super().normalize(archive, logger)
 
 
+class Booking(ArchiveSection):
+    """
+    A reservation of a bookable equipment.
+    """
+
+    m_def = Section(
+        a_eln={
+            'properties': {
+                'order': ['id', 'booked_by', 'starting_date', 'ending_date', 'notes']
+            }
+        },
+    )
+    id = Quantity(
+        type=str,
+        a_eln={'component': 'StringEditQuantity'},
+    )
+    booked_by = Quantity(
+        type=str,
+        a_eln={'component': 'StringEditQuantity'},
+    )
+    starting_date = Quantity(
+        type=Datetime,
+        a_eln={'component': 'DateTimeEditQuantity'},
+    )
+    ending_date = Quantity(
+        type=Datetime,
+        a_eln={'component': 'DateTimeEditQuantity'},
+    )
+    notes = Quantity(
+        type=str,
+        a_eln={'component': 'StringEditQuantity'},
+    )
+
+
+class EquipmentUtilization(ArchiveSection):
+    """
+    The utilization of an equipment, derived from the dates of the jobs in its
+    logbook.
+    """
+
+    m_def = Section()
+
+    busy_time = Quantity(
+        type=np.float64,
+        description='Time covered by at least one job',
+        unit='hour',
+    )
+    idle_time = Quantity(
+        type=np.float64,
+        description='Time between the jobs',
+        unit='hour',
+    )
+    longest_idle_gap = Quantity(
+        type=np.float64,
+        description='Longest time between two jobs',
+        unit='hour',
+    )
+    overlapping_jobs = Quantity(
+        type=int,
+        description='Number of jobs that start before an earlier job ends',
+    )
+    overlap_time = Quantity(
+        type=np.float64,
+        description='Time booked more than once by overlapping jobs',
+        unit='hour',
+    )
+    utilization = Quantity(
+        type=np.float64,
+        description='Fraction of the time between the first and the last job '
+        'that the equipment was busy',
+    )
+    week_starts = Quantity(
+        type=Datetime,
+        shape=['*'],
+        description='Monday of each week between the first and the last job',
+    )
+    weekly_busy_time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Busy time of each week',
+        unit='hour',
+    )
+    weekly_utilization = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Fraction of each week that the equipment was busy',
+    )
+
+
 class Equipment(Instrument, EntryData, ArchiveSection):
     """
     Class autogenerated from yaml schema.
@@ -644,6 +809,16 @@ class Equipment(Instrument, EntryData, ArchiveSection):
         type=bool,
         a_eln={'component': 'BoolEditQuantity'},
     )
+    logbook_store = Quantity(
+        type=str,
+        description='Directory of the upload where the logbook is stored in columns '
+        'instead of the equipmentLogBook subsection',
+        a_eln={'component': 'StringEditQuantity'},
+    )
+    logbook_jobs = Quantity(
+        type=int,
+        description='Number of jobs in the logbook store',
+    )
     capabilities = SubSection(section_def=EquipmentParameterData, repeats=True)
     equipmentTechniques = SubSection(
         section_def=EquipmentTechnique,
@@ -657,7 +832,13 @@ class Equipment(Instrument, EntryData, ArchiveSection):
         section_def=Jobdone,
         repeats=True,
     )
+    bookings = SubSection(
+        section_def=Booking,
+        repeats=True,
+    )
+    utilization = SubSection(section_def=EquipmentUtilization)
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `Equipment` class.
@@ -668,6 +849,100 @@ class Equipment(Instrument, EntryData, ArchiveSection):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        invalidate_references(archive)
+        offload_logbook(self, archive, logger)
+        self.normalize_utilization(archive)
+        self.normalize_bookings(logger)
+        key = getattr(archive.metadata, 'entry_id', None) or self.name
+        if key:
+            equipment_index.update(key, self)
+
+    def booking_calendar(self):
+        """
+        Returns:
+            BookingCalendar: The calendar of the dated `bookings`.
+
+        Raises:
+            BookingConflictError: If the bookings overlap.
+        """
+        return BookingCalendar(
+            Reservation(
+                start=booking.starting_date,
+                end=booking.ending_date,
+                id=booking.id,
+                booked_by=booking.booked_by,
+            )
+            for booking in self.bookings
+            if booking.starting_date and booking.ending_date
+        )
+
+    def save_bookings(self, calendar):
+        """
+        Replace the dated `bookings` with the reservations of a calendar, keeping
+        the notes of the bookings that are still there. The bookings without a
+        starting or an ending date are not in the calendar and are kept after
+        the reservations.
+        """
+        notes = {booking.id: booking.notes for booking in self.bookings}
+        undated = [
+            booking
+            for booking in self.bookings
+            if not (booking.starting_date and booking.ending_date)
+        ]
+        self.bookings = [
+            Booking(
+                id=reservation.id,
+                booked_by=reservation.booked_by,
+                starting_date=reservation.start,
+                ending_date=reservation.end,
+                notes=notes.get(reservation.id),
+            )
+            for reservation in calendar
+        ] + undated
+
+    def normalize_bookings(self, logger: 'BoundLogger') -> None:
+        if not self.bookings:
+            return
+        if not self.is_bookable:
+            logger.warning('The equipment has bookings but is not bookable.')
+        taken = {booking.id for booking in self.bookings if booking.id}
+        for booking in self.bookings:
+            if not booking.id:
+                booking.id = booking_id(
+                    booking.starting_date,
+                    booking.ending_date,
+                    booking.booked_by,
+                    taken,
+                )
+                taken.add(booking.id)
+        try:
+            calendar = self.booking_calendar()
+        except BookingConflictError as error:
+            logger.warning(
+                'The bookings of the equipment overlap.',
+                bookings=[reservation.id for reservation in error.conflicts],
+            )
+        except ValueError as error:
+            logger.warning('Invalid booking of the equipment.', exc_info=error)
+        else:
+            self.save_bookings(calendar)
+
+    def normalize_utilization(self, archive: 'EntryArchive') -> None:
+        report = equipment_utilization(self, archive)
+        if report is None:
+            self.utilization = None
+            return
+        self.utilization = EquipmentUtilization(
+            busy_time=report.busy_hours,
+            idle_time=report.idle_gaps.sum(),
+            longest_idle_gap=report.idle_gaps.max() if len(report.idle_gaps) else 0.0,
+            overlapping_jobs=report.overlapping_jobs,
+            overlap_time=report.overlap_hours,
+            utilization=report.utilization,
+            week_starts=report.week_starts.astype(datetime).tolist(),
+            weekly_busy_time=report.weekly_busy_hours,
+            weekly_utilization=report.weekly_utilization,
+        )
 
 
 class EquipmentReference(Link, ArchiveSection):
@@ -772,6 +1047,7 @@ class FabricationProcessStep(FabricationProcessStepBase, EntryData):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `FabricationProcessStep` class.
@@ -782,6 +1058,7 @@ class FabricationProcessStep(FabricationProcessStepBase, EntryData):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        validate_step_parameters(self, logger)
 
 
 class FabricationProcess(EntryData, ArchiveSection):
@@ -881,6 +1158,7 @@ class FabricationProcess(EntryData, ArchiveSection):
         repeats=True,
     )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         """
         The normalizer for the `FabricationProcess` class.
@@ -891,6 +1169,7 @@ class FabricationProcess(EntryData, ArchiveSection):
             logger (BoundLogger): A structlog logger.
         """
         super().normalize(archive, logger)
+        resolve_references(self, archive, logger)
 
 
 class StartingMaterial(Chemical, FabricationProcessStep, ArchiveSection):
@@ -979,27 +1258,19 @@ class StartingMaterial(Chemical, FabricationProcessStep, ArchiveSection):
     )
 
     elemental_composition = SubSection(section_def=ElementalComposition, repeats=True)
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass derived from the chemical formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'elemental_composition'),
+    )
 
 
 class SampleParenting(Entity, EntryData, ArchiveSection):
@@ -0,0 +1,373 @@
+"""
+Parsing of chemical formulas and the compositions derived from them.
+
+This module only depends on NumPy (and SciPy for sparse results), so the formula
+utilities can be used without loading the NOMAD metainfo.
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from fabrication_facilities.schema_packages.periodic_table import (
+    atomic_numbers,
+    atomic_weights,
+    chemical_symbols,
+)
+
+_FORMULA_TOKEN = re.compile(
+    r'(?P<element>[A-Z][a-z]*)'
+    r'|(?P<count>\d+)'
+    r'|(?P<open>[(\[{])'
+    r'|(?P<close>[)\]}])'
+    r'|(?P<separator>[.·*])'
+)
+
+MAX_ATOM_COUNT = 10**15
+"""The cap of the numbers and the multiplied counts of a formula."""
+_MAX_COUNT_DIGITS = len(str(MAX_ATOM_COUNT))
+
+
+def _merge_counts(target, source):
+    for element, count in source.items():
+        target[element] = target.get(element, 0) + count
+
+
+def _multiply_counts(target, source, multiplier):
+    # sums only grow with the length of the formula, products grow with its nesting
+    for element, count in source.items():
+        target[element] = min(
+            target.get(element, 0) + count * multiplier, MAX_ATOM_COUNT
+        )
+
+
+def parse_chemical_formula(formula):
+    """
+    Parse a chemical formula into its elements and the number of atoms of each.
+
+    Groups in round, square or curly brackets are resolved on a stack by
+    multiplying the counts of the group, never by repeating its text, so the
+    parsing time is linear in the length of the formula whatever the nesting.
+    Parts separated by `.`, `·` or `*` (e.g. the water of a hydrate) are summed,
+    each one multiplied by its leading coefficient if present. Characters that
+    are not part of a formula are ignored and unbalanced brackets are closed at
+    the end of the part they belong to. Numbers and multiplied counts are capped
+    at `MAX_ATOM_COUNT`, so no formula overflows the float molar mass.
+
+    Args:
+        formula (str): The chemical formula, e.g. `Ca(OH)2` or `CuSO4·5H2O`.
+
+    Returns:
+        tuple[list[str], list[int]]: The elements in order of first appearance
+        and the corresponding counts.
+    """
+    totals = {}
+    stack = [{}]
+    closed_group = None
+    last_element = None
+    part_multiplier = 1
+    part_started = False
+
+    def close_part():
+        while len(stack) > 1:
+            _merge_counts(stack[-2], stack.pop())
+        if part_multiplier == 1:
+            _merge_counts(totals, stack[0])
+        else:
+            _multiply_counts(totals, stack[0], part_multiplier)
+        stack[0] = {}
+
+    for match in _FORMULA_TOKEN.finditer(formula):
+        kind = match.lastgroup
+        if kind == 'count':
+            count = match.group()
+            # `int` refuses the longest numbers, which are over the cap anyway
+            count = int(count) if len(count) <= _MAX_COUNT_DIGITS else MAX_ATOM_COUNT
+            if closed_group is not None:
+                _multiply_counts(stack[-1], closed_group, count)
+                closed_group = None
+            elif last_element is not None:
+                stack[-1][last_element] += count - 1
+            elif not part_started:
+                part_multiplier = min(part_multiplier * count, MAX_ATOM_COUNT)
+            last_element = None
+            continue
+        if closed_group is not None:
+            _merge_counts(stack[-1], closed_group)
+            closed_group = None
+        last_element = None
+        part_started = True
+        if kind == 'element':
+            last_element = match.group()
+            stack[-1][last_element] = stack[-1].get(last_element, 0) + 1
+        elif kind == 'open':
+            stack.append({})
+        elif kind == 'close':
+            if len(stack) > 1:
+                closed_group = stack.pop()
+        else:
+            close_part()
+            part_multiplier = 1
+            part_started = False
+
+    if closed_group is not None:
+        _merge_counts(stack[-1], closed_group)
+    close_part()
+
+    return list(totals.keys()), list(totals.values())
+
+
+def parse_chemical_formulas(formulas, sparse=False):
+    """
+    Parse many chemical formulas at once into an element-count matrix.
+
+    Identical formulas are parsed only once. The columns follow the periodic
+    table, so matrices from different calls can be compared or stacked directly;
+    symbols that are not chemical elements are left out.
+
+    Args:
+        formulas (Sequence[str]): The chemical formulas, one per row.
+        sparse (bool): Return `scipy.sparse.csr_matrix` instead of dense arrays.
+
+    Returns:
+        tuple[tuple[str, ...], ndarray, ndarray]: The element of each column, the
+        number of atoms of each element per formula and the atomic fractions per
+        formula. Rows of formulas without atoms are all zeros.
+    """
+    keys = [''.join(formula.split()) for formula in formulas]
+    rows = {}
+    for key in keys:
+        rows.setdefault(key, len(rows))
+    inverse = np.fromiter((rows[key] for key in keys), dtype=np.intp, count=len(keys))
+
+    row_index, column_index, values = [], [], []
+    for formula, row in rows.items():
+        for element, count in zip(*parse_chemical_formula(formula)):
+            number = atomic_numbers.get(element)
+            if number is not None:
+                row_index.append(row)
+                column_index.append(number - 1)
+                values.append(count)
+    shape = (len(rows), len(chemical_symbols))
+    values = np.asarray(values, dtype=np.float64)
+
+    if sparse:
+        from scipy.sparse import csr_matrix, diags
+
+        unique_counts = csr_matrix((values, (row_index, column_index)), shape=shape)
+        counts = unique_counts[inverse]
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+        scale = np.divide(1, totals, out=np.zeros_like(totals), where=totals != 0)
+        fractions = diags(scale) @ counts
+        return chemical_symbols, counts, fractions.tocsr()
+
+    unique_counts = np.zeros(shape)
+    np.add.at(unique_counts, (row_index, column_index), values)
+    counts = unique_counts[inverse]
+    totals = counts.sum(axis=1, keepdims=True)
+    fractions = np.divide(counts, totals, out=np.zeros_like(counts), where=totals != 0)
+    return chemical_symbols, counts, fractions
+
+
+def composition_masses(counts, elements=chemical_symbols):
+    """
+    Compute the mass fractions and the molar mass from the number of atoms of each
+    element.
+
+    The same call works on the counts of a single formula and on a matrix with one
+    formula per row, dense or sparse, such as the one returned by
+    `parse_chemical_formulas`.
+
+    Args:
+        counts (ArrayLike): The counts, with the last axis following `elements`.
+        elements (Sequence[str]): The element of each column. Symbols that are not
+        chemical elements weigh nothing.
+
+    Returns:
+        tuple[ndarray, ndarray]: The mass fractions, shaped like `counts`, and the
+        molar masses in g/mol.
+    """
+    if elements is chemical_symbols:
+        weights = atomic_weights
+    else:
+        weights = np.array(
+            [
+                atomic_weights[atomic_numbers[element] - 1]
+                if element in atomic_numbers
+                else 0.0
+                for element in elements
+            ]
+        )
+
+    if hasattr(counts, 'multiply'):
+        from scipy.sparse import diags
+
+        masses = counts.multiply(weights).tocsr()
+        molar_mass = np.asarray(masses.sum(axis=1)).ravel()
+        scale = np.divide(
+            1, molar_mass, out=np.zeros_like(molar_mass), where=molar_mass != 0
+        )
+        return (diags(scale) @ masses).tocsr(), molar_mass
+
+    masses = np.asarray(counts, dtype=np.float64) * weights
+    molar_mass = masses.sum(axis=-1)
+    total = molar_mass[..., np.newaxis]
+    mass_fractions = np.divide(
+        masses, total, out=np.zeros_like(masses), where=total != 0
+    )
+    return mass_fractions, molar_mass
+
+
+COMPOSITION_CACHE_SIZE = 1024
+COMPOSITION_PARSER_VERSION = 5
+"""Bump whenever the compositions derived from a formula change."""
+
+
+# Lowercase spellings of formulas common in clean-room work. Other lowercase input
+# is not recased, since names such as `bhf`, `ipa` or `water` would read as wrong
+# elements.
+LOWERCASE_FORMULAS = {
+    formula.lower(): formula
+    for formula in """
+    H2 He N2 O2 O3 Ar Xe Cl2 Br2 CO2 N2O NH3 NF3 SF6 CF4 C4F8 CHF3 CH2F2 CH4 C2H2
+    SiH4 Si2H6 SiCl4 SiH2Cl2 BCl3 WF6 PH3 B2H6 GeH4 H2O H2O2 HF HCl HBr HNO3
+    H2SO4 H3PO4 NH4F KOH NaOH SiO2 Si3N4 SiC Al2O3 HfO2 ZrO2 TiO2 Ta2O5 ZnO AlN
+    GaN GaAs InP Si Ge Al Ti Cr Ni Cu W Pt Au Ag
+    """.split()
+}
+
+
+def unreadable_formula(formula):
+    """
+    Return whether no elements are read from a formula because it is all
+    lowercase and not one of the `LOWERCASE_FORMULAS`.
+    """
+    formula = ''.join(formula.split())
+    return (
+        formula.lower() == formula
+        and any(character.isalpha() for character in formula)
+        and formula not in LOWERCASE_FORMULAS
+    )
+
+
+def hill_formula(formula):
+    """
+    Return the canonical form of a chemical formula in Hill notation: carbon and
+    hydrogen first if the formula contains carbon, then the other elements in
+    alphabetical order, counts of one omitted.
+
+    `SiO2`, `O2Si`, `Si O2` and `sio2` all give `O2Si`. Formulas without uppercase
+    letters are only read if they are one of the `LOWERCASE_FORMULAS`, otherwise
+    they give an empty formula. The result is interned and cached process-wide,
+    so equal formulas share one string.
+
+    Args:
+        formula (str): The chemical formula.
+
+    Returns:
+        str: The formula in Hill notation, empty if it contains no atoms.
+    """
+    return _cached_hill_formula(''.join(formula.split()))
+
+
+@lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _cached_hill_formula(formula):
+    if formula.lower() == formula:
+        formula = LOWERCASE_FORMULAS.get(formula, '')
+    counts = dict(zip(*parse_chemical_formula(formula)))
+    if 'C' in counts:
+        order = ['C', 'H'] + sorted(counts.keys() - {'C', 'H'})
+    else:
+        order = sorted(counts)
+    return sys.intern(
+        ''.join(
+            f'{element}{counts[element] if counts[element] != 1 else ""}'
+            for element in order
+            if counts.get(element)
+        )
+    )
+
+
+def elemental_composition(formula):
+    """
+    Return the atomic fractions of the elements in a chemical formula.
+
+    The result is shared process-wide through a bounded LRU cache keyed on the
+    formula in Hill notation, so normalizing many entries that use the same few
+    formulas, however they are written, parses each of them only once. Use
+    `composition_cache_info` to read the hit and miss counters.
+
+    Args:
+        formula (str): The chemical formula.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[float, ...]]: The elements and their atomic
+        fractions. Both are empty if the formula contains no atoms.
+    """
+    return _cached_elemental_composition(hill_formula(formula))[:2]
+
+
+def composition_with_masses(formula):
+    """
+    Like `elemental_composition`, but also return the mass fractions and the molar
+    mass, from the same cache.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[float, ...], tuple[float, ...], float]: The
+        elements, their atomic fractions, their mass fractions and the molar mass
+        in g/mol.
+    """
+    return _cached_elemental_composition(hill_formula(formula))
+
+
+def element_counts(formula):
+    """
+    Return the elements of a chemical formula, in Hill order, and the number of
+    atoms of each, from the same canonical formula and cache as
+    `elemental_composition`.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[int, ...]]: The elements and their counts.
+    """
+    return _cached_element_counts(hill_formula(formula))
+
+
+@lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _cached_element_counts(formula):
+    elements, counts = parse_chemical_formula(formula)
+    return tuple(elements), tuple(counts)
+
+
+@lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _cached_elemental_composition(formula):
+    elements, counts = _cached_element_counts(formula)
+    total = sum(counts)
+    if total == 0:
+        return (), (), (), 0.0
+    mass_fractions, molar_mass = composition_masses(counts, elements)
+    return (
+        tuple(elements),
+        tuple(count / total for count in counts),
+        tuple(mass_fractions.tolist()),
+        float(molar_mass),
+    )
+
+
+def composition_cache_info():
+    """
+    Return the hits, misses, maximum size and current size of the cache used by
+    `elemental_composition`.
+    """
+    return _cached_elemental_composition.cache_info()
+
+
+def clear_composition_cache():
+    """
+    Empty the caches used by `elemental_composition`, `element_counts` and
+    `hill_formula` and reset their counters.
+    """
+    _cached_elemental_composition.cache_clear()
+    _cached_element_counts.cache_clear()
+    _cached_hill_formula.cache_clear()
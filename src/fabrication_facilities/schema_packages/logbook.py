@@ -0,0 +1,383 @@
+"""
+Append-only columnar store for the logbooks of the equipment.
+
+The busiest equipment accumulate so many `Jobdone` that keeping them in the
+`equipmentLogBook` subsection makes the archive slow to load, edit and index.
+When `Equipment.logbook_store` names a directory of the upload, the normalizer
+moves the jobs of the subsection to that directory instead:
+
+    starting_date.bin  ending_date.bin  row_hash.bin  row_offset.bin
+        one raw little-endian array per column, memory-mapped when reading
+    rows.jsonl
+        the full `Jobdone` of every row, one JSON document per line
+    logbook.json
+        the number of rows, whether they are sorted by starting date and the
+        duration of the longest job
+
+`logbook.json` is written last, so rows whose columns were only partially
+appended are ignored. The row hashes make moving the same jobs again, for
+example when the raw file is processed again, a no-op. Appends hold a lock on
+`logbook.lock`, so two normalizations of the same equipment do not interleave
+their rows.
+
+The files of a store in an upload are opened through the context of the
+archive, and `logbook_store` must be a relative path inside the raw files.
+Contexts whose raw files are not in a known local directory, where the
+directories of the store can be created, keep the jobs in the entry, see
+`raw_directory`.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+from nomad.datamodel.context import ClientContext, Context, ServerLocalContext
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on POSIX
+    fcntl = None
+
+STORE_FORMAT = 1
+
+COLUMNS = {
+    'starting_date': np.dtype('<M8[us]'),
+    'ending_date': np.dtype('<M8[us]'),
+    'row_hash': np.dtype('<u8'),
+    'row_offset': np.dtype('<i8'),
+}
+"""The dtype of each memory-mapped column."""
+
+ROWS_FILE = 'rows.jsonl'
+METADATA_FILE = 'logbook.json'
+LOCK_FILE = 'logbook.lock'
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def to_datetime64(value):
+    """
+    Return a date as a naive UTC `datetime64[us]`, or NaT for None.
+
+    Args:
+        value (datetime | str | np.datetime64): The date, as a datetime, an ISO
+        8601 string or a NumPy date.
+    """
+    if value is None:
+        return np.datetime64('NaT', 'us')
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'us')
+
+
+def store_path(path):
+    """
+    Return a `logbook_store` as a normalized path relative to the raw files of
+    the upload, or None if it is empty, absolute or leaves the raw files.
+    """
+    path = (path or '').replace('\\', '/')
+    parts = [part for part in path.split('/') if part not in ('', '.')]
+    if path.startswith('/') or not parts or '..' in parts or ':' in parts[0]:
+        return None
+    return '/'.join(parts)
+
+
+def _open_local(path, mode):
+    if 'r' not in mode:
+        os.makedirs(os.path.dirname(path) or os.path.curdir, exist_ok=True)
+    return open(path, mode)
+
+
+def _thread_lock(path):
+    with _locks_lock:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def row_hash(row):
+    """
+    Return a 64-bit hash of the serialized `Jobdone` of a row.
+    """
+    digest = hashlib.blake2b(row.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class LogbookStore:
+    """
+    The columnar logbook of one equipment, stored in a directory.
+    """
+
+    def __init__(self, path, open_file=None):
+        """
+        Args:
+            path (str): The directory of the store, created on the first append.
+            open_file (Callable[[str, str], ContextManager[IO]]): Opens a file of
+            the store from its path and binary mode, for example the `raw_file`
+            of an upload context. The local file system if None.
+        """
+        self.path = path
+        self._open_file = open_file or _open_local
+        self.metadata = self._read_metadata()
+
+    def _open(self, name, mode):
+        return self._open_file(f'{self.path}/{name}', mode)
+
+    def _read_metadata(self):
+        try:
+            with self._open(METADATA_FILE, 'rb') as file:
+                metadata = json.load(file)
+        except (FileNotFoundError, KeyError):
+            return {'format': STORE_FORMAT, 'rows': 0, 'sorted': True, 'longest_us': 0}
+        if metadata.get('format') != STORE_FORMAT:
+            raise ValueError(
+                f'Unsupported logbook store format {metadata.get("format")!r}.'
+            )
+        return metadata
+
+    def __len__(self):
+        return self.metadata['rows']
+
+    def column(self, name):
+        """
+        Memory-map a column, without reading it.
+
+        Returns:
+            np.ndarray: The read-only values of the committed rows.
+        """
+        dtype = COLUMNS[name]
+        if not len(self):
+            return np.empty(0, dtype=dtype)
+        with self._open(f'{name}.bin', 'rb') as file:
+            return np.memmap(file, dtype=dtype, mode='r', shape=(len(self),))
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._open(LOCK_FILE, 'ab') as file:
+            with _thread_lock(getattr(file, 'name', self.path)):
+                if fcntl is not None:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, jobs):
+        """
+        Append jobs that are not stored yet.
+
+        Args:
+            jobs (Iterable[Jobdone | dict]): The jobs, as sections or as their
+            serialized dictionaries.
+
+        Returns:
+            int: The number of rows appended.
+        """
+        with self._locked():
+            # another process may have appended since the store was opened
+            self.metadata = self._read_metadata()
+            return self._append(jobs)
+
+    def _append(self, jobs):
+        known = set(self.column('row_hash').tolist())
+        rows, columns = [], {name: [] for name in COLUMNS}
+        for job in jobs:
+            data = job if isinstance(job, dict) else job.m_to_dict()
+            row = json.dumps(data, sort_keys=True, default=str)
+            digest = row_hash(row)
+            if digest in known:
+                continue
+            known.add(digest)
+            rows.append(row)
+            columns['row_hash'].append(digest)
+            for name in ('starting_date', 'ending_date'):
+                columns[name].append(to_datetime64(data.get(name)))
+        if not rows:
+            return 0
+        with self._open(ROWS_FILE, 'ab') as file:
+            offset = file.tell()
+            for row in rows:
+                columns['row_offset'].append(offset)
+                encoded = f'{row}\n'.encode()
+                file.write(encoded)
+                offset += len(encoded)
+        starts = np.array(columns['starting_date'], dtype=COLUMNS['starting_date'])
+        ends = np.array(columns['ending_date'], dtype=COLUMNS['ending_date'])
+        durations = (ends - starts)[~(np.isnat(starts) | np.isnat(ends))]
+        longest = max(
+            self.metadata['longest_us'],
+            int(durations.max().astype(np.int64)) if len(durations) else 0,
+        )
+        is_sorted = self.metadata['sorted'] and not np.any(np.isnat(starts))
+        if is_sorted:
+            previous = self.column('starting_date')[-1:]
+            is_sorted = bool(
+                np.all(np.diff(np.concatenate([previous, starts])) >= np.timedelta64(0))
+            )
+        for name, dtype in COLUMNS.items():
+            self._truncate(name, dtype)
+            with self._open(f'{name}.bin', 'ab') as file:
+                file.write(np.array(columns[name], dtype=dtype).tobytes())
+        self.metadata = {
+            'format': STORE_FORMAT,
+            'rows': len(self) + len(rows),
+            'sorted': is_sorted,
+            'longest_us': longest,
+        }
+        with self._open(METADATA_FILE, 'wb') as file:
+            file.write(json.dumps(self.metadata).encode())
+        return len(rows)
+
+    def _truncate(self, name, dtype):
+        # drop the values of an append that was interrupted before the metadata
+        try:
+            with self._open(f'{name}.bin', 'r+b') as file:
+                if file.seek(0, os.SEEK_END) > len(self) * dtype.itemsize:
+                    file.truncate(len(self) * dtype.itemsize)
+        except (FileNotFoundError, KeyError):
+            pass
+
+    def between(self, start=None, end=None):
+        """
+        Find the jobs that overlap a date range. A job without an ending date is
+        taken to last an instant.
+
+        Args:
+            start: The start of the range, as in `to_datetime64`, or None.
+            end: The exclusive end of the range, as in `to_datetime64`, or None.
+
+        Returns:
+            np.ndarray: The indices of the jobs, in storage order.
+        """
+        starts = self.column('starting_date')
+        start = None if start is None else to_datetime64(start)
+        end = None if end is None else to_datetime64(end)
+        first, limit = 0, len(starts)
+        if self.metadata['sorted']:
+            # only the pages around the searched dates are read: no job that
+            # starts before the longest job ahead of the range can overlap it
+            if start is not None:
+                earliest = start - np.timedelta64(self.metadata['longest_us'], 'us')
+                first = int(np.searchsorted(starts, earliest, side='left'))
+            if end is not None:
+                limit = int(np.searchsorted(starts, end, side='left'))
+        indices = np.arange(first, max(first, limit))
+        if end is not None and not self.metadata['sorted']:
+            indices = indices[starts < end]
+        if start is not None:
+            ends = self.column('ending_date')[indices]
+            ends = np.where(np.isnat(ends), starts[indices], ends)
+            indices = indices[ends >= start]
+        return indices
+
+    def rows(self, indices=None):
+        """
+        Read the serialized jobs of some rows.
+
+        Args:
+            indices (Iterable[int]): The rows to read, or None for all of them.
+
+        Returns:
+            list[dict]: The `Jobdone` dictionaries.
+        """
+        if indices is None:
+            indices = range(len(self))
+        offsets = self.column('row_offset')
+        rows = []
+        with self._open(ROWS_FILE, 'rb') as file:
+            for index in indices:
+                file.seek(int(offsets[index]))
+                rows.append(json.loads(file.readline()))
+        return rows
+
+    def jobs(self, indices=None):
+        """
+        Read some rows as `Jobdone` sections.
+        """
+        from fabrication_facilities.schema_packages.fabrication_utilities import (
+            Jobdone,
+        )
+
+        return [Jobdone.m_from_dict(row) for row in self.rows(indices)]
+
+
+def raw_directory(context):
+    """
+    Return the local directory in which the `raw_file` of a context opens the
+    raw files, or None if it is not known.
+    """
+    if isinstance(context, ServerLocalContext):
+        return str(context._mainfile_dir)
+    if isinstance(context, ClientContext):
+        return context.local_dir
+    if type(context).raw_path is not Context.raw_path:
+        # the server context, and the contexts that tell their raw directory
+        return context.raw_path()
+    return None
+
+
+def _raw_file_opener(context, root):
+    def open_file(path, mode):
+        if 'r' not in mode:
+            # the context opens files but does not create their directories
+            os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        return context.raw_file(path, mode)
+
+    return open_file
+
+
+def archive_store(equipment, archive):
+    """
+    Return the store named by the `logbook_store` of an equipment, in the raw
+    files of the upload of the archive, or None if it has none, if the raw
+    files of its context are not in a local directory or if the path is not
+    inside the raw files.
+    """
+    context = getattr(archive, 'm_context', None)
+    path = store_path(equipment.logbook_store)
+    root = raw_directory(context) if context is not None else None
+    if root is None or path is None:
+        return None
+    return LogbookStore(path, open_file=_raw_file_opener(context, root))
+
+
+def offload_logbook(equipment, archive, logger) -> None:
+    """
+    Move the jobs of the `equipmentLogBook` of an equipment to its logbook
+    store, if it has one, and record the number of stored jobs.
+    """
+    if not equipment.logbook_store:
+        return
+    if store_path(equipment.logbook_store) is None:
+        logger.warning(
+            'The logbook store must be a relative path inside the upload.',
+            path=equipment.logbook_store,
+        )
+        return
+    context = getattr(archive, 'm_context', None)
+    if context is None or raw_directory(context) is None:
+        logger.warning(
+            'The logbook store needs the raw files of an upload, the jobs are '
+            'kept in the entry.',
+            path=equipment.logbook_store,
+        )
+        return
+    try:
+        store = archive_store(equipment, archive)
+        if equipment.equipmentLogBook:
+            store.append(equipment.equipmentLogBook)
+    except (OSError, ValueError, KeyError, NotImplementedError) as error:
+        logger.warning(
+            'Could not write the logbook store.',
+            path=equipment.logbook_store,
+            exc_info=error,
+        )
+        return
+    equipment.equipmentLogBook = []
+    equipment.logbook_jobs = len(store)
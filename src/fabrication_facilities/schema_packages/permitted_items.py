@@ -0,0 +1,225 @@
+"""
+Check whether items may be loaded into an equipment.
+
+An item is permitted if the equipment has `permittedItems` for its
+`itemShapeType` and every property listed there is within its range for the
+item. The permitted items of an equipment are compiled once into a dictionary
+from shape type to the names and range arrays of the properties, so checking an
+item costs one lookup and one vectorized comparison. `permitted_matrix` checks
+a whole lot of items against a list of equipment, comparing all the items with
+each range at once.
+
+Property names are compared in snake case and values in SI base units. An item
+that lacks a listed property, or whose value has an unknown unit, is not
+permitted, and neither is an item checked against a range whose unit is
+unknown.
+"""
+
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+from fabrication_facilities.schema_packages.capabilities import (
+    CAPABILITY_CACHE_SIZE,
+    base_conversion,
+    capability_key,
+)
+
+
+class PermittedRanges(NamedTuple):
+    """
+    The ranges that the properties of an item of one shape type must respect.
+    """
+
+    names: tuple
+    units: tuple
+    lows: np.ndarray
+    highs: np.ndarray
+
+
+class ItemCheck(NamedTuple):
+    """
+    The outcome of checking an item against an equipment.
+    """
+
+    permitted: bool
+    out_of_range: list
+    missing: list
+    unknown_units: dict
+
+
+def to_base(value, unit):
+    """
+    Return a value in SI base units, or NaN if it is not a number or its unit is
+    unknown. Values without a unit are returned as they are.
+    """
+    if hasattr(value, 'to_base_units'):
+        return float(value.to_base_units().magnitude)
+    if value is None or isinstance(value, str):
+        return np.nan
+    if not unit:
+        return float(value)
+    conversion = base_conversion(unit)
+    if conversion is None:
+        return np.nan
+    return float(value) * conversion[0] + conversion[1]
+
+
+def permitted_rows(equipment):
+    """
+    Return the permitted items of an equipment as hashable rows of the shape
+    type and the name, unit, minimum and maximum of each property.
+    """
+    return tuple(
+        (
+            permitted.itemShapeType,
+            tuple(
+                (
+                    capability_key(prop.name),
+                    prop.unit or None,
+                    prop.value_min,
+                    prop.value_max,
+                )
+                for prop in permitted.properties
+                if prop.name
+            ),
+        )
+        for permitted in getattr(equipment, 'permittedItems', None) or ()
+        if permitted.itemShapeType
+    )
+
+
+@functools.lru_cache(maxsize=CAPABILITY_CACHE_SIZE)
+def compile_permitted(rows):
+    """
+    Build the index of the permitted items of an equipment.
+
+    Args:
+        rows (tuple): The permitted items, as returned by `permitted_rows`.
+
+    Returns:
+        dict[str, list[PermittedRanges]]: The ranges by shape type. An item of
+        that shape is permitted if it respects any of them.
+    """
+    index = {}
+    for shape, properties in rows:
+        lows = [
+            -np.inf if low is None else to_base(low, unit)
+            for _, unit, low, _ in properties
+        ]
+        highs = [
+            np.inf if high is None else to_base(high, unit)
+            for _, unit, _, high in properties
+        ]
+        index.setdefault(shape, []).append(
+            PermittedRanges(
+                names=tuple(name for name, *_ in properties),
+                units=tuple(unit for _, unit, *_ in properties),
+                lows=np.array(lows, dtype=np.float64),
+                highs=np.array(highs, dtype=np.float64),
+            )
+        )
+    return index
+
+
+def permitted_index(equipment):
+    return compile_permitted(permitted_rows(equipment))
+
+
+def item_values(item):
+    """
+    Return the properties of an item in SI base units, by snake case name.
+    """
+    return {
+        capability_key(prop.name): to_base(prop.value, prop.unit)
+        for prop in getattr(item, 'properties', None) or ()
+        if prop.name
+    }
+
+
+def check_item(item, equipment):
+    """
+    Check whether an item may be loaded into an equipment.
+
+    Returns:
+        ItemCheck: Whether it is permitted and, for the closest permitted shape
+        entry, the properties out of range, the ones the item lacks and the
+        unknown units of the ranges by property.
+    """
+    entries = permitted_index(equipment).get(item.itemShapeType)
+    if not entries:
+        return ItemCheck(permitted=False, out_of_range=[], missing=[], unknown_units={})
+    values = item_values(item)
+    checks = []
+    for entry in entries:
+        vector = np.array([values.get(name, np.nan) for name in entry.names])
+        missing = np.isnan(vector)
+        # a bound is NaN if its unit is unknown
+        unknown = np.isnan(entry.lows) | np.isnan(entry.highs)
+        outside = ~(missing | unknown) & (
+            (vector < entry.lows) | (vector > entry.highs)
+        )
+        check = ItemCheck(
+            permitted=not (missing.any() or unknown.any() or outside.any()),
+            out_of_range=[name for name, bad in zip(entry.names, outside) if bad],
+            missing=[name for name, bad in zip(entry.names, missing) if bad],
+            unknown_units={
+                name: unit
+                for name, unit, bad in zip(entry.names, entry.units, unknown)
+                if bad
+            },
+        )
+        if check.permitted:
+            return check
+        checks.append(check)
+    return min(
+        checks,
+        key=lambda check: (
+            len(check.out_of_range) + len(check.missing) + len(check.unknown_units)
+        ),
+    )
+
+
+def permitted_matrix(items, equipment_list):
+    """
+    Check every item of a lot against every equipment of a list.
+
+    Args:
+        items (list[Item]): The items.
+        equipment_list (list[Equipment]): The equipment.
+
+    Returns:
+        np.ndarray: A boolean array with a row per item and a column per
+        equipment, true where the item is permitted.
+    """
+    indexes = [permitted_index(equipment) for equipment in equipment_list]
+    names = sorted(
+        {
+            name
+            for index in indexes
+            for entries in index.values()
+            for entry in entries
+            for name in entry.names
+        }
+    )
+    column = {name: position for position, name in enumerate(names)}
+    values = np.full((len(items), len(names)), np.nan)
+    for row, item in enumerate(items):
+        for name, value in item_values(item).items():
+            if name in column:
+                values[row, column[name]] = value
+    shapes = np.array([item.itemShapeType for item in items], dtype=object)
+    permitted = np.zeros((len(items), len(equipment_list)), dtype=bool)
+    for position, index in enumerate(indexes):
+        for shape, entries in index.items():
+            rows = np.flatnonzero(shapes == shape)
+            if not len(rows):
+                continue
+            for entry in entries:
+                selected = values[np.ix_(rows, [column[name] for name in entry.names])]
+                # NaN, a missing property or a bound with an unknown unit, fails
+                # both comparisons
+                inside = (selected >= entry.lows) & (selected <= entry.highs)
+                permitted[rows, position] |= inside.all(axis=1)
+    return permitted
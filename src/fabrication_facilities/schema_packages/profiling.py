@@ -0,0 +1,170 @@
+"""
+Opt-in timing of the `normalize` methods of the fabrication sections.
+
+Enable it in `nomad.yaml` with
+
+    plugins:
+      entry_points:
+        options:
+          fabrication_facilities.schema_packages:Utilities_entry_point:
+            profile_normalize: true
+            profile_allocations: true
+
+or at runtime with `enable_profiling`. Every profiled normalize then logs its wall
+time and allocation delta through the logger it was given, and the numbers are
+aggregated per upload and section class in a `NormalizeProfile`. Only the
+profiles of the `PROFILED_UPLOADS` most recently normalized uploads are kept.
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+from collections import OrderedDict, defaultdict
+
+from nomad.config import config
+
+configuration = config.get_plugin_entry_point(
+    'fabrication_facilities.schema_packages:Utilities_entry_point'
+)
+
+PROFILED_UPLOADS = 32
+
+_enabled = bool(getattr(configuration, 'profile_normalize', False))
+# whether tracemalloc was started here, so that it is not stopped for others
+_tracing = False
+if (
+    _enabled
+    and getattr(configuration, 'profile_allocations', False)
+    and not tracemalloc.is_tracing()
+):
+    tracemalloc.start()
+    _tracing = True
+_active = set()
+
+
+class NormalizeProfile:
+    """
+    Call counts, wall time and allocation deltas of normalize per section class.
+    """
+
+    def __init__(self):
+        self.sections = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'bytes': 0})
+
+    def add(self, section_class, seconds, allocated):
+        entry = self.sections[section_class]
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['bytes'] += allocated
+
+    def as_dict(self):
+        """
+        Returns:
+            dict[str, dict]: The totals of each section class, slowest first.
+        """
+        return dict(sorted(self.sections.items(), key=lambda item: -item[1]['seconds']))
+
+    def export(self, path):
+        """
+        Write the totals to `path` as JSON.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+
+_profiles = OrderedDict()
+
+
+def enable_profiling(allocations=False):
+    """
+    Start profiling the normalize methods.
+
+    Args:
+        allocations (bool): Also record allocation deltas, which starts
+        `tracemalloc` and slows normalization down noticeably.
+    """
+    global _enabled, _tracing  # noqa: PLW0603
+    _enabled = True
+    if allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracing = True
+
+
+def disable_profiling():
+    """
+    Stop profiling, and stop `tracemalloc` if `enable_profiling` started it.
+    """
+    global _enabled, _tracing  # noqa: PLW0603
+    _enabled = False
+    if _tracing:
+        tracemalloc.stop()
+        _tracing = False
+
+
+def normalize_profile(upload_id=None):
+    """
+    Return the aggregated profile of an upload, or of the sections normalized
+    outside of any upload if `upload_id` is None. The profile is empty if the
+    upload was not profiled or its profile was dropped.
+    """
+    return _profiles.get(upload_id) or NormalizeProfile()
+
+
+def _record(upload_id, section_class, seconds, allocated):
+    profile = _profiles.get(upload_id)
+    if profile is None:
+        profile = _profiles[upload_id] = NormalizeProfile()
+        if len(_profiles) > PROFILED_UPLOADS:
+            _profiles.popitem(last=False)
+    else:
+        _profiles.move_to_end(upload_id)
+    profile.add(section_class, seconds, allocated)
+
+
+def clear_profiles(upload_id=None):
+    """
+    Drop the profile of an upload, or all of them if `upload_id` is None.
+    """
+    if upload_id is None:
+        _profiles.clear()
+    else:
+        _profiles.pop(upload_id, None)
+
+
+def _upload_id(archive):
+    metadata = getattr(archive, 'metadata', None)
+    return getattr(metadata, 'upload_id', None)
+
+
+def profiled(normalize):
+    """
+    Decorate a `normalize` method so that it is profiled when profiling is on.
+
+    Only the outermost call for a section is recorded, under the class of the
+    section, so the `super().normalize` chain is not counted more than once.
+    """
+
+    @functools.wraps(normalize)
+    def wrapper(self, archive, logger):
+        if not _enabled or id(self) in _active:
+            return normalize(self, archive, logger)
+        _active.add(id(self))
+        tracing = tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            return normalize(self, archive, logger)
+        finally:
+            seconds = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[0] - before if tracing else 0
+            _active.discard(id(self))
+            section_class = type(self).__name__
+            _record(_upload_id(archive), section_class, seconds, allocated)
+            logger.info(
+                'normalize timing',
+                section_class=section_class,
+                seconds=seconds,
+                allocated_bytes=allocated,
+            )
+
+    return wrapper
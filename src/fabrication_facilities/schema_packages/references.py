@@ -0,0 +1,315 @@
+"""
+Batched resolution of the references of a section tree.
+
+NOMAD resolves a reference when it is first accessed, loading the archive it
+points into through the context of the entry. `resolve_references` instead
+collects the unresolved references of a whole section tree, such as the `steps`
+of a process or the `instruments` and `definition_of_process_step` of a step,
+groups them by the archive they point into and loads every archive once before
+resolving them.
+
+The loaded archives are also kept in `reference_cache`, an LRU shared by the
+entries processed in this worker, so the next entry of the upload that
+references the same steps or equipment does not load them again. It is keyed by
+installation, upload, entry and the last processing time of the entry, read
+from the processing database with one query per section tree, so an archive
+that another worker processed again is loaded again. Archives whose processing
+time cannot be read are not cached. The cache is bounded by the estimated size
+of the archives. Normalizing an entry also drops its cached archives, see
+`invalidate_references`.
+"""
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from urllib.parse import urldefrag
+
+import numpy as np
+from nomad.datamodel.context import ServerContext
+from nomad.datamodel.util import parse_path
+from nomad.metainfo import MetainfoReferenceError, MProxy, Reference
+
+REFERENCE_CACHE_BYTES = 64 * 2**20
+
+
+class ReferenceCache:
+    """
+    The most recently used archives loaded to resolve references, by
+    `(installation, upload_id, entry_id, last_processing_time)`, up to a total
+    estimated size in bytes.
+    """
+
+    def __init__(self, size=REFERENCE_CACHE_BYTES):
+        self.size = size
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._archives = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._archives)
+
+    def __contains__(self, key):
+        return key in self._archives
+
+    def get(self, key):
+        with self._lock:
+            cached = self._archives.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._archives.move_to_end(key)
+            return cached[0]
+
+    def put(self, key, archive, size=None):
+        """
+        Cache an archive, dropping the least recently used ones beyond the size
+        of the cache. An archive larger than the cache is not kept.
+
+        Args:
+            size (int): The size of the archive in bytes, estimated with
+            `archive_size` if None.
+        """
+        if size is None:
+            size = archive_size(archive)
+        if size > self.size:
+            return
+        with self._lock:
+            self._drop(key)
+            self._archives[key] = (archive, size)
+            self.bytes += size
+            while self.bytes > self.size:
+                self._drop(next(iter(self._archives)))
+
+    def _drop(self, key):
+        cached = self._archives.pop(key, None)
+        if cached is not None:
+            self.bytes -= cached[1]
+
+    def invalidate(self, entry_id=None, upload_id=None):
+        """
+        Drop the cached archives of an entry or of an upload, or all of them if
+        both are None.
+        """
+        with self._lock:
+            if entry_id is None and upload_id is None:
+                self._archives.clear()
+                self.bytes = 0
+                return
+            for key in list(self._archives):
+                _, key_upload_id, key_entry_id, _ = key
+                if key_entry_id == entry_id or (
+                    upload_id is not None and key_upload_id == upload_id
+                ):
+                    self._drop(key)
+
+
+reference_cache = ReferenceCache()
+"""The archives loaded to resolve references in this worker."""
+
+
+@functools.cache
+def reference_quantities(section_def):
+    """
+    Return the names of the quantities of a section definition that hold
+    references to sections.
+    """
+    return tuple(
+        name
+        for name, quantity in section_def.all_quantities.items()
+        if isinstance(quantity.type, Reference)
+    )
+
+
+def collect_references(section):
+    """
+    Return the unresolved references of a section and its sub-sections.
+    """
+    proxies = []
+    for content in section.m_all_contents(include_self=True):
+        for name in reference_quantities(content.m_def):
+            value = content.__dict__.get(name)
+            if value is None:
+                continue
+            for item in value if isinstance(value, list) else (value,):
+                if isinstance(item, MProxy):
+                    proxies.append(item)
+    return proxies
+
+
+def archive_size(archive):
+    """
+    Estimate the memory taken by the sections of an archive, in bytes.
+    """
+    size = 0
+    for section in archive.m_all_contents(include_self=True):
+        size += sys.getsizeof(section) + sys.getsizeof(section.__dict__)
+        for value in section.__dict__.values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+            elif isinstance(value, (str, bytes, list)):
+                size += sys.getsizeof(value)
+    return size
+
+
+def processing_times(context, entry_ids):
+    """
+    Return the last processing times of entries of this installation, with a
+    single query, or an empty dictionary if the context cannot tell them
+    without loading the archives.
+
+    Returns:
+        dict[str, datetime]: The processing times by entry id, for the processed
+        entries.
+    """
+    if not entry_ids or not isinstance(context, ServerContext):
+        return {}
+    from nomad.processing import Entry
+
+    entries = Entry.objects(entry_id__in=sorted(entry_ids)).only(
+        'entry_id', 'last_processing_time'
+    )
+    return {
+        entry.entry_id: entry.last_processing_time
+        for entry in entries
+        if entry.last_processing_time is not None
+    }
+
+
+def archive_key(url, upload_id):
+    """
+    Return the installation, upload and entry of the archive that a reference
+    url points into, or None if it is not an archive, for example a raw file.
+    """
+    parsed = parse_path(f'{url}#/', upload_id)
+    if parsed is None:
+        return None
+    installation, upload_id, entry_id, kind, _ = parsed
+    if kind != 'archive' or not upload_id or not entry_id:
+        return None
+    return installation, upload_id, entry_id
+
+
+def cache_keys(context, urls, upload_id):
+    """
+    Return the cache keys of the archives that reference urls point into, for
+    the archives whose processing time is known.
+
+    Returns:
+        dict[str, tuple]: The `(installation, upload_id, entry_id,
+        last_processing_time)` keys by url.
+    """
+    locations = {url: archive_key(url, upload_id) for url in urls}
+    # the processing database only knows the entries of this installation
+    locations = {
+        url: location
+        for url, location in locations.items()
+        if location is not None and location[0] is None
+    }
+    times = processing_times(
+        context, {entry_id for _, _, entry_id in locations.values()}
+    )
+    return {
+        url: (*location, times[location[2]])
+        for url, location in locations.items()
+        if location[2] in times
+    }
+
+
+def _is_processed(archive):
+    metadata = getattr(archive, 'metadata', None)
+    return getattr(metadata, 'last_processing_time', None) is not None
+
+
+def resolve_references(section, archive=None, logger=None, cache=reference_cache):
+    """
+    Resolve all the references of a section tree, loading each archive they
+    point into once.
+
+    Args:
+        section (MSection): The root of the tree.
+        archive (EntryArchive): The archive containing the section, whose
+        context loads the archives. The root of the section if None.
+        logger (BoundLogger): A structlog logger to warn about the references
+        that cannot be resolved.
+        cache (ReferenceCache): The archives shared with the other entries, or
+        None to only load them through the context.
+
+    Returns:
+        int: The number of archives that were loaded.
+    """
+    proxies = collect_references(section)
+    if not proxies:
+        return 0
+    if archive is None:
+        archive = section.m_root()
+    context = archive.m_context
+    upload_id = getattr(context, 'upload_id', None) or getattr(
+        getattr(archive, 'metadata', None), 'upload_id', None
+    )
+    # references without an archive part point into the same archive
+    urls = {
+        urldefrag(proxy.m_proxy_value).url
+        for proxy in proxies
+        if '#' in proxy.m_proxy_value
+    }
+    urls.discard('')
+    urls = sorted(
+        url for url in urls if context is not None and url not in context.archives
+    )
+    keys = cache_keys(context, urls, upload_id) if cache is not None else {}
+    loaded = 0
+    failed = set()
+    for url in urls:
+        key = keys.get(url)
+        target = cache.get(key) if key is not None else None
+        if target is not None:
+            context.cache_archive(url, target)
+            continue
+        try:
+            target = context.resolve_archive_url(url)
+        except (
+            MetainfoReferenceError,
+            KeyError,
+            OSError,
+            ValueError,
+            NotImplementedError,
+        ) as e:
+            if logger is not None:
+                logger.warning(
+                    'Could not load a referenced archive.', url=url, exc_info=e
+                )
+            failed.add(url)
+            continue
+        loaded += 1
+        if key is not None and _is_processed(target):
+            cache.put(key, target)
+    for proxy in proxies:
+        if failed and urldefrag(proxy.m_proxy_value).url in failed:
+            continue
+        try:
+            proxy.m_proxy_resolve()
+        except (MetainfoReferenceError, AttributeError, KeyError, IndexError) as e:
+            if logger is not None:
+                logger.warning(
+                    'Could not resolve a reference.',
+                    reference=proxy.m_proxy_value,
+                    exc_info=e,
+                )
+    return loaded
+
+
+def invalidate_references(archive=None, cache=reference_cache):
+    """
+    Drop the cached archive of the entry of `archive`, because it is being
+    processed again, or all the cached archives if None.
+    """
+    if archive is None:
+        cache.invalidate()
+        return
+    entry_id = getattr(getattr(archive, 'metadata', None), 'entry_id', None)
+    if entry_id:
+        cache.invalidate(entry_id=entry_id)
@@ -36,9 +36,11 @@ from nomad.metainfo import (
 from fabrication_facilities.schema_packages.fabrication_utilities import (
     FabricationProcessStep,
 )
+from fabrication_facilities.schema_packages.profiling import profiled
 from fabrication_facilities.schema_packages.utils import (
+    CompositionNormalizer,
     Massflow_controller,
-    parse_chemical_formula,
+    normalize_gas_mixture,
 )
 
 if TYPE_CHECKING:
@@ -178,30 +180,35 @@ class DRIE(Chemical, FabricationProcessStep, ArchiveSection):
         section_def=Massflow_controller,
         repeats=True,
     )
+    total_gas_flow = Quantity(
+        type=np.float64,
+        description='Total flow of the gases fed by the fluximeters',
+        unit='centimeter^3/minute',
+    )
+    gas_mixture_elemental_composition = SubSection(
+        section_def=ElementalComposition, repeats=True
+    )
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
 
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
+
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+        normalize_gas_mixture(self, logger)
 
 
 class RIE(Chemical, FabricationProcessStep, ArchiveSection):
@@ -302,31 +309,36 @@ class RIE(Chemical, FabricationProcessStep, ArchiveSection):
         section_def=Massflow_controller,
         repeats=True,
     )
+    total_gas_flow = Quantity(
+        type=np.float64,
+        description='Total flow of the gases fed by the fluximeters',
+        unit='centimeter^3/minute',
+    )
+    gas_mixture_elemental_composition = SubSection(
+        section_def=ElementalComposition, repeats=True
+    )
 
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
+
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+        normalize_gas_mixture(self, logger)
 
 
 class WetCleaning(FabricationProcessStep, ArchiveSection):
@@ -526,27 +538,19 @@ class WetEtching(Chemical, FabricationProcessStep, ArchiveSection):
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
 
 
 class Stripping(Chemical, FabricationProcessStep, ArchiveSection):
@@ -628,27 +632,19 @@ class Stripping(Chemical, FabricationProcessStep, ArchiveSection):
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+    )
 
 
 m_package.__init_metainfo__()
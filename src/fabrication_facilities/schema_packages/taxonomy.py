@@ -0,0 +1,159 @@
+"""
+Flattened lookup of the technique taxonomy.
+
+A `TechniqueCategories` entry nests general, main and sub-categories. A
+referenced sub-category section gets the categories that contain it. Finding
+the categories of a sub-category given by id or name is one dictionary lookup
+in the `TaxonomyLookup` compiled from the taxonomy, which is cached per
+taxonomy entry and processing time, so an edited taxonomy is compiled again.
+Normalizing a `TechniqueCategories` also replaces its cached lookup.
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+TAXONOMY_CACHE_SIZE = 64
+
+
+class TaxonomyEntry(NamedTuple):
+    """
+    A sub-category with the categories above it.
+    """
+
+    general: str
+    general_id: str
+    main: str
+    main_id: str
+    sub: str
+    sub_id: str
+
+
+def section_entry(sub_category):
+    """
+    Return the entry of a `TechniqueSubCategory` section from the main and
+    general categories that contain it, or None if it is not in a taxonomy.
+    """
+    main = sub_category.m_parent
+    general = getattr(main, 'm_parent', None)
+    if not hasattr(general, 'technique_main_categories'):
+        return None
+    return TaxonomyEntry(
+        general=general.name,
+        general_id=general.id,
+        main=main.name,
+        main_id=main.id,
+        sub=sub_category.name,
+        sub_id=sub_category.id,
+    )
+
+
+class TaxonomyLookup(NamedTuple):
+    """
+    The sub-categories of a taxonomy by id and by lower case name.
+    """
+
+    by_id: dict
+    by_name: dict
+
+    def find(self, sub_category):
+        """
+        Return the entry of a sub-category, given as a section, an id or a name.
+        A section of a taxonomy gets the categories that contain it, so
+        sub-categories that share an id or a name keep their own categories.
+
+        Returns:
+            TaxonomyEntry: The entry, or None if it is not in the taxonomy.
+        """
+        if not isinstance(sub_category, str):
+            entry = section_entry(sub_category)
+            if entry is not None:
+                return entry
+            entry = self.by_id.get(sub_category.id)
+            if entry is not None or not sub_category.name:
+                return entry
+            sub_category = sub_category.name
+        entry = self.by_id.get(sub_category)
+        if entry is None:
+            entry = self.by_name.get(sub_category.strip().lower())
+        return entry
+
+
+def compile_taxonomy(categories):
+    """
+    Flatten the categories of a `TechniqueCategories` section.
+
+    Returns:
+        TaxonomyLookup: The lookup of its sub-categories. Ids and names that
+        repeat keep their first sub-category.
+    """
+    by_id, by_name = {}, {}
+    for general in categories.technique_general_categories:
+        for main in general.technique_main_categories:
+            for sub in main.technique_sub_categories:
+                entry = TaxonomyEntry(
+                    general=general.name,
+                    general_id=general.id,
+                    main=main.name,
+                    main_id=main.id,
+                    sub=sub.name,
+                    sub_id=sub.id,
+                )
+                if sub.id:
+                    by_id.setdefault(sub.id, entry)
+                if sub.name:
+                    by_name.setdefault(sub.name.strip().lower(), entry)
+    return TaxonomyLookup(by_id=by_id, by_name=by_name)
+
+
+_lookups = OrderedDict()
+
+
+def taxonomy_key(categories):
+    """
+    Return the cache key of a taxonomy: its entry id and processing time, or the
+    identity of the section if it is not in a processed entry.
+    """
+    metadata = getattr(categories.m_root(), 'metadata', None)
+    entry_id = getattr(metadata, 'entry_id', None)
+    if entry_id:
+        return entry_id, metadata.last_processing_time
+    return id(categories)
+
+
+def taxonomy_lookup(categories):
+    """
+    Return the cached lookup of a `TechniqueCategories` section, compiling it
+    on the first use.
+    """
+    key = taxonomy_key(categories)
+    cached = _lookups.get(key)
+    if cached is not None:
+        _lookups.move_to_end(key)
+        return cached[0]
+    lookup = compile_taxonomy(categories)
+    # the section is kept with its lookup, so that its id is not reused
+    _lookups[key] = (lookup, categories)
+    if len(_lookups) > TAXONOMY_CACHE_SIZE:
+        _lookups.popitem(last=False)
+    return lookup
+
+
+def invalidate_taxonomy(categories=None):
+    """
+    Drop the cached lookup of a taxonomy, or of all of them if None.
+    """
+    if categories is None:
+        _lookups.clear()
+    else:
+        _lookups.pop(taxonomy_key(categories), None)
+
+
+def sub_category_entry(sub_category):
+    """
+    Return the taxonomy entry of a `TechniqueSubCategory` section, from the
+    categories that contain it.
+
+    Returns:
+        TaxonomyEntry: The entry, or None if the section is not in a taxonomy.
+    """
+    return section_entry(sub_category)
@@ -19,8 +19,9 @@ from nomad.metainfo import (
 from fabrication_facilities.schema_packages.fabrication_utilities import (
     FabricationProcessStep,
 )
+from fabrication_facilities.schema_packages.profiling import profiled
 from fabrication_facilities.schema_packages.utils import (
-    parse_chemical_formula,
+    CompositionNormalizer,
 )
 
 if TYPE_CHECKING:
@@ -462,48 +463,32 @@ class Annealing(Chemical, FabricationProcessStep, ArchiveSection):
     material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the material derived from its formula',
+        unit='g/mol',
+    )
     gas_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    gas_formula_hill = Quantity(
+        type=str,
+        description='The gas formula in Hill notation',
+    )
+    gas_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the gas derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.material_elemental_composition = elementality
-        if self.gas_formula:
-            elements, counts = parse_chemical_formula(self.gas_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.gas_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'material_elemental_composition'),
+        CompositionNormalizer('gas_formula', 'gas_elemental_composition'),
+    )
 
 
 class LTODensification(Chemical, FabricationProcessStep, ArchiveSection):
@@ -582,27 +567,19 @@ class LTODensification(Chemical, FabricationProcessStep, ArchiveSection):
     gas_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    gas_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the gas derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.gas_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'gas_elemental_composition'),
+    )
 
 
 class ThermalOxidation(Chemical, FabricationProcessStep, ArchiveSection):
@@ -687,27 +664,19 @@ class ThermalOxidation(Chemical, FabricationProcessStep, ArchiveSection):
     gas_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    gas_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the gas derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.gas_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'gas_elemental_composition'),
+    )
 
 
 class Dicing(FabricationProcessStep, ArchiveSection):
@@ -1081,27 +1050,21 @@ class SOD(Chemical, FabricationProcessStep, ArchiveSection):
     doping_material_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    doping_material_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the doping material derived from its formula',
+        unit='g/mol',
+    )
 
-    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
-        super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.doping_material_elemental_composition = elementality
+    composition_normalizers = (
+        CompositionNormalizer(
+            'chemical_formula', 'doping_material_elemental_composition'
+        ),
+    )
 
 
 class Track(Chemical, FabricationProcessStep, ArchiveSection):
@@ -1340,7 +1303,21 @@ class Track(Chemical, FabricationProcessStep, ArchiveSection):
     resist_elemental_composition = SubSection(
         section_def=ElementalComposition, repeats=True
     )
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    resist_molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass of the resist derived from its formula',
+        unit='g/mol',
+    )
+
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'resist_elemental_composition'),
+    )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
         if self.exposure_required:
@@ -1353,24 +1330,6 @@ class Track(Chemical, FabricationProcessStep, ArchiveSection):
                 },
                 unit='minute',
             )
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.resist_elemental_composition = elementality
 
 
 m_package.__init_metainfo__()
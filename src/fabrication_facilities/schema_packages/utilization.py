@@ -0,0 +1,145 @@
+"""
+Utilization of the equipment computed from the dates of their jobs.
+
+The jobs are loaded as `datetime64[us]` arrays of starting and ending dates and
+merged into disjoint busy intervals with a running maximum of the ending dates.
+The busy time of any period is then the difference of the cumulative busy time
+at its bounds, which gives the weekly figures of years of history without a
+Python loop over the jobs.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from fabrication_facilities.schema_packages.logbook import archive_store, to_datetime64
+
+HOUR = np.timedelta64(3600_000_000, 'us')
+WEEK = np.timedelta64(7 * 24, 'h').astype('m8[us]')
+FIRST_MONDAY = np.datetime64('1970-01-05', 'us')
+
+
+class UtilizationReport(NamedTuple):
+    """
+    The utilization of an equipment between its first and last job. Durations
+    are in hours and utilizations are fractions of the period.
+    """
+
+    busy_hours: float
+    idle_gaps: np.ndarray
+    overlapping_jobs: int
+    overlap_hours: float
+    utilization: float
+    week_starts: np.ndarray
+    weekly_busy_hours: np.ndarray
+    weekly_utilization: np.ndarray
+
+
+def logbook_intervals(equipment, archive=None):
+    """
+    Return the dates of the jobs of an equipment, from its `equipmentLogBook` and
+    its logbook store. Jobs without a starting date are left out and jobs
+    without an ending date take no time.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The starting and ending dates.
+    """
+    jobs = equipment.equipmentLogBook or ()
+    starts = [to_datetime64(job.starting_date) for job in jobs]
+    ends = [to_datetime64(job.ending_date) for job in jobs]
+    starts = np.array(starts, dtype='M8[us]')
+    ends = np.array(ends, dtype='M8[us]')
+    try:
+        store = archive_store(equipment, archive) if archive is not None else None
+    except (OSError, ValueError, KeyError, NotImplementedError):
+        # offload_logbook has already warned that the store cannot be used
+        store = None
+    if store is not None and len(store):
+        starts = np.concatenate([starts, store.column('starting_date')])
+        ends = np.concatenate([ends, store.column('ending_date')])
+    valid = ~np.isnat(starts)
+    starts, ends = starts[valid], ends[valid]
+    ends = np.where(np.isnat(ends) | (ends < starts), starts, ends)
+    return starts, ends
+
+
+def merge_intervals(starts, ends):
+    """
+    Merge intervals into the disjoint intervals that they cover.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, int]: The sorted starts and ends of the
+        merged intervals and the number of intervals that overlap an earlier one.
+    """
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    overlapping = starts[1:] < reach[:-1]
+    first = np.concatenate([[True], ~overlapping])
+    last = np.concatenate([first[1:], [True]])
+    return starts[first], reach[last], int(overlapping.sum())
+
+
+def busy_before(merged_starts, merged_ends, dates):
+    """
+    Return the busy time before each date, given merged intervals.
+    """
+    durations = merged_ends - merged_starts
+    cumulative = np.concatenate([[np.timedelta64(0, 'us')], np.cumsum(durations)])
+    index = np.searchsorted(merged_starts, dates, side='right')
+    previous = np.maximum(index - 1, 0)
+    partial = np.clip(dates - merged_starts[previous], np.timedelta64(0, 'us'), None)
+    partial = np.minimum(partial, durations[previous])
+    return cumulative[previous] + np.where(index > 0, partial, np.timedelta64(0, 'us'))
+
+
+def week_start(dates):
+    """
+    Return the Monday at midnight of the week of each date.
+    """
+    return FIRST_MONDAY + (dates - FIRST_MONDAY) // WEEK * WEEK
+
+
+def utilization_report(starts, ends):
+    """
+    Compute the utilization of an equipment from the dates of its jobs.
+
+    Args:
+        starts (np.ndarray): The `datetime64` starting dates of the jobs.
+        ends (np.ndarray): The `datetime64` ending dates, not before the starts.
+
+    Returns:
+        UtilizationReport: The utilization, or None if there are no jobs.
+    """
+    if not len(starts):
+        return None
+    starts = starts.astype('M8[us]')
+    ends = ends.astype('M8[us]')
+    merged_starts, merged_ends, overlapping = merge_intervals(starts, ends)
+    busy = (merged_ends - merged_starts).sum()
+    span = merged_ends[-1] - merged_starts[0]
+    bounds = np.arange(
+        week_start(merged_starts[0]), merged_ends[-1] + WEEK, WEEK, dtype='M8[us]'
+    )
+    weekly_busy = np.diff(busy_before(merged_starts, merged_ends, bounds)) / HOUR
+    return UtilizationReport(
+        busy_hours=busy / HOUR,
+        idle_gaps=(merged_starts[1:] - merged_ends[:-1]) / HOUR,
+        overlapping_jobs=overlapping,
+        overlap_hours=((ends - starts).sum() - busy) / HOUR,
+        # jobs that only last an instant keep the equipment idle
+        utilization=busy / span if span else 0.0,
+        week_starts=bounds[:-1],
+        weekly_busy_hours=weekly_busy,
+        weekly_utilization=weekly_busy / (WEEK / HOUR),
+    )
+
+
+def equipment_utilization(equipment, archive=None):
+    """
+    Compute the utilization of an equipment from its logbook.
+
+    Returns:
+        UtilizationReport: The utilization, or None if it has no dated jobs.
+    """
+    return utilization_report(*logbook_intervals(equipment, archive))
@@ -1,5 +1,4 @@
-import re
-from collections import defaultdict
+import hashlib
 from typing import (
     TYPE_CHECKING,
 )
@@ -15,6 +14,21 @@ from nomad.metainfo import (
     SubSection,
 )
 
+from fabrication_facilities.schema_packages.formula import (
+    COMPOSITION_PARSER_VERSION,
+    MAX_ATOM_COUNT,
+    composition_masses,
+    composition_with_masses,
+    element_counts,
+    hill_formula,
+    unreadable_formula,
+)
+from fabrication_facilities.schema_packages.periodic_table import (
+    atomic_numbers,
+    chemical_symbols,
+)
+from fabrication_facilities.schema_packages.profiling import profiled
+
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
         EntryArchive,
@@ -26,55 +40,187 @@ if TYPE_CHECKING:
 m_package = Package(name='Etching workflow schema')
 
 
-def parse_chemical_formula(formula):
-    formula = formula.replace('·', '.')
-    if '.' in formula:
-        main_part, hydrate_part = formula.split('.')
-    else:
-        main_part, hydrate_part = formula, None
+class CompositionNormalizer:
+    """
+    Keeps a repeating `ElementalComposition` subsection in sync with the chemical
+    formula stored in a quantity of the same section.
+
+    Sections declare their instances in the `composition_normalizers` class
+    attribute and call `normalize_compositions` from their `normalize`. When the
+    elements do not change, the existing subsections are updated in place instead
+    of being replaced.
 
-    def extract_elements(compound):
-        # Espressione per trovare elementi chimici seguiti da un numero opzionale
-        matches = re.findall(r'([A-Z][a-z]*)(\d*)', compound)
-        elements = defaultdict(int)
+    The section records a fingerprint of the formula and parser version that
+    produced each subsection in its `composition_fingerprints` quantity, and the
+    subsection is not computed again while the fingerprint matches.
+    """
 
-        for element, count in matches:
-            elements[element] += int(count) if count else 1
+    def __init__(self, formula, target, molar_mass=None, hill=None):
+        """
+        Args:
+            formula (str): The name of the quantity with the chemical formula.
+            target (str): The name of the repeating `ElementalComposition`
+            subsection to fill.
+            molar_mass (str): The name of the quantity to fill with the molar
+            mass. Defaults to `target` with `elemental_composition` replaced by
+            `molar_mass`.
+            hill (str): The name of the quantity to fill with the formula in Hill
+            notation. Defaults to `formula` followed by `_hill`.
+        """
+        self.formula = formula
+        self.target = target
+        self.molar_mass = molar_mass or target.replace(
+            'elemental_composition', 'molar_mass'
+        )
+        self.hill = hill or f'{formula}_hill'
 
-        return elements
+    def fingerprint(self, formula):
+        digest = hashlib.blake2b(
+            f'{COMPOSITION_PARSER_VERSION}:{formula}'.encode(), digest_size=8
+        ).hexdigest()
+        return f'{self.target}:{digest}'
 
-    element_main = defaultdict(int)
+    def normalize(self, section, logger: 'BoundLogger') -> None:
+        formula = getattr(section, self.formula)
+        if not formula:
+            return
+        fingerprints = list(section.composition_fingerprints or [])
+        fingerprint = self.fingerprint(formula)
+        if fingerprint in fingerprints and getattr(section, self.target):
+            return
+        self.update(section, formula, logger)
+        prefix = f'{self.target}:'
+        section.composition_fingerprints = [
+            item for item in fingerprints if not item.startswith(prefix)
+        ] + [fingerprint]
 
-    # Espandiamo le parentesi prima di estrarre gli elementi
-    while '(' in main_part:
-        main_part = re.sub(
-            r'\(([^()]*)\)(\d+)', lambda m: m.group(1) * int(m.group(2)), main_part
+    def update(self, section, formula, logger: 'BoundLogger') -> None:
+        elements, fractions, mass_fractions, molar_mass = composition_with_masses(
+            formula
         )
+        composition = [
+            item
+            for item in zip(elements, fractions, mass_fractions)
+            if item[0] in atomic_numbers
+        ]
+        if len(composition) < len(elements):
+            logger.warning(
+                'Unknown element symbols in the chemical formula.',
+                formula=formula,
+                quantity=self.formula,
+            )
+        if max(element_counts(formula)[1], default=0) >= MAX_ATOM_COUNT:
+            logger.warning(
+                'The chemical formula has too many atoms, their counts are capped.',
+                formula=formula,
+                quantity=self.formula,
+            )
+        if not composition and unreadable_formula(formula):
+            logger.warning(
+                'The chemical formula is lowercase and its element symbols are '
+                'ambiguous, write them with their case.',
+                formula=formula,
+                quantity=self.formula,
+            )
+        elif not composition:
+            logger.warning(
+                'No elements provided.', formula=formula, quantity=self.formula
+            )
+        setattr(section, self.hill, hill_formula(formula) or None)
+        setattr(section, self.molar_mass, molar_mass if composition else None)
+        update_elemental_composition(section, self.target, composition)
 
-    # Trova elementi e numeri
-    matches = re.findall(r'([A-Z][a-z]*)(\d*)', main_part)
 
-    for element, count in matches:
-        element_main[element] += (
-            int(count) if count else 1
-        )  # Se il numero manca, assume 1
+def update_elemental_composition(section, target, composition) -> None:
+    """
+    Set a repeating `ElementalComposition` subsection, updating the existing
+    subsections in place when they already describe the same elements.
 
-    if hydrate_part:
-        hydrate_match = re.match(r'(\d*)H2O', hydrate_part)
-        if hydrate_match:
-            water_molecules = (
-                int(hydrate_match.group(1)) if hydrate_match.group(1) else 1
+    Args:
+        section (ArchiveSection): The section that holds the subsection.
+        target (str): The name of the subsection.
+        composition (list[tuple[str, float, float]]): The element, atomic fraction
+        and mass fraction of each subsection.
+    """
+    existing = getattr(section, target)
+    if [item.element for item in existing] == [item[0] for item in composition]:
+        for item, (_, fraction, mass_fraction) in zip(existing, composition):
+            if item.atomic_fraction != fraction:
+                item.atomic_fraction = fraction
+            if item.mass_fraction != mass_fraction:
+                item.mass_fraction = mass_fraction
+        return
+    setattr(
+        section,
+        target,
+        [
+            ElementalComposition(
+                element=element,
+                atomic_fraction=fraction,
+                mass_fraction=mass_fraction,
             )
-            elements_hydrate = extract_elements('H2O')
+            for element, fraction, mass_fraction in composition
+        ],
+    )
+
 
-            for element, count in elements_hydrate.items():
-                element_main[element] += count * water_molecules
+def normalize_compositions(section, logger: 'BoundLogger') -> None:
+    """
+    Run the `composition_normalizers` declared by the class of `section`.
+    """
+    for normalizer in getattr(section, 'composition_normalizers', ()):
+        normalizer.normalize(section, logger)
+
+
+def normalize_gas_mixture(section, logger: 'BoundLogger') -> None:
+    """
+    Fill `total_gas_flow` and `gas_mixture_elemental_composition` of a step from
+    the `massflow` and `chemical_formula` of its `fluximeters`.
 
-    # Convertiamo il dizionario in due liste ordinate
-    elements = list(element_main.keys())
-    counts = list(element_main.values())
+    Flows in standard volumes are proportional to the molecules fed, so the atoms
+    of each element in the chamber are the flows weighted by the counts of the
+    element in each gas, computed for all the controllers in one matrix product.
+    The counts come from the canonical formula of each gas, as the compositions
+    of the controllers do. Controllers without a flow or a formula are left out.
+    """
+    controllers = [
+        controller
+        for controller in section.fluximeters
+        if controller.massflow is not None and controller.chemical_formula
+    ]
+    if not controllers:
+        section.total_gas_flow = None
+        update_elemental_composition(section, 'gas_mixture_elemental_composition', [])
+        return
 
-    return elements, counts
+    flows = np.array(
+        [
+            controller.massflow.to('centimeter^3/minute').magnitude
+            for controller in controllers
+        ]
+    )
+    counts = np.zeros((len(controllers), len(chemical_symbols)))
+    for row, controller in enumerate(controllers):
+        for element, count in zip(*element_counts(controller.chemical_formula)):
+            number = atomic_numbers.get(element)
+            if number is not None:
+                counts[row, number - 1] = count
+    atoms = flows @ counts
+    present = np.flatnonzero(atoms)
+    mass_fractions, _ = composition_masses(atoms)
+    total = atoms.sum()
+    if total == 0:
+        logger.warning('No elements provided in the fluximeters of the step.')
+
+    section.total_gas_flow = flows.sum()
+    update_elemental_composition(
+        section,
+        'gas_mixture_elemental_composition',
+        [
+            (chemical_symbols[index], atoms[index] / total, mass_fractions[index])
+            for index in present
+        ],
+    )
 
 
 class Massflow_controller(Chemical, EntryData, ArchiveSection):
@@ -95,27 +241,30 @@ class Massflow_controller(Chemical, EntryData, ArchiveSection):
     )
 
     elemental_composition = SubSection(section_def=ElementalComposition, repeats=True)
+    chemical_formula_hill = Quantity(
+        type=str,
+        description='The chemical formula in Hill notation',
+    )
+    molar_mass = Quantity(
+        type=np.float64,
+        description='Molar mass derived from the chemical formula',
+        unit='g/mol',
+    )
+    composition_fingerprints = Quantity(
+        type=str,
+        shape=['*'],
+        description='Fingerprints of the formulas the elemental compositions were '
+        'derived from',
+    )
+
+    composition_normalizers = (
+        CompositionNormalizer('chemical_formula', 'elemental_composition'),
+    )
 
+    @profiled
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.elemental_composition = elementality
+        normalize_compositions(self, logger)
 
 
 m_package.__init_metainfo__()
@@ -0,0 +1,266 @@
+"""
+Normalize a directory of step archives in parallel.
+
+Every `*.archive.json` or `*.archive.yaml` file found under the source directory
+is parsed and normalized with the plugin's schema packages in a pool of worker
+processes. Each worker writes the normalized archive as soon as it is done, to
+the same relative path under the output directory with a `.archive.json` suffix.
+When two archives of a directory would be written to the same file, such as
+`x.archive.json` and `x.archive.yaml`, the first one in name order is normalized
+and the other is reported as failed. If a worker dies, its files are run again
+one by one in a new pool, and the ones that kill it again are reported as failed.
+
+    python -m fabrication_facilities.tools.bulk_normalize archives/ normalized/ \
+        --workers 8 --chunk-size 64
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+from nomad.client import normalize_all, parse
+
+from fabrication_facilities.schema_packages.archive_files import ARCHIVE_SUFFIXES
+
+
+class NormalizedEntry(NamedTuple):
+    path: str
+    step_class: str
+    seconds: float
+    error: str
+
+
+class BulkReport:
+    """
+    Throughput, failures and per-class timings of a bulk normalization.
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.failures = []
+        self.class_timings = defaultdict(lambda: [0, 0.0])
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def add(self, entry):
+        self.processed += 1
+        if entry.error:
+            self.failures.append((entry.path, entry.error))
+            return
+        timing = self.class_timings[entry.step_class]
+        timing[0] += 1
+        timing[1] += entry.seconds
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def throughput(self):
+        """Entries per second of wall time."""
+        return self.processed / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        lines = [
+            f'{self.processed} entries in {self.seconds:.1f} s '
+            f'({self.throughput:.1f} entries/s), {len(self.failures)} failed'
+        ]
+        for step_class, (count, seconds) in sorted(
+            self.class_timings.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                f'{step_class:<30} {count:>8} {seconds:>10.2f} s '
+                f'{1000 * seconds / count:>10.1f} ms/entry'
+            )
+        lines.extend(f'FAILED {path}: {error}' for path, error in self.failures)
+        return '\n'.join(lines)
+
+
+def find_archives(directory):
+    """
+    Yield the paths of the archives under `directory`, in a stable order.
+    """
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            if name.endswith(ARCHIVE_SUFFIXES):
+                yield os.path.join(root, name)
+
+
+def output_path(path, source, output):
+    """
+    Return where the normalized archive of `path` is written.
+    """
+    relative = os.path.relpath(path, source)
+    for suffix in ARCHIVE_SUFFIXES:
+        if relative.endswith(suffix):
+            relative = relative[: -len(suffix)]
+            break
+    return os.path.join(output, f'{relative}.archive.json')
+
+
+def normalize_file(path, source, output):
+    """
+    Parse, normalize and write one archive.
+
+    Returns:
+        NormalizedEntry: The step class and the time spent, or the error that
+        made the entry fail. Only the normalization is timed.
+    """
+    try:
+        archive = parse(path)[0]
+        start = time.perf_counter()
+        normalize_all(archive)
+        seconds = time.perf_counter() - start
+        target = output_path(path, source, output)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as file:
+            json.dump(archive.m_to_dict(), file)
+    except Exception as error:
+        return NormalizedEntry(path, None, 0.0, f'{type(error).__name__}: {error}')
+    step_class = archive.data.m_def.name if archive.data is not None else None
+    return NormalizedEntry(path, step_class, seconds, None)
+
+
+def _normalize_chunk(paths, source, output):
+    return [normalize_file(path, source, output) for path in paths]
+
+
+def _unique_outputs(paths, source, output, report):
+    # archives of different directories never share an output file
+    claimed = {}
+    directory = None
+    for path in paths:
+        if os.path.dirname(path) != directory:
+            directory = os.path.dirname(path)
+            claimed = {}
+        target = output_path(path, source, output)
+        if target in claimed:
+            report.add(
+                NormalizedEntry(
+                    path,
+                    None,
+                    0.0,
+                    f'OutputCollision: {target} is written from {claimed[target]}',
+                )
+            )
+            continue
+        claimed[target] = path
+        yield path
+
+
+def _chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_normalize(source, output, workers=None, chunk_size=32, progress=None):
+    """
+    Normalize every archive under `source` into `output` with a process pool.
+
+    The archives are sent to the workers in chunks of `chunk_size`, and at most
+    two chunks per worker are queued at a time, so the directory can be larger
+    than what fits in memory.
+
+    Args:
+        source (str): The directory with the archives.
+        output (str): The directory the normalized archives are written to.
+        workers (int): The number of processes, by default one per core.
+        chunk_size (int): The number of archives sent to a worker at once.
+        progress (Callable[[BulkReport], None]): Called after every chunk.
+
+    Returns:
+        BulkReport: The counts, failures and timings of the run.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = BulkReport()
+    chunks = _chunks(
+        _unique_outputs(find_archives(source), source, output, report), chunk_size
+    )
+    retries = []
+
+    def collect(future, chunk, retry):
+        try:
+            entries = future.result()
+        except BrokenProcessPool:
+            if retry:
+                report.add(
+                    NormalizedEntry(
+                        chunk[0], None, 0.0, 'BrokenProcessPool: the worker died'
+                    )
+                )
+            else:
+                retries.extend([path] for path in chunk)
+            return True
+        for entry in entries:
+            report.add(entry)
+        return False
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        while True:
+            if retries or any(retry for _, retry in pending.values()):
+                # the files of a dead worker run alone, to find the one to blame
+                if retries and not pending:
+                    chunk = retries.pop(0)
+                    future = executor.submit(_normalize_chunk, chunk, source, output)
+                    pending[future] = (chunk, True)
+            else:
+                for chunk in chunks:
+                    future = executor.submit(_normalize_chunk, chunk, source, output)
+                    pending[future] = (chunk, False)
+                    if len(pending) >= 2 * workers:
+                        break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                broken |= collect(future, *pending.pop(future))
+            if broken:
+                for future, (chunk, retry) in pending.items():
+                    collect(future, chunk, retry)
+                pending = {}
+                executor.shutdown()
+                executor = ProcessPoolExecutor(max_workers=workers)
+            if progress is not None:
+                progress(report)
+    finally:
+        executor.shutdown()
+    report.finish()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('source')
+    parser.add_argument('output')
+    parser.add_argument('--workers', type=int, help='default: one per core')
+    parser.add_argument('--chunk-size', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    def progress(report):
+        print(f'{report.processed} entries', end='\r', file=sys.stderr, flush=True)
+
+    report = bulk_normalize(
+        args.source, args.output, args.workers, args.chunk_size, progress
+    )
+    print(file=sys.stderr)
+    print(report.summary())
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,282 @@
+"""
+Inverted index from chemical elements to the fabrication steps that involved them.
+
+The index is built from a directory of processed archives (`*.archive.json` or
+`*.archive.yaml` files, as downloaded from NOMAD) and stored in a SQLite file.
+Updating it again only reads the archives that were added or modified since the
+last run and drops the ones that were removed.
+
+    python -m fabrication_facilities.tools.element_index update archives/ index.db
+    python -m fabrication_facilities.tools.element_index query index.db Au Cu \
+        --since 2024-01-01
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+import structlog
+import yaml
+
+from fabrication_facilities.schema_packages.archive_files import (
+    archive_files,
+    read_archive,
+)
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    entry_id TEXT,
+    step_class TEXT,
+    id_item_processed TEXT,
+    date REAL
+);
+CREATE TABLE IF NOT EXISTS elements (
+    element TEXT NOT NULL,
+    step INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_path ON steps (path);
+CREATE INDEX IF NOT EXISTS elements_element ON elements (element, step);
+"""
+
+
+class IndexedStep(NamedTuple):
+    entry_id: str
+    step_class: str
+    id_item_processed: str
+    date: datetime
+    path: str
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        date = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def _collect_elements(section, elements):
+    for key, value in section.items():
+        if isinstance(value, dict):
+            _collect_elements(value, elements)
+        elif isinstance(value, list):
+            for item in value:
+                if not isinstance(item, dict):
+                    continue
+                if key.endswith('elemental_composition') and item.get('element'):
+                    elements.add(item['element'])
+                _collect_elements(item, elements)
+
+
+def read_archive_step(path):
+    """
+    Read the indexed fields of the step stored in a processed archive.
+
+    Returns:
+        tuple[str, str, str, float, set[str]]: The entry id, the step class, the
+        id of the processed item, the starting date as a POSIX timestamp and the
+        elements found in any `*elemental_composition` subsection, or None if the
+        archive has no data section.
+    """
+    archive = read_archive(path)
+    data = (archive or {}).get('data')
+    if not isinstance(data, dict):
+        return None
+    metadata = archive.get('metadata') or {}
+    elements = set()
+    _collect_elements(data, elements)
+    step_class = data.get('m_def') or metadata.get('entry_type')
+    return (
+        metadata.get('entry_id') or path,
+        step_class.rsplit('.', 1)[-1] if step_class else None,
+        data.get('id_item_processed'),
+        _timestamp(data.get('starting_date')),
+        elements,
+    )
+
+
+class ElementIndex:
+    """
+    Element → step index persisted in a SQLite database.
+    """
+
+    def __init__(self, database):
+        """
+        Args:
+            database (str): The path of the SQLite file, created if missing.
+        """
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def update(self, directory):
+        """
+        Index the archives found under `directory` that changed since the last
+        update and forget the ones that no longer exist. Archives that cannot be
+        read are logged and left out, and are read again on the next update.
+
+        Returns:
+            tuple[int, int]: The number of archives (re)indexed and removed.
+        """
+        found = archive_files(directory)
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.connection.execute(
+                'SELECT path, mtime_ns, size FROM files'
+            )
+        }
+        prefix = os.path.join(os.path.abspath(directory), '')
+        removed = [
+            path for path in known if path.startswith(prefix) and path not in found
+        ]
+        changed = [path for path, state in found.items() if known.get(path) != state]
+
+        steps = {}
+        for path in changed:
+            try:
+                steps[path] = read_archive_step(path)
+            except (
+                OSError,
+                ValueError,
+                AttributeError,
+                TypeError,
+                yaml.YAMLError,
+            ) as e:
+                logger.warning(
+                    'Could not read an archive, it is not indexed.',
+                    path=path,
+                    error=f'{type(e).__name__}: {e}',
+                )
+
+        with self.connection:
+            for path in removed + changed:
+                self._forget(path)
+            for path, step in steps.items():
+                self._add(path, *found[path], step)
+        return len(steps), len(removed)
+
+    def _forget(self, path):
+        self.connection.execute(
+            'DELETE FROM elements WHERE step IN (SELECT id FROM steps WHERE path = ?)',
+            (path,),
+        )
+        self.connection.execute('DELETE FROM steps WHERE path = ?', (path,))
+        self.connection.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def _add(self, path, mtime_ns, size, step):
+        self.connection.execute(
+            'INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)',
+            (path, mtime_ns, size),
+        )
+        if step is None:
+            return
+        *fields, elements = step
+        cursor = self.connection.execute(
+            'INSERT INTO steps (path, entry_id, step_class, id_item_processed, date) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (path, *fields),
+        )
+        self.connection.executemany(
+            'INSERT INTO elements (element, step) VALUES (?, ?)',
+            [(element, cursor.lastrowid) for element in sorted(elements)],
+        )
+
+    def lookup(self, elements, since=None, until=None):
+        """
+        Find the steps that involved any of `elements`.
+
+        Args:
+            elements (Iterable[str]): The element symbols.
+            since (datetime): Only steps that started at or after this date.
+            until (datetime): Only steps that started before this date.
+
+        Returns:
+            list[IndexedStep]: The matching steps, most recent first.
+        """
+        elements = list(elements)
+        if not elements:
+            return []
+        query = (
+            'SELECT DISTINCT s.entry_id, s.step_class, s.id_item_processed, s.date, '
+            's.path FROM elements e JOIN steps s ON s.id = e.step '
+            f'WHERE e.element IN ({", ".join("?" * len(elements))})'
+        )
+        parameters = elements
+        for operator, date in (('>=', since), ('<', until)):
+            if date is not None:
+                query += f' AND s.date {operator} ?'
+                parameters.append(_timestamp(date.isoformat()))
+        query += ' ORDER BY s.date DESC'
+        return [
+            IndexedStep(
+                entry_id,
+                step_class,
+                id_item_processed,
+                datetime.fromtimestamp(date, timezone.utc)
+                if date is not None
+                else None,
+                path,
+            )
+            for entry_id, step_class, id_item_processed, date, path in (
+                self.connection.execute(query, parameters)
+            )
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    update = commands.add_parser('update', help='index a directory of archives')
+    update.add_argument('directory')
+    update.add_argument('database')
+    query = commands.add_parser('query', help='find the steps that used elements')
+    query.add_argument('database')
+    query.add_argument('elements', nargs='+')
+    query.add_argument('--since', type=datetime.fromisoformat)
+    query.add_argument('--until', type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+
+    with ElementIndex(args.database) as index:
+        if args.command == 'update':
+            indexed, removed = index.update(args.directory)
+            print(f'{indexed} archives indexed, {removed} removed')
+        else:
+            for step in index.lookup(args.elements, args.since, args.until):
+                date = step.date.isoformat() if step.date else ''
+                print(
+                    '\t'.join(
+                        (
+                            date,
+                            step.step_class or '',
+                            step.entry_id,
+                            step.id_item_processed or '',
+                        )
+                    )
+                )
+
+
+if __name__ == '__main__':
+    main()
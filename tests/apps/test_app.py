@@ -1,5 +1,28 @@
+from fabrication_facilities.apps import (
+    load_apps,
+    process_app_entry_point,
+    step_app_entry_point,
+)
+from fabrication_facilities.apps.app_builder import build_apps, dump_apps
+from fabrication_facilities.apps.directories import APPS_FILE
+
+
 def test_importing_app():
     # this will raise an exception if pydantic model validation fails for th app
     from fabrication_facilities.apps import app_entry_point
 
     assert app_entry_point.app.label == 'Fabrication steps'
+
+
+def test_stored_apps_are_current():
+    # rebuild with `python -m fabrication_facilities.apps.app_builder`
+    with open(APPS_FILE, encoding='utf-8') as file:
+        assert file.read() == f'{dump_apps(build_apps())}\n'
+
+
+def test_entry_points_load_the_stored_apps():
+    built = build_apps()
+    assert load_apps()['step'] is step_app_entry_point.app
+    assert process_app_entry_point.app.model_dump(warnings=False) == built[
+        'process'
+    ].model_dump(warnings=False)
@@ -0,0 +1,25 @@
+from fabrication_facilities.apps import menu_steps
+from fabrication_facilities.apps.directories import MENUS_FILE
+from fabrication_facilities.apps.menu_generator import dump_menus, generate_menus
+from fabrication_facilities.apps.menu_steps import menuadd_icpcvd
+
+
+def test_stored_menus_are_current():
+    # regenerate with `python -m fabrication_facilities.apps.menu_generator`
+    with open(MENUS_FILE, encoding='utf-8') as file:
+        assert file.read() == f'{dump_menus(generate_menus())}\n'
+
+
+def test_menu_units_follow_the_schema():
+    units = {
+        item.x.search_quantity.split('#')[0]: item.x.unit
+        for item in menuadd_icpcvd.items
+        if item.type == 'histogram'
+    }
+    assert units['data.chuck_temperature'] == 'celsius'
+    assert units['data.total_gas_flow'] == 'centimeter^3/minute'
+
+
+def test_missing_menus_are_generated(monkeypatch, tmp_path):
+    monkeypatch.setattr(menu_steps, 'MENUS_FILE', str(tmp_path / 'menus.json'))
+    assert menu_steps.load_menus() == generate_menus()
@@ -0,0 +1,65 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).parent
+BASELINES = BENCHMARKS / 'baselines'
+MEMORY_TOLERANCE = 1.25
+"""Allowed relative growth of the peak memory over the stored baseline."""
+MEMORY_SLACK = 4096
+"""Allowed absolute growth in bytes, so tiny baselines do not fail on noise."""
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('benchmark_only', False):
+        return
+    skip = pytest.mark.skip(reason='benchmarks only run with --benchmark-only')
+    for item in items:
+        if BENCHMARKS in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+def _baseline_memory():
+    """
+    Read the peak memory of every benchmark from the most recent stored baseline.
+    """
+    saved = sorted(BASELINES.glob('*/*.json'), key=lambda path: path.name)
+    if not saved:
+        return {}
+    with open(saved[-1], encoding='utf-8') as file:
+        return {
+            benchmark['fullname']: benchmark['extra_info'].get('peak_memory')
+            for benchmark in json.load(file)['benchmarks']
+        }
+
+
+@pytest.fixture(scope='session')
+def baseline_memory():
+    return _baseline_memory()
+
+
+@pytest.fixture
+def peak_memory(request, benchmark, baseline_memory):
+    """
+    Measure the peak memory allocated by one call, record it next to the timings
+    and fail if it grew past the stored baseline.
+    """
+
+    def measure(function, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            function(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_memory'] = peak
+        baseline = baseline_memory.get(request.node.nodeid)
+        if baseline:
+            assert peak <= baseline * MEMORY_TOLERANCE + MEMORY_SLACK, (
+                f'peak memory {peak} B exceeds the baseline {baseline} B'
+            )
+        return peak
+
+    return measure
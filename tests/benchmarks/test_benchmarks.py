@@ -0,0 +1,391 @@
+"""
+Timings and peak memory of the formula parsing and composition hot paths, of the
+capability, equipment and permitted-item queries, of the logbooks, of the
+resolution of step references and of the start-up of the apps.
+
+    python -m pytest tests/benchmarks --benchmark-only \
+        --benchmark-storage=tests/benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+
+Add `--benchmark-save=baseline` to store a new baseline after an intended change.
+"""
+
+import importlib
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import Context
+
+from fabrication_facilities.schema_packages import references
+from fabrication_facilities.schema_packages.add import ICP_CVD, Sputtering
+from fabrication_facilities.schema_packages.capabilities import check_step_parameters
+from fabrication_facilities.schema_packages.equipment_index import EquipmentIndex
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    EquipmentHasPermittedItemPropertyData,
+    EquipmentParameterData,
+    FabricationProcessStep,
+    ItemPermittedPropertyDefinition,
+    StartingMaterial,
+)
+from fabrication_facilities.schema_packages.formula import (
+    clear_composition_cache,
+    composition_with_masses,
+    parse_chemical_formula,
+    parse_chemical_formulas,
+)
+from fabrication_facilities.schema_packages.Items import Item, NumericProperties
+from fabrication_facilities.schema_packages.logbook import LogbookStore
+from fabrication_facilities.schema_packages.periodic_table import chemical_symbols
+from fabrication_facilities.schema_packages.permitted_items import permitted_matrix
+from fabrication_facilities.schema_packages.references import (
+    ReferenceCache,
+    resolve_references,
+)
+from fabrication_facilities.schema_packages.remove import DRIE
+from fabrication_facilities.schema_packages.transform import Annealing
+from fabrication_facilities.schema_packages.utilization import utilization_report
+from fabrication_facilities.schema_packages.utils import (
+    Massflow_controller,
+    normalize_compositions,
+    normalize_gas_mixture,
+)
+
+pytest.importorskip('pytest_benchmark')
+
+APPS_PACKAGE = 'fabrication_facilities.apps'
+
+REALISTIC = [
+    'SF6',
+    'C4F8',
+    'O2',
+    'Ar',
+    'CHF3',
+    'CF4',
+    'SiH4',
+    'NH3',
+    'N2O',
+    'SiO2',
+    'Si3N4',
+    'Al2O3',
+    'HfO2',
+    'TiN',
+    'C6H18OSi2',
+    'C3H8O',
+    'C4H8O',
+    'H2SO4',
+    'HF',
+    'KOH',
+]
+
+CORPORA = {
+    'realistic': REALISTIC,
+    'nested': ['(' * depth + 'SiO2' + ')2' * depth for depth in (10, 100, 500, 1000)]
+    + ['[Co(NH3)6]Cl3', 'K4[Fe(CN)6]', 'Ca5(PO4)3(OH)'],
+    'hydrates': [
+        'CuSO4·5H2O',
+        'MgSO4.7H2O',
+        'Na2CO3·10H2O',
+        'Al2(SO4)3·18H2O',
+        'KAl(SO4)2·12H2O',
+        'Na2B4O7*10H2O',
+    ],
+    'polymers': [
+        'CH3' + 'CH2' * 2000 + 'CH3',
+        '(C5O2H8)10000',
+        '(C8H8)5000(C4H6)2000',
+        ''.join(f'({symbol}2O)3' for symbol in chemical_symbols),
+    ],
+}
+
+
+@pytest.mark.parametrize('corpus', list(CORPORA))
+def test_parse_chemical_formula(benchmark, peak_memory, corpus):
+    formulas = CORPORA[corpus]
+
+    def parse():
+        for formula in formulas:
+            parse_chemical_formula(formula)
+
+    peak_memory(parse)
+    benchmark(parse)
+
+
+def test_composition_cold_cache(benchmark, peak_memory):
+    def compose():
+        for formula in REALISTIC:
+            composition_with_masses(formula)
+
+    peak_memory(compose)
+    benchmark.pedantic(compose, setup=clear_composition_cache, rounds=200)
+
+
+def test_composition_warm_cache(benchmark, peak_memory):
+    formulas = [formula.lower() for formula in REALISTIC] + REALISTIC
+
+    def compose():
+        for formula in formulas:
+            composition_with_masses(formula)
+
+    compose()
+    peak_memory(compose)
+    benchmark(compose)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_parse_chemical_formulas(benchmark, peak_memory, sparse):
+    formulas = [
+        f'({formula}){index % 7 + 1}' for index, formula in enumerate(REALISTIC * 500)
+    ]
+    peak_memory(parse_chemical_formulas, formulas, sparse=sparse)
+    benchmark(parse_chemical_formulas, formulas, sparse=sparse)
+
+
+@pytest.mark.parametrize(
+    'step_class, formulas',
+    [
+        (StartingMaterial, {'chemical_formula': 'Si'}),
+        (Massflow_controller, {'chemical_formula': 'C4F8'}),
+        (Sputtering, {'chemical_formula': 'Al2O3'}),
+        (Annealing, {'chemical_formula': 'SiO2', 'gas_formula': 'N2'}),
+    ],
+)
+def test_step_normalizers(benchmark, peak_memory, step_class, formulas):
+    logger = structlog.get_logger()
+
+    def setup():
+        clear_composition_cache()
+        return (step_class(**formulas), logger), {}
+
+    peak_memory(normalize_compositions, *setup()[0])
+    benchmark.pedantic(normalize_compositions, setup=setup, rounds=200)
+
+
+def test_normalize_gas_mixture(benchmark, peak_memory):
+    logger = structlog.get_logger()
+
+    def setup():
+        step = DRIE(
+            fluximeters=[
+                Massflow_controller(chemical_formula=formula, massflow=10 + index)
+                for index, formula in enumerate(REALISTIC)
+            ]
+        )
+        return (step, logger), {}
+
+    peak_memory(normalize_gas_mixture, *setup()[0])
+    benchmark.pedantic(normalize_gas_mixture, setup=setup, rounds=100)
+
+
+def _unload_apps(menus_file=None):
+    for name in [name for name in sys.modules if name.startswith(APPS_PACKAGE)]:
+        del sys.modules[name]
+    if menus_file is not None:
+        # `menu_steps` generates the menus when `menus.json` is missing
+        importlib.import_module(f'{APPS_PACKAGE}.directories').MENUS_FILE = menus_file
+
+
+def _build_apps():
+    importlib.import_module(f'{APPS_PACKAGE}.app_builder').build_apps()
+
+
+def _load_apps():
+    apps = importlib.import_module(APPS_PACKAGE)
+    for name in apps.ENTRY_POINTS:
+        getattr(apps, name)
+
+
+@pytest.mark.parametrize('source', ['menus', 'modules', 'json'])
+def test_app_startup(benchmark, peak_memory, tmp_path, source):
+    # `menus` is the start-up before the menus and the apps were serialized, the
+    # step menus generated from the step classes; `modules` builds the apps from
+    # the stored menus and `json` loads the stored apps, as NOMAD does
+    start = _load_apps if source == 'json' else _build_apps
+    menus_file = str(tmp_path / 'menus.json') if source == 'menus' else None
+
+    def setup():
+        _unload_apps(menus_file)
+        return (), {}
+
+    setup()
+    peak_memory(start)
+    benchmark.pedantic(start, setup=setup, rounds=20)
+    _unload_apps()
+
+
+def test_check_step_parameters(benchmark, peak_memory):
+    equipment = Equipment(
+        capabilities=[
+            EquipmentParameterData(name=name, unit=unit, value_min=0, value_max=1000)
+            for name, unit in [
+                ('Chamber pressure', 'mTorr'),
+                ('Temperature', 'degC'),
+                ('power', 'W'),
+                ('bias', 'V'),
+                ('total_gas_flow', 'sccm'),
+            ]
+        ]
+    )
+    step = ICP_CVD(chamber_pressure=0.1, chuck_temperature=300, power=1500, bias=50)
+
+    peak_memory(check_step_parameters, step, equipment)
+    benchmark(check_step_parameters, step, equipment)
+
+
+def test_equipment_index_find(benchmark, peak_memory):
+    index = EquipmentIndex()
+    parameters = [f'parameter_{number}' for number in range(36)]
+    for tool in range(300):
+        index.update(
+            f'tool-{tool}',
+            Equipment(
+                capabilities=[
+                    EquipmentParameterData(
+                        name=name,
+                        unit='W',
+                        value_min=(tool + number) % 50,
+                        value_max=(tool + number) % 50 + 60,
+                    )
+                    for number, name in enumerate(parameters)
+                ]
+            ),
+        )
+    recipe = {name: (55, 'W') for name in parameters[:6]}
+    index.find(recipe)
+
+    peak_memory(index.find, recipe)
+    benchmark(index.find, recipe)
+
+
+def test_logbook_between(benchmark, peak_memory, tmp_path):
+    store = LogbookStore(str(tmp_path))
+    start = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    store.append(
+        {
+            'job_number': number,
+            'starting_date': (start + timedelta(hours=number)).isoformat(),
+            'ending_date': (start + timedelta(hours=number, minutes=45)).isoformat(),
+        }
+        for number in range(100_000)
+    )
+    week = (start + timedelta(days=3000), start + timedelta(days=3007))
+
+    def read_week():
+        reopened = LogbookStore(str(tmp_path))
+        return reopened.rows(reopened.between(*week))
+
+    peak_memory(read_week)
+    benchmark(read_week)
+
+
+def test_utilization_report(benchmark, peak_memory):
+    # five years of a busy tool, with some overlapping bookings
+    generator = np.random.default_rng(0)
+    starts = np.datetime64('2019-01-01', 'us') + np.sort(
+        generator.integers(0, 5 * 365 * 24 * 3600, 50_000)
+    ).astype('m8[s]')
+    ends = starts + generator.integers(600, 4 * 3600, len(starts)).astype('m8[s]')
+
+    peak_memory(utilization_report, starts, ends)
+    benchmark(utilization_report, starts, ends)
+
+
+def test_permitted_matrix(benchmark, peak_memory):
+    shapes = ['Wafer with flat standard', 'Fragment', 'Square shape']
+    tools = [
+        Equipment(
+            permittedItems=[
+                EquipmentHasPermittedItemPropertyData(
+                    itemShapeType=shape,
+                    properties=[
+                        ItemPermittedPropertyDefinition(
+                            name=f'property {number}',
+                            unit='mm',
+                            value_min=tool % 10,
+                            value_max=tool % 10 + 50,
+                        )
+                        for number in range(8)
+                    ],
+                )
+                for shape in shapes
+            ]
+        )
+        for tool in range(100)
+    ]
+    items = [
+        Item(
+            itemShapeType=shapes[item % 3],
+            properties=[
+                NumericProperties(name=f'property {number}', unit='mm', value=item % 60)
+                for number in range(8)
+            ],
+        )
+        for item in range(500)
+    ]
+    permitted_matrix(items, tools)
+
+    peak_memory(permitted_matrix, items, tools)
+    benchmark(permitted_matrix, items, tools)
+
+
+class StoredContext(Context):
+    def __init__(self, archives):
+        super().__init__()
+        self.stored = archives
+
+    @property
+    def upload_id(self):
+        return 'upload'
+
+    def load_archive(self, entry_id, upload_id, installation_url):
+        return self.stored[entry_id]
+
+
+def test_resolve_references(benchmark, peak_memory, monkeypatch):
+    stored = {
+        f'step{number}': EntryArchive(
+            metadata=EntryMetadata(
+                entry_id=f'step{number}',
+                upload_id='upload',
+                last_processing_time=datetime.now(timezone.utc),
+            ),
+            data=FabricationProcessStep(name=f'step {number}'),
+        )
+        for number in range(20)
+    }
+    # the processing times that a server reads from its database
+    monkeypatch.setattr(
+        references,
+        'processing_times',
+        lambda context, entry_ids: {
+            entry_id: stored[entry_id].metadata.last_processing_time
+            for entry_id in entry_ids
+        },
+    )
+    cache = ReferenceCache()
+
+    def resolve():
+        archive = EntryArchive.m_from_dict(
+            {
+                'metadata': {'entry_id': 'process', 'upload_id': 'upload'},
+                'data': {
+                    'm_def': 'fabrication_facilities.schema_packages.'
+                    'fabrication_utilities.FabricationProcess',
+                    'steps': [
+                        f'../upload/archive/step{number % 20}#/data'
+                        for number in range(80)
+                    ],
+                },
+            },
+            m_context=StoredContext(stored),
+        )
+        return resolve_references(archive.data, archive, cache=cache)
+
+    resolve()
+
+    peak_memory(resolve)
+    benchmark(resolve)
@@ -2,6 +2,9 @@ from nomad.client import normalize_all
 from nomad.datamodel import EntryArchive, EntryMetadata
 from nomad.datamodel.metainfo.workflow import Workflow
 
+from fabrication_facilities.schema_packages.remove import DRIE
+from fabrication_facilities.schema_packages.utils import Massflow_controller
+
 
 def test_normalizer():
     entry_archive = EntryArchive(
@@ -10,3 +13,20 @@ def test_normalizer():
     normalize_all(entry_archive)
 
     assert entry_archive.workflow2.name == 'test'
+    assert not entry_archive.results or not entry_archive.results.material
+
+
+def test_material_elements():
+    step = DRIE(
+        chemical_formula='Si',
+        fluximeters=[
+            Massflow_controller(chemical_formula='SF6', massflow=10),
+            Massflow_controller(chemical_formula='C4F8', massflow=10),
+        ],
+    )
+    entry_archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='step.archive.yaml'), data=step
+    )
+    normalize_all(entry_archive)
+
+    assert entry_archive.results.material.elements == ['C', 'F', 'Si', 'S']
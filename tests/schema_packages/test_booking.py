@@ -0,0 +1,161 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import structlog
+import structlog.testing
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from fabrication_facilities.schema_packages.booking import (
+    BookingCalendar,
+    BookingConflictError,
+)
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Booking,
+    Equipment,
+)
+
+DAY = datetime(2024, 3, 4, tzinfo=timezone.utc)
+
+
+def hours(value):
+    return DAY + timedelta(hours=value)
+
+
+def test_book_and_cancel():
+    calendar = BookingCalendar()
+    morning = calendar.book(hours(8), hours(12), booked_by='alice')
+    calendar.book(hours(12), hours(14), booking_id='lunch')
+    with pytest.raises(BookingConflictError) as error:
+        calendar.book(hours(11), hours(13))
+    assert [item.id for item in error.value.conflicts] == [morning.id, 'lunch']
+    with pytest.raises(ValueError):
+        calendar.book(hours(15), hours(15))
+
+    assert calendar.conflicts(hours(13), hours(20))[0].id == 'lunch'
+    assert calendar.conflicts(hours(14), hours(20)) == []
+    calendar.cancel('lunch')
+    assert 'lunch' not in calendar
+    # naive dates are taken as UTC
+    assert calendar.book(datetime(2024, 3, 4, 12), hours(13)).start == hours(12)
+
+
+def test_next_free_slot():
+    calendar = BookingCalendar()
+    for start, end in [(8, 10), (11, 12), (12, 15), (16, 18)]:
+        calendar.book(hours(start), hours(end))
+    assert calendar.next_free_slot(timedelta(hours=1), hours(7)) == hours(7)
+    assert calendar.next_free_slot(timedelta(hours=1), hours(8.5)) == hours(10)
+    assert calendar.next_free_slot(timedelta(hours=2), hours(7)) == hours(18)
+    assert calendar.next_free_slot(timedelta(hours=2), hours(9), hours(19)) is None
+
+
+def test_concurrent_requests():
+    calendar = BookingCalendar()
+    generator = random.Random(0)
+    requests = [
+        (hours(generator.uniform(0, 1000)), timedelta(hours=generator.uniform(1, 8)))
+        for _ in range(5000)
+    ]
+
+    def request(item):
+        start, duration = item
+        try:
+            return calendar.book(start, start + duration)
+        except BookingConflictError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        accepted = [item for item in executor.map(request, requests) if item]
+    assert len(calendar) == len(accepted)
+    reservations = list(calendar)
+    assert all(a.end <= b.start for a, b in zip(reservations, reservations[1:]))
+
+
+def test_equipment_bookings():
+    equipment = Equipment(
+        name='Mask aligner',
+        is_bookable=True,
+        bookings=[
+            Booking(starting_date=hours(10), ending_date=hours(12), notes='second'),
+            Booking(id='first', starting_date=hours(8), ending_date=hours(9)),
+        ],
+    )
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='aligner.archive.yaml'), data=equipment
+    )
+    equipment.normalize(archive, structlog.get_logger())
+    assert equipment.bookings[0].id == 'first'
+    assert equipment.bookings[1].notes == 'second'
+
+    calendar = equipment.booking_calendar()
+    calendar.book(hours(9), hours(10), booked_by='bob')
+    equipment.save_bookings(calendar)
+    assert [booking.booked_by for booking in equipment.bookings] == [None, 'bob', None]
+
+    equipment.bookings.append(
+        Booking(id='overlap', starting_date=hours(11), ending_date=hours(13))
+    )
+    with structlog.testing.capture_logs() as logs:
+        equipment.normalize_bookings(structlog.get_logger())
+    assert logs[0]['bookings'] == [equipment.bookings[2].id]
+
+
+def test_undated_bookings_are_kept():
+    equipment = Equipment(
+        name='Mask aligner',
+        is_bookable=True,
+        bookings=[
+            Booking(booked_by='alice', starting_date=hours(10), notes='tbd'),
+            Booking(booked_by='bob', starting_date=hours(9), ending_date=hours(10)),
+            Booking(booked_by='carol', starting_date=hours(8), ending_date=hours(9)),
+        ],
+    )
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='aligner.archive.yaml'), data=equipment
+    )
+    equipment.normalize(archive, structlog.get_logger())
+    booked_by = [booking.booked_by for booking in equipment.bookings]
+    assert booked_by == ['carol', 'bob', 'alice']
+    assert equipment.bookings[2].notes == 'tbd'
+    assert equipment.bookings[2].ending_date is None
+    assert all(booking.id for booking in equipment.bookings)
+
+    calendar = equipment.booking_calendar()
+    calendar.cancel(equipment.bookings[0].id)
+    equipment.save_bookings(calendar)
+    assert [booking.booked_by for booking in equipment.bookings] == ['bob', 'alice']
+
+
+def test_booking_ids_do_not_change_when_processed_again():
+    def process():
+        equipment = Equipment(
+            name='Mask aligner',
+            is_bookable=True,
+            bookings=[
+                Booking(
+                    booked_by='alice', starting_date=hours(8), ending_date=hours(9)
+                ),
+                Booking(booked_by='bob', starting_date=hours(10)),
+                Booking(booked_by='bob', starting_date=hours(10)),
+            ],
+        )
+        archive = EntryArchive(
+            metadata=EntryMetadata(entry_name='aligner.archive.yaml'), data=equipment
+        )
+        equipment.normalize(archive, structlog.get_logger())
+        return [booking.id for booking in equipment.bookings]
+
+    ids = process()
+    assert process() == ids
+    assert len(set(ids)) == len(ids)
+    assert ids[2] == f'{ids[1]}-2'
+
+
+def test_next_free_slot_stops_at_before():
+    calendar = BookingCalendar()
+    for hour in range(8, 18):
+        calendar.book(hours(hour), hours(hour + 0.75))
+    assert calendar.next_free_slot(timedelta(hours=1), hours(8), hours(12)) is None
+    assert calendar.next_free_slot(timedelta(hours=1), hours(8)) == hours(17.75)
@@ -0,0 +1,100 @@
+import pytest
+import structlog
+import structlog.testing
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from fabrication_facilities.schema_packages.add import ICP_CVD, Spin_Coating
+from fabrication_facilities.schema_packages.capabilities import (
+    check_step_parameters,
+    validate_step_parameters,
+)
+from fabrication_facilities.schema_packages.equipment_index import EquipmentIndex
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    EquipmentParameterData,
+    EquipmentReference,
+)
+
+
+def make_equipment():
+    return Equipment(
+        name='ICP-CVD Oxford',
+        capabilities=[
+            EquipmentParameterData(
+                name='Chamber pressure', unit='mTorr', value_min=1, value_max=100
+            ),
+            EquipmentParameterData(
+                name='Temperature', unit='degC', value_min=20, value_max=400
+            ),
+            EquipmentParameterData(name='power', unit='kW', value_max=0.3),
+        ],
+    )
+
+
+def test_check_step_parameters():
+    step = ICP_CVD(chamber_pressure=0.5, chuck_temperature=350, power=500)
+    violations = check_step_parameters(step, make_equipment())
+    assert [item.quantity for item in violations] == ['chamber_pressure', 'power']
+    pressure = violations[0]
+    assert pressure.capability == 'Chamber pressure'
+    assert pressure.capability_unit == 'mTorr'
+    assert pressure.value == pytest.approx(0.5)
+
+    step = ICP_CVD(chamber_pressure=0.1, chuck_temperature=20, power=300)
+    assert check_step_parameters(step, make_equipment()) == []
+
+
+def test_incompatible_capability_unit():
+    equipment = Equipment(
+        capabilities=[EquipmentParameterData(name='spin_frequency', unit='watt')]
+    )
+    step = Spin_Coating(spin_frequency=3000)
+    logger = structlog.get_logger()
+    assert check_step_parameters(step, equipment, logger) == []
+
+
+def test_capabilities_without_unit_are_in_the_step_unit():
+    # 0 to 200 degC, the unit of the chuck temperature of the steps
+    equipment = Equipment(
+        name='chuck',
+        capabilities=[
+            EquipmentParameterData(
+                name='Chuck temperature', value_min=0, value_max=200
+            ),
+            EquipmentParameterData(name='duration_target', value_max=10),
+        ],
+    )
+    index = EquipmentIndex()
+    with structlog.testing.capture_logs() as logs:
+        index.update('chuck', equipment)
+    # the steps give durations in seconds or in minutes
+    assert [log['capability'] for log in logs] == ['duration_target']
+    assert index.parameters() == {'chuck_temperature'}
+
+    step = ICP_CVD(chuck_temperature=20)
+    assert check_step_parameters(step, equipment) == []
+    assert index.find_for_step(step) == ['chuck']
+
+    step = ICP_CVD(chuck_temperature=300)
+    violations = check_step_parameters(step, equipment)
+    assert [item.capability_unit for item in violations] == ['degree_Celsius']
+    assert index.find_for_step(step) == []
+
+
+def test_validate_step_parameters_in_normalize():
+    equipment = make_equipment()
+    step = ICP_CVD(
+        chamber_pressure=0.001,
+        instruments=[EquipmentReference(section=equipment)],
+    )
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='step.archive.yaml'), data=step
+    )
+    logger = structlog.get_logger()
+    assert len(validate_step_parameters(step, logger)) == 1
+    with structlog.testing.capture_logs() as logs:
+        step.normalize(archive, logger)
+    assert any(
+        log['event'].startswith('Step parameter outside') and log['equipment']
+        for log in logs
+    )
@@ -0,0 +1,177 @@
+import json
+
+import structlog
+import structlog.testing
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.units import ureg
+
+from fabrication_facilities.schema_packages.add import ICP_CVD
+from fabrication_facilities.schema_packages.equipment_index import (
+    EQUIPMENT_DEF,
+    EquipmentIndex,
+    equipment_index,
+)
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    EquipmentParameterData,
+    EquipmentTechnique,
+    TechniqueSubCategory,
+)
+
+
+def make_equipment(name, pressure, temperature, technique='synthesis'):
+    return Equipment(
+        name=name,
+        capabilities=[
+            EquipmentParameterData(
+                name='Chamber pressure',
+                unit='mTorr',
+                value_min=pressure[0],
+                value_max=pressure[1],
+            ),
+            EquipmentParameterData(
+                name='Temperature', unit='degC', value_max=temperature
+            ),
+        ],
+        equipmentTechniques=[
+            EquipmentTechnique(techniqueMainCategory=technique),
+        ],
+    )
+
+
+def make_index():
+    index = EquipmentIndex()
+    index.update('low', make_equipment('low', (1, 10), 200))
+    index.update('high', make_equipment('high', (5, 100), 400))
+    index.update('etcher', make_equipment('etcher', (1, 100), 400, 'etching'))
+    return index
+
+
+def test_find():
+    index = make_index()
+    assert index.find({'chamber_pressure': (8, 'mTorr')}) == ['etcher', 'high', 'low']
+    assert index.find({'chamber_pressure': ureg.Quantity(50, 'millitorr')}) == [
+        'etcher',
+        'high',
+    ]
+    assert index.find(
+        {'chamber_pressure': (8, 'mTorr'), 'Temperature': (300, 'degC')},
+        techniques=['Synthesis'],
+    ) == ['high']
+    assert index.find({'chamber_pressure': (0.5, 'mTorr')}) == []
+    assert index.find({'power': (1, 'W')}) == []
+
+
+def test_update_and_remove():
+    index = make_index()
+    index.update('low', make_equipment('low', (1, 200), 200))
+    assert index.find({'chamber_pressure': (150, 'mTorr')}) == ['low']
+    index.remove('low')
+    assert 'low' not in index
+    assert index.find({'chamber_pressure': (8, 'mTorr')}) == ['etcher', 'high']
+
+
+def test_find_for_step():
+    index = make_index()
+    step = ICP_CVD(chamber_pressure=0.04, chuck_temperature=300)
+    assert index.find_for_step(step, techniques=['etching']) == ['etcher']
+
+
+def test_equipment_normalize_updates_the_index():
+    equipment = make_equipment('ICP', (1, 10), 200)
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_id='icp-entry', entry_name='icp.archive.yaml'),
+        data=equipment,
+    )
+    equipment.normalize(archive, structlog.get_logger())
+    assert 'icp-entry' in equipment_index
+    equipment_index.remove('icp-entry')
+
+
+def write_archive(path, entry_id, data):
+    with open(path, 'w') as file:
+        json.dump({'metadata': {'entry_id': entry_id}, 'data': data}, file)
+
+
+def equipment_data(name, max_pressure):
+    data = make_equipment(name, (1, max_pressure), 200).m_to_dict()
+    return {**data, 'm_def': EQUIPMENT_DEF}
+
+
+def test_update_from_archives(tmp_path):
+    write_archive(tmp_path / 'icp.archive.json', 'icp', equipment_data('ICP', 10))
+    write_archive(tmp_path / 'rie.archive.json', 'rie', equipment_data('RIE', 100))
+    write_archive(
+        tmp_path / 'step.archive.json',
+        'step',
+        {'m_def': 'fabrication_facilities.schema_packages.remove.DRIE'},
+    )
+    index = EquipmentIndex()
+    assert index.update_from_archives(str(tmp_path)) == (2, 0)
+    assert index.find({'chamber_pressure': (50, 'mTorr')}) == ['rie']
+    assert index.update_from_archives(str(tmp_path)) == (0, 0)
+
+    (tmp_path / 'rie.archive.json').unlink()
+    write_archive(tmp_path / 'icp.archive.json', 'icp', equipment_data('ICP', 600))
+    assert index.update_from_archives(str(tmp_path)) == (1, 1)
+    assert 'rie' not in index
+    assert index.find({'chamber_pressure': (50, 'mTorr')}) == ['icp']
+
+    write_archive(tmp_path / 'icp.archive.json', 'icp', {'m_def': 'other.Section'})
+    assert index.update_from_archives(str(tmp_path)) == (0, 1)
+    assert len(index) == 0
+
+
+def test_equipment_for_sub_category():
+    drie = TechniqueSubCategory(name='DRIE', id='S1')
+    index = EquipmentIndex()
+    for key, name, bookable, technique in [
+        ('a', 'Bosch etcher', True, EquipmentTechnique(referencingcategorization=drie)),
+        ('b', 'Cryo etcher', False, EquipmentTechnique(techniqueSubCategory='drie')),
+        ('c', 'Furnace', True, EquipmentTechnique(techniqueSubCategory='Annealing')),
+    ]:
+        index.update(
+            key,
+            Equipment(
+                name=name,
+                institution='FBK',
+                is_bookable=bookable,
+                equipmentTechniques=[technique],
+            ),
+        )
+    assert [item.key for item in index.equipment_for(drie)] == ['a', 'b']
+    assert [item.name for item in index.equipment_for('S1')] == ['Bosch etcher']
+    bookable = index.equipment_for(' DRIE', bookable=True)
+    assert [item.key for item in bookable] == ['a']
+    assert index.equipment_for('drie', bookable=False)[0].institution == 'FBK'
+
+    index.update('b', Equipment(name='Cryo etcher'))
+    assert [item.key for item in index.equipment_for(drie)] == ['a']
+
+
+def test_update_from_archives_with_references(tmp_path):
+    write_archive(tmp_path / 'icp.archive.json', 'icp', equipment_data('ICP', 10))
+    index = EquipmentIndex()
+    index.update_from_archives(str(tmp_path))
+
+    # a taxonomy in another entry cannot be resolved without the upload
+    data = equipment_data('ICP', 600)
+    data['equipmentTechniques'].append(
+        {
+            'techniqueSubCategory': 'ICP-RIE',
+            'referencingcategorization': '../upload/archive/taxonomy#/data/'
+            'technique_general_categories/0/technique_main_categories/0/'
+            'technique_sub_categories/0',
+        }
+    )
+    write_archive(tmp_path / 'icp.archive.json', 'icp', data)
+    assert index.update_from_archives(str(tmp_path)) == (1, 0)
+    assert [item.key for item in index.equipment_for('icp-rie')] == ['icp']
+    assert index.find({'chamber_pressure': (50, 'mTorr')}) == ['icp']
+
+    with open(tmp_path / 'icp.archive.json', 'w') as file:
+        file.write('{"data": ')
+    with structlog.testing.capture_logs() as logs:
+        assert index.update_from_archives(str(tmp_path)) == (0, 0)
+    assert 'icp' in index
+    assert logs[0]['path'].endswith('icp.archive.json')
@@ -0,0 +1,126 @@
+import time
+
+import numpy as np
+import pytest
+
+from fabrication_facilities.schema_packages.formula import (
+    MAX_ATOM_COUNT,
+    clear_composition_cache,
+    composition_cache_info,
+    composition_masses,
+    elemental_composition,
+    hill_formula,
+    parse_chemical_formula,
+    parse_chemical_formulas,
+    unreadable_formula,
+)
+
+
+@pytest.mark.parametrize(
+    'formula, elements, counts',
+    [
+        ('SiO2', ['Si', 'O'], [1, 2]),
+        ('Ca(OH)2', ['Ca', 'O', 'H'], [1, 2, 2]),
+        ('Al2(SO4)3', ['Al', 'S', 'O'], [2, 3, 12]),
+        ('[Co(NH3)6]Cl3', ['Co', 'N', 'H', 'Cl'], [1, 6, 18, 3]),
+        ('CuSO4·5H2O', ['Cu', 'S', 'O', 'H'], [1, 1, 9, 10]),
+        ('CuSO4.5H2O', ['Cu', 'S', 'O', 'H'], [1, 1, 9, 10]),
+        ('((Si)10)10', ['Si'], [100]),
+        ('(SiO2', ['Si', 'O'], [1, 2]),
+        ('', [], []),
+    ],
+)
+def test_parse_chemical_formula(formula, elements, counts):
+    assert parse_chemical_formula(formula) == (elements, counts)
+
+
+def test_parse_chemical_formula_deep_nesting():
+    depth = 2000
+    formula = '(' * depth + 'Si' + ')10' * depth
+    start = time.perf_counter()
+    elements, counts = parse_chemical_formula(formula)
+    assert time.perf_counter() - start < 1
+    assert elements == ['Si']
+    assert counts == [MAX_ATOM_COUNT]
+
+
+@pytest.mark.parametrize(
+    'formula',
+    ['(' * 400 + 'Si' + ')10' * 400, 'Si' + '9' * 5000, '9' * 5000 + 'Si' + '9' * 20],
+)
+def test_counts_are_capped(formula):
+    assert parse_chemical_formula(formula) == (['Si'], [MAX_ATOM_COUNT])
+    assert hill_formula(formula) == f'Si{MAX_ATOM_COUNT}'
+    assert elemental_composition(formula) == (('Si',), (1.0,))
+
+
+def test_elemental_composition_cache():
+    clear_composition_cache()
+    assert elemental_composition('SiO2') == (('O', 'Si'), (2 / 3, 1 / 3))
+    assert elemental_composition(' Si O2 ') == (('O', 'Si'), (2 / 3, 1 / 3))
+    assert elemental_composition('O2Si') == (('O', 'Si'), (2 / 3, 1 / 3))
+    assert elemental_composition('') == ((), ())
+    info = composition_cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+@pytest.mark.parametrize(
+    'formula, hill',
+    [
+        ('SiO2', 'O2Si'),
+        ('O2 Si', 'O2Si'),
+        ('sio2', 'O2Si'),
+        ('co2', 'CO2'),
+        ('hfo2', 'HfO2'),
+        ('nh3', 'H3N'),
+        ('hf', 'FH'),
+        ('bhf', ''),
+        ('ipa', ''),
+        ('water', ''),
+        ('hmds', ''),
+        ('C2H5OH', 'C2H6O'),
+        ('HCl', 'ClH'),
+        ('CuSO4·5H2O', 'CuH10O9S'),
+        ('', ''),
+    ],
+)
+def test_hill_formula(formula, hill):
+    assert hill_formula(formula) == hill
+
+
+def test_unreadable_formula():
+    assert unreadable_formula('ipa')
+    assert not unreadable_formula('sf6')
+    assert not unreadable_formula('SF6')
+    assert not unreadable_formula('')
+    assert elemental_composition('water') == ((), ())
+
+
+def test_hill_formula_is_interned():
+    assert hill_formula('SiO2') is hill_formula(''.join(['sio', '2']))
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_parse_chemical_formulas(sparse):
+    elements, counts, fractions = parse_chemical_formulas(
+        ['SiO2', 'SF6', 'SiO2', ''], sparse=sparse
+    )
+    if sparse:
+        counts, fractions = counts.toarray(), fractions.toarray()
+    columns = [elements.index(element) for element in ('O', 'F', 'Si', 'S')]
+    assert elements[:3] == ('H', 'He', 'Li')
+    np.testing.assert_array_equal(
+        counts[:, columns], [[2, 0, 1, 0], [0, 6, 0, 1], [2, 0, 1, 0], [0, 0, 0, 0]]
+    )
+    np.testing.assert_allclose(fractions.sum(axis=1), [1, 1, 1, 0])
+
+
+def test_composition_masses():
+    elements, counts, _ = parse_chemical_formulas(['SiO2', 'H2O', ''])
+    mass_fractions, molar_mass = composition_masses(counts, elements)
+    np.testing.assert_allclose(molar_mass, [60.083, 18.015, 0])
+    np.testing.assert_allclose(mass_fractions.sum(axis=1), [1, 1, 0])
+
+    single_fractions, single_mass = composition_masses([1, 2], ['Si', 'O'])
+    np.testing.assert_allclose(single_fractions, mass_fractions[0, [13, 7]])
+    assert single_mass == molar_mass[0]
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+PLUGIN_IMPORT_BUDGET = 1.5
+"""Seconds the plugin's own modules may take to import, excluding NOMAD."""
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_formula_does_not_import_nomad():
+    result = run_python(
+        'import sys\n'
+        'import fabrication_facilities.schema_packages.formula\n'
+        "print(sorted({name.split('.')[0] for name in sys.modules} & {'nomad'}))"
+    )
+    assert result.stdout.strip() == '[]'
+
+
+def test_entry_point_imports_only_its_modules():
+    result = run_python(
+        'import sys\n'
+        'import fabrication_facilities.schema_packages.remove\n'
+        "print(' '.join(sorted(name for name in sys.modules"
+        " if name.startswith('fabrication_facilities.schema_packages.'))))"
+    )
+    loaded = {name.rsplit('.', 1)[-1] for name in result.stdout.split()}
+    assert 'remove' in loaded
+    assert not loaded & {'add', 'transform'}
+
+
+def test_plugin_import_budget():
+    result = run_python(
+        'import fabrication_facilities.schema_packages.add, '
+        'fabrication_facilities.schema_packages.remove, '
+        'fabrication_facilities.schema_packages.transform',
+        '-X',
+        'importtime',
+    )
+    own = 0
+    for line in result.stderr.splitlines():
+        self_us, _, name = line.removeprefix('import time:').split('|')
+        if name.strip().startswith('fabrication_facilities'):
+            own += int(self_us)
+    assert 0 < own / 1e6 < PLUGIN_IMPORT_BUDGET
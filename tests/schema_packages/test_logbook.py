@@ -0,0 +1,176 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import structlog
+import structlog.testing
+from nomad.client import normalize_all, parse
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import Context
+
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    Jobdone,
+)
+from fabrication_facilities.schema_packages.logbook import LogbookStore, store_path
+
+START = datetime(2024, 1, 1, 8, tzinfo=timezone.utc)
+
+
+class RawContext(Context):
+    """
+    A context whose raw files are in a local directory, opening them like an
+    upload does: a missing file is a KeyError.
+    """
+
+    def __init__(self, raw_dir):
+        super().__init__()
+        self.raw_dir = raw_dir
+        self.opened = []
+
+    def raw_path(self):
+        return self.raw_dir
+
+    def raw_file(self, path, *args, **kwargs):
+        self.opened.append(path)
+        try:
+            return open(os.path.join(self.raw_dir, path), *args, **kwargs)
+        except FileNotFoundError as error:
+            raise KeyError(path) from error
+
+
+def dicer_archive(logbook_store, context=None):
+    equipment = Equipment(
+        name='Dicer', logbook_store=logbook_store, equipmentLogBook=make_jobs(5)
+    )
+    return EntryArchive(
+        metadata=EntryMetadata(entry_name='dicer.archive.yaml'),
+        data=equipment,
+        m_context=context,
+    )
+
+
+def make_jobs(count, first=0):
+    return [
+        Jobdone(
+            name=f'job {number}',
+            job_number=number,
+            starting_date=START + timedelta(days=number),
+            ending_date=START + timedelta(days=number, hours=2),
+        )
+        for number in range(first, first + count)
+    ]
+
+
+def test_append_and_read(tmp_path):
+    store = LogbookStore(str(tmp_path / 'logbook'))
+    assert store.append(make_jobs(10)) == len(make_jobs(10))
+    assert store.append(make_jobs(12)) == len(make_jobs(2))
+
+    store = LogbookStore(str(tmp_path / 'logbook'))
+    assert len(store) == len(make_jobs(12))
+    assert store.metadata['sorted']
+    starts = store.column('starting_date')
+    assert starts[3] == np.datetime64('2024-01-04T08:00', 'us')
+
+    indices = store.between(
+        START + timedelta(days=2, hours=1), START + timedelta(days=5)
+    )
+    assert indices.tolist() == [2, 3, 4]
+    jobs = store.jobs(indices)
+    assert [job.job_number for job in jobs] == [2, 3, 4]
+    assert jobs[0].starting_date == START + timedelta(days=2)
+
+
+def test_unsorted_store(tmp_path):
+    store = LogbookStore(str(tmp_path))
+    store.append(make_jobs(3, first=5))
+    store.append(make_jobs(3))
+    assert not store.metadata['sorted']
+    indices = store.between(end=START + timedelta(days=2))
+    assert [row['job_number'] for row in store.rows(indices)] == [0, 1]
+
+
+def test_concurrent_appends(tmp_path):
+    threads = [
+        threading.Thread(
+            target=LogbookStore(str(tmp_path)).append, args=(make_jobs(20, first),)
+        )
+        for first in (0, 100, 200, 300)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store = LogbookStore(str(tmp_path))
+    rows = store.rows()
+    assert len(store) == len(rows) == len(make_jobs(80))
+    starts = store.column('starting_date')
+    assert [row['job_number'] for row in rows] == [
+        int((start - np.datetime64('2024-01-01T08:00', 'us')) // np.timedelta64(1, 'D'))
+        for start in starts
+    ]
+
+
+def test_equipment_offloads_its_logbook(tmp_path):
+    context = RawContext(str(tmp_path))
+    archive = dicer_archive('dicer_logbook/', context)
+    equipment = archive.data
+    equipment.normalize(archive, structlog.get_logger())
+    assert len(equipment.equipmentLogBook) == 0
+    assert equipment.logbook_jobs == len(make_jobs(5))
+    assert (tmp_path / 'dicer_logbook' / 'rows.jsonl').exists()
+    assert all(path.startswith('dicer_logbook/') for path in context.opened)
+
+    equipment.equipmentLogBook = make_jobs(5)
+    equipment.normalize(archive, structlog.get_logger())
+    assert equipment.logbook_jobs == len(make_jobs(5))
+
+
+@pytest.mark.parametrize(
+    'logbook_store', ['/tmp/dicer', '../dicer', 'logs/../../dicer', 'C:/dicer', '.']
+)
+def test_logbook_store_outside_the_upload(tmp_path, logbook_store):
+    assert store_path(logbook_store) is None
+    archive = dicer_archive(logbook_store, RawContext(str(tmp_path / 'raw')))
+    with structlog.testing.capture_logs() as logs:
+        archive.data.normalize(archive, structlog.get_logger())
+    assert len(archive.data.equipmentLogBook) == len(make_jobs(5))
+    assert archive.data.logbook_jobs is None
+    assert not (tmp_path / 'raw').exists()
+    assert [log['path'] for log in logs if 'path' in log] == [logbook_store]
+
+
+def test_logbook_store_needs_an_upload(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    archive = dicer_archive('dicer_logbook')
+    with structlog.testing.capture_logs() as logs:
+        archive.data.normalize(archive, structlog.get_logger())
+    assert len(archive.data.equipmentLogBook) == len(make_jobs(5))
+    assert list(tmp_path.iterdir()) == []
+    assert [log['path'] for log in logs if 'path' in log] == ['dicer_logbook']
+
+
+def test_logbook_store_of_a_parsed_file(tmp_path, monkeypatch):
+    upload = tmp_path / 'up'
+    upload.mkdir()
+    (upload / 'tool.archive.yaml').write_text(
+        'data:\n'
+        '  m_def: fabrication_facilities.schema_packages.fabrication_utilities.'
+        'Equipment\n'
+        '  name: Dicer\n'
+        '  logbook_store: logs/tool\n'
+        '  equipmentLogBook:\n'
+        '    - name: cut\n'
+        '      starting_date: "2024-01-01T08:00:00+00:00"\n'
+    )
+    elsewhere = tmp_path / 'elsewhere'
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    archive = parse(str(upload / 'tool.archive.yaml'))[0]
+    normalize_all(archive)
+    assert archive.data.logbook_jobs == 1
+    assert (upload / 'logs' / 'tool' / 'logbook.json').exists()
+    assert list(elsewhere.iterdir()) == []
@@ -0,0 +1,92 @@
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    EquipmentHasPermittedItemPropertyData,
+    ItemPermittedPropertyDefinition,
+)
+from fabrication_facilities.schema_packages.Items import (
+    DopingProperties,
+    Item,
+    NumericProperties,
+)
+from fabrication_facilities.schema_packages.permitted_items import (
+    check_item,
+    permitted_matrix,
+)
+
+WAFER = 'Wafer with flat standard'
+
+
+def make_equipment(max_diameter):
+    return Equipment(
+        name=f'{max_diameter} mm tool',
+        permittedItems=[
+            EquipmentHasPermittedItemPropertyData(
+                itemShapeType=WAFER,
+                properties=[
+                    ItemPermittedPropertyDefinition(
+                        name='Diameter', unit='mm', value_min=50, value_max=max_diameter
+                    ),
+                    ItemPermittedPropertyDefinition(
+                        name='thickness', unit='um', value_max=1000
+                    ),
+                ],
+            ),
+            EquipmentHasPermittedItemPropertyData(itemShapeType='Fragment'),
+        ],
+    )
+
+
+def make_item(diameter, thickness=None, shape=WAFER):
+    properties = [NumericProperties(name='diameter', unit='cm', value=diameter)]
+    if thickness is not None:
+        properties.append(
+            NumericProperties(name='Thickness', unit='mm', value=thickness)
+        )
+    properties.append(DopingProperties(name='doping', value=1))
+    return Item(itemShapeType=shape, properties=properties)
+
+
+def test_check_item():
+    equipment = make_equipment(150)
+    assert check_item(make_item(10, 0.5), equipment).permitted
+    check = check_item(make_item(20, 0.5), equipment)
+    assert not check.permitted
+    assert check.out_of_range == ['diameter']
+    assert check_item(make_item(10), equipment).missing == ['thickness']
+    assert check_item(make_item(1, shape='Fragment'), equipment).permitted
+    assert not check_item(make_item(10, 0.5, shape='Powder'), equipment).permitted
+
+
+def test_permitted_matrix():
+    items = [make_item(10, 0.5), make_item(20, 0.5), make_item(1, shape='Fragment')]
+    tools = [make_equipment(150), make_equipment(200), Equipment(name='empty')]
+    assert permitted_matrix(items, tools).tolist() == [
+        [True, True, False],
+        [False, True, False],
+        [True, True, False],
+    ]
+
+
+def test_range_with_an_unknown_unit():
+    equipment = Equipment(
+        name='typo tool',
+        permittedItems=[
+            EquipmentHasPermittedItemPropertyData(
+                itemShapeType=WAFER,
+                properties=[
+                    ItemPermittedPropertyDefinition(
+                        name='diameter', unit='inches_typo', value_min=1, value_max=4
+                    ),
+                ],
+            ),
+        ],
+    )
+    item = Item(
+        itemShapeType=WAFER,
+        properties=[NumericProperties(name='diameter', unit='mm', value=1000)],
+    )
+    check = check_item(item, equipment)
+    assert not check.permitted
+    assert check.unknown_units == {'diameter': 'inches_typo'}
+    assert check.out_of_range == check.missing == []
+    assert permitted_matrix([item], [equipment]).tolist() == [[False]]
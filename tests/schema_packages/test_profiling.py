@@ -0,0 +1,80 @@
+import json
+import tracemalloc
+
+from nomad.client import normalize_all
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from fabrication_facilities.schema_packages import profiling
+from fabrication_facilities.schema_packages.add import ICP_CVD
+from fabrication_facilities.schema_packages.profiling import (
+    clear_profiles,
+    disable_profiling,
+    enable_profiling,
+    normalize_profile,
+)
+from fabrication_facilities.schema_packages.utils import Massflow_controller
+
+
+def normalize_step(upload_id):
+    step = ICP_CVD(
+        chemical_formula='Si3N4',
+        fluximeters=[
+            Massflow_controller(chemical_formula='SiH4', massflow=10),
+            Massflow_controller(chemical_formula='NH3', massflow=20),
+        ],
+    )
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='step.archive.yaml', upload_id=upload_id),
+        data=step,
+    )
+    normalize_all(archive)
+
+
+def test_normalize_profile(tmp_path):
+    clear_profiles()
+    normalize_step('unprofiled')
+    assert not normalize_profile('unprofiled').as_dict()
+
+    enable_profiling(allocations=True)
+    try:
+        normalize_step('upload')
+        normalize_step('upload')
+    finally:
+        disable_profiling()
+
+    profile = normalize_profile('upload').as_dict()
+    calls = {name: totals['calls'] for name, totals in profile.items()}
+    assert calls == {'ICP_CVD': 2, 'Massflow_controller': 4}
+    assert profile['ICP_CVD']['seconds'] > 0
+
+    normalize_profile('upload').export(tmp_path / 'profile.json')
+    with open(tmp_path / 'profile.json') as file:
+        assert json.load(file) == json.loads(json.dumps(profile))
+    clear_profiles()
+
+
+def test_profiles_are_bounded(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILED_UPLOADS', 2)
+    clear_profiles()
+    enable_profiling()
+    try:
+        for upload_id in ('first', 'second', 'third'):
+            normalize_step(upload_id)
+    finally:
+        disable_profiling()
+    assert not normalize_profile('first').as_dict()
+    assert normalize_profile('third').as_dict()
+    clear_profiles('third')
+    assert not normalize_profile('third').as_dict()
+    assert normalize_profile('second').as_dict()
+    clear_profiles()
+
+
+def test_disable_profiling_keeps_foreign_tracing():
+    tracemalloc.start()
+    try:
+        enable_profiling(allocations=True)
+        disable_profiling()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
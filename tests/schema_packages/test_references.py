@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+
+import pytest
+import structlog
+import structlog.testing
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import Context
+
+from fabrication_facilities.schema_packages import references
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    FabricationProcess,
+    FabricationProcessStep,
+)
+from fabrication_facilities.schema_packages.references import (
+    ReferenceCache,
+    archive_size,
+    collect_references,
+    invalidate_references,
+    resolve_references,
+)
+
+STEPS = 8
+REFERENCES = 80
+PROCESS = (
+    'fabrication_facilities.schema_packages.fabrication_utilities.FabricationProcess'
+)
+
+
+class UploadContext(Context):
+    """
+    A context that loads the archives of one upload from a dictionary and counts
+    the loads.
+    """
+
+    def __init__(self, archives):
+        super().__init__()
+        self.stored = archives
+        self.loads = []
+
+    @property
+    def upload_id(self):
+        return 'upload'
+
+    def load_archive(self, entry_id, upload_id, installation_url):
+        self.loads.append(entry_id)
+        return self.stored[entry_id]
+
+
+@pytest.fixture(autouse=True)
+def processing_times(monkeypatch):
+    """
+    The processing times of the stored archives, as the processing database of
+    a server would have them.
+    """
+
+    queries = []
+
+    def processing_times(context, entry_ids):
+        queries.append(sorted(entry_ids))
+        stored = getattr(context, 'stored', {})
+        return {
+            entry_id: stored[entry_id].metadata.last_processing_time
+            for entry_id in entry_ids
+            if entry_id in stored and stored[entry_id].metadata.last_processing_time
+        }
+
+    monkeypatch.setattr(references, 'processing_times', processing_times)
+    return queries
+
+
+def step_archive(entry_id, processed=True):
+    return EntryArchive(
+        metadata=EntryMetadata(
+            entry_id=entry_id,
+            upload_id='upload',
+            last_processing_time=datetime.now(timezone.utc) if processed else None,
+        ),
+        data=FabricationProcessStep(name=f'step {entry_id}'),
+    )
+
+
+def process_archive(context, entry_ids):
+    return EntryArchive.m_from_dict(
+        {
+            'metadata': {
+                'entry_id': 'process',
+                'upload_id': 'upload',
+                'entry_name': 'process.archive.yaml',
+            },
+            'data': {
+                'm_def': PROCESS,
+                'steps': [
+                    f'../upload/archive/{entry_id}#/data' for entry_id in entry_ids
+                ],
+            },
+        },
+        m_context=context,
+    )
+
+
+def test_resolve_references_loads_each_archive_once(processing_times):
+    stored = {f'step{number}': step_archive(f'step{number}') for number in range(STEPS)}
+    entry_ids = [f'step{number % STEPS}' for number in range(REFERENCES)]
+    cache = ReferenceCache()
+
+    context = UploadContext(stored)
+    archive = process_archive(context, entry_ids)
+    assert len(collect_references(archive.data)) == REFERENCES
+    assert resolve_references(archive.data, archive, cache=cache) == STEPS
+    assert sorted(context.loads) == sorted(stored)
+    assert processing_times == [sorted(stored)]
+    assert collect_references(archive.data) == []
+    assert archive.data.steps[9].name == 'step step1'
+
+    # another entry of the upload finds the archives in the cache
+    context = UploadContext(stored)
+    archive = process_archive(context, entry_ids)
+    assert resolve_references(archive.data, archive, cache=cache) == 0
+    assert context.loads == []
+    assert archive.data.steps[-1].name == 'step step7'
+    assert cache.hits == STEPS
+
+    invalidate_references(stored['step3'], cache=cache)
+    context = UploadContext(stored)
+    archive = process_archive(context, entry_ids)
+    assert resolve_references(archive.data, archive, cache=cache) == 1
+    assert context.loads == ['step3']
+
+    # another worker processed a step again, without invalidating this cache
+    stored['step5'] = step_archive('step5')
+    stored['step5'].data.name = 'step 5 again'
+    context = UploadContext(stored)
+    archive = process_archive(context, entry_ids)
+    assert resolve_references(archive.data, archive, cache=cache) == 1
+    assert context.loads == ['step5']
+    assert archive.data.steps[5].name == 'step 5 again'
+
+
+def test_resolve_references_skips_unprocessed_archives():
+    stored = {'raw': step_archive('raw', processed=False)}
+    cache = ReferenceCache()
+    archive = process_archive(UploadContext(stored), ['raw'])
+    assert resolve_references(archive.data, archive, cache=cache) == 1
+    assert len(cache) == 0
+
+
+def test_reference_cache_is_bounded():
+    archives = [step_archive(f'entry{number}') for number in range(3)]
+    size = archive_size(archives[0])
+    assert size > 0
+    cache = ReferenceCache(size=2 * size)
+    keys = [(None, 'upload', f'entry{number}', None) for number in range(3)]
+    for key, archive in zip(keys, archives):
+        cache.put(key, archive, size=size)
+    assert keys[0] not in cache
+    assert cache.get(keys[2]) is archives[2]
+    assert cache.bytes == 2 * size
+    cache.put(('big', 'upload', 'entry', None), archives[0], size=3 * size)
+    assert len(cache) == len(keys[1:])
+    cache.invalidate(upload_id='upload')
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_process_normalize_resolves_steps():
+    invalidate_references()
+    stored = {'step0': step_archive('step0')}
+    context = UploadContext(stored)
+    archive = process_archive(context, ['step0', 'missing', 'step0'])
+    with structlog.testing.capture_logs() as logs:
+        archive.data.normalize(archive, structlog.get_logger())
+    assert sorted(context.loads) == ['missing', 'step0']
+    assert isinstance(archive.data, FabricationProcess)
+    assert archive.data.steps[2].name == 'step step0'
+    assert [log['url'] for log in logs if 'url' in log] == ['../upload/archive/missing']
+    invalidate_references()
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+
+import structlog
+import structlog.testing
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    EquipmentTechnique,
+    TechniqueCategories,
+    TechniqueGeneralCategory,
+    TechniqueMainCategory,
+    TechniqueSubCategory,
+)
+from fabrication_facilities.schema_packages.taxonomy import (
+    invalidate_taxonomy,
+    sub_category_entry,
+    taxonomy_lookup,
+)
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_taxonomy():
+    return TechniqueCategories(
+        name='Fabrication techniques',
+        technique_general_categories=[
+            TechniqueGeneralCategory(
+                name='Removal',
+                id='G1',
+                technique_main_categories=[
+                    TechniqueMainCategory(
+                        name='Etching',
+                        id='M1',
+                        technique_sub_categories=[
+                            TechniqueSubCategory(name='DRIE', id='S1'),
+                            TechniqueSubCategory(name='Wet etching', id='S2'),
+                            TechniqueSubCategory(name='Other'),
+                        ],
+                    ),
+                    TechniqueMainCategory(
+                        name='Polishing',
+                        id='M2',
+                        technique_sub_categories=[
+                            TechniqueSubCategory(name='CMP', id='S3'),
+                        ],
+                    ),
+                ],
+            ),
+            TechniqueGeneralCategory(
+                name='Patterning',
+                id='G2',
+                technique_main_categories=[
+                    TechniqueMainCategory(
+                        name='Lithography',
+                        id='M3',
+                        technique_sub_categories=[
+                            TechniqueSubCategory(name='Other'),
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+
+
+def test_taxonomy_lookup():
+    taxonomy = make_taxonomy()
+    lookup = taxonomy_lookup(taxonomy)
+    assert taxonomy_lookup(taxonomy) is lookup
+    assert lookup.find('S2').main == 'Etching'
+    assert lookup.find('wet Etching ').sub_id == 'S2'
+    general = taxonomy.technique_general_categories[0]
+    cmp = general.technique_main_categories[1].technique_sub_categories[0]
+    assert lookup.find(cmp).general == 'Removal'
+    assert lookup.find('unknown') is None
+
+    general.technique_main_categories[1].name = 'CMP'
+    invalidate_taxonomy(taxonomy)
+    assert taxonomy_lookup(taxonomy).find('S3').main == 'CMP'
+
+
+def test_technique_main_category_from_reference():
+    taxonomy = make_taxonomy()
+    main_categories = taxonomy.technique_general_categories[0].technique_main_categories
+    logger = structlog.get_logger()
+    archive = EntryArchive(metadata=EntryMetadata())
+
+    technique = EquipmentTechnique(
+        referencingcategorization=main_categories[0].technique_sub_categories[0]
+    )
+    technique.normalize(archive, logger)
+    assert technique.techniqueMainCategory == 'etching'
+    assert technique.techniqueSubCategory == 'DRIE'
+
+    technique = EquipmentTechnique(
+        referencingcategorization=main_categories[1].technique_sub_categories[0]
+    )
+    with structlog.testing.capture_logs() as logs:
+        technique.normalize(archive, logger)
+    assert technique.techniqueMainCategory is None
+    assert logs[0]['main_category'] == 'Polishing'
+
+
+def test_sub_categories_with_the_same_name():
+    taxonomy = make_taxonomy()
+    lithography = taxonomy.technique_general_categories[1].technique_main_categories[0]
+    technique = EquipmentTechnique(
+        referencingcategorization=lithography.technique_sub_categories[0]
+    )
+    technique.normalize(EntryArchive(metadata=EntryMetadata()), structlog.get_logger())
+    assert technique.techniqueMainCategory == 'lithography'
+    assert technique.techniqueSubCategory == 'Other'
+    assert taxonomy_lookup(taxonomy).find('other').main == 'Etching'
+
+
+def test_same_names_in_another_load_of_the_taxonomy():
+    def load():
+        return EntryArchive(
+            metadata=EntryMetadata(entry_id='taxonomy', last_processing_time=NOW),
+            data=make_taxonomy(),
+        ).data
+
+    lookup = taxonomy_lookup(load())
+    taxonomy = load()
+    assert taxonomy_lookup(taxonomy) is lookup
+    lithography = taxonomy.technique_general_categories[1].technique_main_categories[0]
+    other = lithography.technique_sub_categories[0]
+    assert lookup.find(other).main == 'Lithography'
+    assert sub_category_entry(other).general == 'Patterning'
+    invalidate_taxonomy(taxonomy)
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from fabrication_facilities.schema_packages.fabrication_utilities import (
+    Equipment,
+    Jobdone,
+)
+from fabrication_facilities.schema_packages.utilization import (
+    merge_intervals,
+    utilization_report,
+)
+
+MONDAY = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def dates(*hours):
+    return np.datetime64('2024-01-01T00:00', 'us') + np.array(
+        [np.timedelta64(int(hour * 60), 'm') for hour in hours]
+    ).astype('m8[us]')
+
+
+def test_merge_intervals():
+    starts, ends, overlapping = merge_intervals(dates(5, 0, 1, 10), dates(6, 2, 3, 11))
+    assert (starts == dates(0, 5, 10)).all()
+    assert (ends == dates(3, 6, 11)).all()
+    assert overlapping == 1
+
+
+def test_utilization_report():
+    # two overlapping jobs on Monday, one job across the weekend into week two
+    report = utilization_report(dates(8, 9, 24 * 6 + 20), dates(12, 13, 24 * 7 + 4))
+    assert report.busy_hours == pytest.approx(13)
+    assert report.overlap_hours == pytest.approx(3)
+    assert report.overlapping_jobs == 1
+    assert report.idle_gaps.tolist() == pytest.approx([24 * 6 + 20 - 13])
+    assert report.week_starts.tolist() == [
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 8),
+    ]
+    assert report.weekly_busy_hours.tolist() == pytest.approx([9, 4])
+    assert report.weekly_utilization[1] == pytest.approx(4 / (24 * 7))
+    assert report.utilization == pytest.approx(13 / (24 * 7 + 4 - 8))
+    assert utilization_report(dates(), dates()) is None
+
+
+def test_utilization_of_instant_jobs():
+    report = utilization_report(dates(8, 8), dates(8, 8))
+    assert report.busy_hours == 0
+    assert report.utilization == 0
+    assert report.weekly_utilization.tolist() == [0]
+
+
+def test_equipment_utilization():
+    equipment = Equipment(
+        name='Furnace',
+        equipmentLogBook=[
+            Jobdone(
+                starting_date=MONDAY + timedelta(days=day, hours=8),
+                ending_date=MONDAY + timedelta(days=day, hours=16),
+            )
+            for day in range(5)
+        ]
+        + [Jobdone(name='undated')],
+    )
+    archive = EntryArchive(
+        metadata=EntryMetadata(entry_name='furnace.archive.yaml'), data=equipment
+    )
+    equipment.normalize(archive, structlog.get_logger())
+    utilization = equipment.utilization
+    assert utilization.busy_time.magnitude == pytest.approx(40)
+    assert utilization.longest_idle_gap.magnitude == pytest.approx(16)
+    assert utilization.week_starts == [MONDAY]
+    assert utilization.weekly_utilization.tolist() == pytest.approx([40 / 168])
@@ -0,0 +1,101 @@
+import pytest
+import structlog
+import structlog.testing
+
+from fabrication_facilities.schema_packages.formula import (
+    clear_composition_cache,
+    composition_cache_info,
+)
+from fabrication_facilities.schema_packages.remove import DRIE
+from fabrication_facilities.schema_packages.utils import (
+    Massflow_controller,
+    normalize_compositions,
+    normalize_gas_mixture,
+)
+
+
+def test_normalize_compositions():
+    logger = structlog.get_logger()
+    controller = Massflow_controller(chemical_formula='SF6')
+    normalize_compositions(controller, logger)
+    first = list(controller.elemental_composition)
+    assert [item.element for item in first] == ['F', 'S']
+    assert controller.chemical_formula_hill == 'F6S'
+
+    controller.chemical_formula = 'S2F12'
+    normalize_compositions(controller, logger)
+    assert all(a is b for a, b in zip(first, controller.elemental_composition))
+
+    controller.chemical_formula = '0'
+    normalize_compositions(controller, logger)
+    assert len(controller.elemental_composition) == 0
+
+
+def test_normalize_compositions_lowercase_name():
+    controller = Massflow_controller(chemical_formula='ipa')
+    with structlog.testing.capture_logs() as logs:
+        normalize_compositions(controller, structlog.get_logger())
+    assert len(controller.elemental_composition) == 0
+    assert controller.chemical_formula_hill is None
+    assert 'ambiguous' in logs[0]['event']
+
+
+def test_normalize_compositions_huge_counts():
+    controller = Massflow_controller(chemical_formula='(' * 400 + 'SiO2' + ')10' * 400)
+    with structlog.testing.capture_logs() as logs:
+        normalize_compositions(controller, structlog.get_logger())
+    assert [item.element for item in controller.elemental_composition] == ['O', 'Si']
+    assert controller.molar_mass > 0
+    assert [log['event'] for log in logs] == [
+        'The chemical formula has too many atoms, their counts are capped.'
+    ]
+
+
+def test_normalize_compositions_skips_unchanged_formula():
+    logger = structlog.get_logger()
+    controller = Massflow_controller(chemical_formula='C4F8')
+    normalize_compositions(controller, logger)
+    assert len(controller.composition_fingerprints) == 1
+
+    clear_composition_cache()
+    normalize_compositions(controller, logger)
+    info = composition_cache_info()
+    assert (info.hits, info.misses) == (0, 0)
+
+    controller.chemical_formula = 'CF4'
+    normalize_compositions(controller, logger)
+    assert composition_cache_info().misses == 1
+    assert len(controller.composition_fingerprints) == 1
+
+
+def test_normalize_gas_mixture():
+    step = DRIE(
+        fluximeters=[
+            Massflow_controller(chemical_formula='SF6', massflow=100),
+            Massflow_controller(chemical_formula='O2', massflow=50),
+            Massflow_controller(chemical_formula='Ar'),
+        ]
+    )
+    normalize_gas_mixture(step, structlog.get_logger())
+    assert step.total_gas_flow.magnitude == pytest.approx(150)
+    composition = {
+        item.element: item.atomic_fraction
+        for item in step.gas_mixture_elemental_composition
+    }
+    assert composition == pytest.approx({'O': 0.125, 'F': 0.75, 'S': 0.125})
+
+
+def test_normalize_gas_mixture_canonical_formulas():
+    step = DRIE(
+        fluximeters=[
+            Massflow_controller(chemical_formula='sf6', massflow=10),
+            Massflow_controller(chemical_formula='O2', massflow=10),
+        ]
+    )
+    normalize_gas_mixture(step, structlog.get_logger())
+    assert step.total_gas_flow.magnitude == pytest.approx(20)
+    composition = {
+        item.element: item.atomic_fraction
+        for item in step.gas_mixture_elemental_composition
+    }
+    assert composition == pytest.approx({'O': 2 / 9, 'F': 6 / 9, 'S': 1 / 9})
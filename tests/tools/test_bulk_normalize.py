@@ -0,0 +1,90 @@
+import json
+import os
+
+from fabrication_facilities.tools import bulk_normalize as bulk_normalize_module
+from fabrication_facilities.tools.bulk_normalize import bulk_normalize
+
+DRIE_ARCHIVE = (
+    'data:\n'
+    '  m_def: fabrication_facilities.schema_packages.remove.DRIE\n'
+    '  fluximeters:\n'
+    '    - chemical_formula: SF6\n'
+    '      massflow: 100\n'
+)
+
+
+def test_bulk_normalize(tmp_path):
+    source = tmp_path / 'archives'
+    (source / 'etch').mkdir(parents=True)
+    (source / 'etch' / 'drie.archive.yaml').write_text(DRIE_ARCHIVE)
+    (source / 'sputtering.archive.json').write_text(
+        json.dumps(
+            {
+                'data': {
+                    'm_def': 'fabrication_facilities.schema_packages.add.Sputtering',
+                    'chemical_formula': 'Al2O3',
+                }
+            }
+        )
+    )
+    (source / 'broken.archive.yaml').write_text('data: [unclosed\n')
+    output = tmp_path / 'normalized'
+
+    report = bulk_normalize(str(source), str(output), workers=2, chunk_size=1)
+
+    assert report.processed == len(list(source.rglob('*.archive.*')))
+    assert [path for path, _ in report.failures] == [
+        str(source / 'broken.archive.yaml')
+    ]
+    assert sorted(report.class_timings) == ['DRIE', 'Sputtering']
+    with open(output / 'etch' / 'drie.archive.json') as file:
+        data = json.load(file)['data']
+    assert [item['element'] for item in data['gas_mixture_elemental_composition']] == [
+        'F',
+        'S',
+    ]
+    assert (output / 'sputtering.archive.json').exists()
+
+
+def test_bulk_normalize_output_collision(tmp_path):
+    source = tmp_path / 'archives'
+    source.mkdir()
+    (source / 'drie.archive.json').write_text(
+        json.dumps(
+            {'data': {'m_def': 'fabrication_facilities.schema_packages.remove.DRIE'}}
+        )
+    )
+    (source / 'drie.archive.yaml').write_text(DRIE_ARCHIVE)
+
+    report = bulk_normalize(str(source), str(tmp_path / 'normalized'), workers=1)
+
+    assert report.processed == len(list(source.iterdir()))
+    assert [path for path, _ in report.failures] == [str(source / 'drie.archive.yaml')]
+    assert report.failures[0][1].startswith('OutputCollision')
+
+
+def _crash_on_marked_files(path, source, output):
+    if 'crash' in path:
+        os._exit(1)
+    return normalize_file(path, source, output)
+
+
+normalize_file = bulk_normalize_module.normalize_file
+
+
+def test_bulk_normalize_survives_dead_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_normalize_module, 'normalize_file', _crash_on_marked_files)
+    source = tmp_path / 'archives'
+    source.mkdir()
+    names = ['a', 'b', 'crash', 'd', 'e']
+    for name in names:
+        (source / f'{name}.archive.yaml').write_text(DRIE_ARCHIVE)
+
+    report = bulk_normalize(
+        str(source), str(tmp_path / 'normalized'), workers=2, chunk_size=2
+    )
+
+    assert report.processed == len(names)
+    assert [path for path, _ in report.failures] == [str(source / 'crash.archive.yaml')]
+    assert report.failures[0][1].startswith('BrokenProcessPool')
+    assert report.class_timings['DRIE'][0] == len(names) - 1
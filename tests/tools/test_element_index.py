@@ -0,0 +1,65 @@
+import json
+import os
+from datetime import datetime
+
+import structlog.testing
+
+from fabrication_facilities.tools.element_index import ElementIndex
+
+
+def write_archive(path, entry_id, elements, date):
+    archive = {
+        'metadata': {'entry_id': entry_id},
+        'data': {
+            'm_def': 'fabrication_facilities.schema_packages.remove.DRIE',
+            'starting_date': date,
+            'material_elemental_composition': [{'element': elements[0]}],
+            'fluximeters': [
+                {'elemental_composition': [{'element': e} for e in elements[1:]]}
+            ],
+        },
+    }
+    with open(path, 'w') as file:
+        json.dump(archive, file)
+
+
+def test_element_index(tmp_path):
+    archives = tmp_path / 'archives'
+    archives.mkdir()
+    write_archive(archives / 'a.archive.json', 'a', ['Au', 'S', 'F'], '2024-03-01')
+    write_archive(archives / 'b.archive.json', 'b', ['Si', 'Cu'], '2023-01-01')
+    write_archive(archives / 'c.archive.json', 'c', ['Si', 'O'], '2024-05-01')
+
+    with ElementIndex(str(tmp_path / 'index.db')) as index:
+        assert index.update(str(archives)) == (3, 0)
+        steps = index.lookup(['Au', 'Cu'])
+        assert [step.entry_id for step in steps] == ['a', 'b']
+        assert steps[0].step_class == 'DRIE'
+        recent = index.lookup(['Au', 'Cu'], since=datetime(2024, 1, 1))
+        assert [step.entry_id for step in recent] == ['a']
+
+        os.remove(archives / 'a.archive.json')
+        write_archive(archives / 'c.archive.json', 'c', ['Cu'], '2024-05-01')
+        assert index.update(str(archives)) == (1, 1)
+        assert [step.entry_id for step in index.lookup(['Au', 'Cu'])] == ['c', 'b']
+
+
+def test_element_index_skips_malformed_archives(tmp_path):
+    archives = tmp_path / 'archives'
+    archives.mkdir()
+    write_archive(archives / 'a.archive.json', 'a', ['Au', 'S'], '2024-03-01')
+    (archives / 'broken.archive.json').write_text('{"data": [')
+    (archives / 'list.archive.yaml').write_text('- data\n')
+
+    with ElementIndex(str(tmp_path / 'index.db')) as index:
+        with structlog.testing.capture_logs() as logs:
+            assert index.update(str(archives)) == (1, 0)
+        assert sorted(os.path.basename(log['path']) for log in logs) == [
+            'broken.archive.json',
+            'list.archive.yaml',
+        ]
+        assert [step.entry_id for step in index.lookup(['Au'])] == ['a']
+
+        write_archive(archives / 'broken.archive.json', 'b', ['Au'], '2024-04-01')
+        assert index.update(str(archives)) == (1, 0)
+        assert [step.entry_id for step in index.lookup(['Au'])] == ['b', 'a']